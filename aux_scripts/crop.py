@@ -1,21 +1,98 @@
 import cv2
 import numpy as np
 import os
+import sys
 from tqdm import tqdm
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+# ---------- CONFIG ----------
 input_folder = "video"
 output_folder = "output_circle_videos"
 temp_frames = "temp_frames"
-os.makedirs(output_folder, exist_ok=True)
-os.makedirs(temp_frames, exist_ok=True)
 
-video_files = [f for f in os.listdir(input_folder) if f.lower().endswith(('.mp4', '.mov', '.avi', '.mkv', '.webm'))]
+# Pipe raw BGRA frames straight into ffmpeg instead of writing PNG sequences
+STREAMING = True
+# How many input videos are cropped at the same time (streaming mode only)
+MAX_WORKERS = 4
+# ----------------------------
 
-for video_name in tqdm(video_files, desc="Processing videos"):
-    input_path = os.path.join(input_folder, video_name)
-    base_name = os.path.splitext(video_name)[0]
-    frame_dir = os.path.join(temp_frames, base_name)
+VIDEO_EXTS = ('.mp4', '.mov', '.avi', '.mkv', '.webm')
+
+
+def make_circle_alpha(size):
+    """Precompute the uint8 alpha channel (255 inside the circle, 0 outside)."""
+    radius = size // 2
+    alpha = np.zeros((size, size), dtype=np.uint8)
+    cv2.circle(alpha, (radius, radius), radius, 255, -1)
+    return alpha
+
+
+def crop_video_streaming(input_path, output_path):
+    """
+    Circle-crop one video by piping raw BGRA frames into ffmpeg.
+    No intermediate files are written; the precomputed alpha lives in a
+    preallocated frame buffer and each frame is masked with one vectorized multiply.
+    """
+    cap = cv2.VideoCapture(input_path)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    size = min(width, height)
+
+    y = (height - size) // 2
+    x = (width - size) // 2
+
+    alpha = make_circle_alpha(size)
+    # 0/1 multiplier so pixels outside the circle become transparent black, like the PNG path
+    keep = (alpha > 0).astype(np.uint8)[:, :, None]
+
+    # The alpha channel never changes, so it is written once up front
+    bgra = np.empty((size, size, 4), dtype=np.uint8)
+    bgra[:, :, 3] = alpha
+
+    ffmpeg_cmd = [
+        "ffmpeg", "-y",
+        "-f", "rawvideo",
+        "-pix_fmt", "bgra",
+        "-s", f"{size}x{size}",
+        "-r", str(fps),
+        "-i", "-",
+        "-c:v", "libvpx-vp9",
+        "-pix_fmt", "yuva420p",
+        output_path
+    ]
+    proc = subprocess.Popen(
+        ffmpeg_cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+    frames = 0
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+
+            np.multiply(frame[y:y + size, x:x + size], keep, out=bgra[:, :, :3])
+
+            proc.stdin.write(bgra.tobytes())
+            frames += 1
+    finally:
+        cap.release()
+        proc.stdin.close()
+        proc.wait()
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed for {input_path} (exit {proc.returncode})")
+
+    return output_path, frames
+
+
+def crop_video_png(input_path, output_path, frame_dir):
+    """Legacy path: write every masked frame as PNG, then encode the sequence."""
     os.makedirs(frame_dir, exist_ok=True)
 
     cap = cv2.VideoCapture(input_path)
@@ -47,7 +124,6 @@ for video_name in tqdm(video_files, desc="Processing videos"):
     cap.release()
 
     # Combine frames into transparent video with ffmpeg
-    output_path = os.path.join(output_folder, f"{base_name}_circle.webm")
     ffmpeg_cmd = [
         "ffmpeg", "-y",
         "-framerate", str(int(fps)),
@@ -63,4 +139,53 @@ for video_name in tqdm(video_files, desc="Processing videos"):
         os.remove(os.path.join(frame_dir, f))
     os.rmdir(frame_dir)
 
-print("✅ All videos cropped into circles with transparent backgrounds and saved as .webm files.")
+    return output_path, frame_idx
+
+
+def main():
+    os.makedirs(output_folder, exist_ok=True)
+
+    video_files = [f for f in os.listdir(input_folder) if f.lower().endswith(VIDEO_EXTS)]
+
+    jobs = []
+    for video_name in video_files:
+        base_name = os.path.splitext(video_name)[0]
+        jobs.append((
+            os.path.join(input_folder, video_name),
+            os.path.join(output_folder, f"{base_name}_circle.webm"),
+            os.path.join(temp_frames, base_name)
+        ))
+
+    failed = []
+    if STREAMING:
+        # cv2 decoding and the ffmpeg encoders both run outside the GIL,
+        # so threads are enough to keep several videos in flight.
+        with ThreadPoolExecutor(max_workers=max(1, MAX_WORKERS)) as pool:
+            futures = {
+                pool.submit(crop_video_streaming, input_path, output_path): input_path
+                for input_path, output_path, _ in jobs
+            }
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Processing videos"):
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"❌ {futures[future]}: {e}")
+                    failed.append(futures[future])
+    else:
+        os.makedirs(temp_frames, exist_ok=True)
+        for input_path, output_path, frame_dir in tqdm(jobs, desc="Processing videos"):
+            try:
+                crop_video_png(input_path, output_path, frame_dir)
+            except Exception as e:
+                print(f"❌ {input_path}: {e}")
+                failed.append(input_path)
+
+    if failed:
+        print(f"❌ {len(failed)} of {len(jobs)} videos failed: {', '.join(sorted(failed))}")
+        sys.exit(1)
+
+    print("✅ All videos cropped into circles with transparent backgrounds and saved as .webm files.")
+
+
+if __name__ == "__main__":
+    main()
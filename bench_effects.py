@@ -0,0 +1,43 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from scripts.video_effects import EFFECT_NAMES, make_effect
+
+SIZE = (1920, 1080)
+DURATION = 4.0
+FPS = 24
+FRAMES = 48
+
+
+def bench_effect(name, frame, out):
+    """Return (setup seconds, frames per second) for one effect."""
+    t0 = time.perf_counter()
+    effect = make_effect(name, SIZE, DURATION)
+    setup = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for i in range(FRAMES):
+        effect.apply(frame, (i / FPS) % DURATION, out)
+    return setup, FRAMES / (time.perf_counter() - t0)
+
+
+def main():
+    print("========================================")
+    print(f"  Effect throughput ({SIZE[0]}x{SIZE[1]}, {FRAMES} frames)")
+    print("========================================")
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, (SIZE[1], SIZE[0], 3), dtype=np.uint8)
+    out = np.empty_like(frame)
+
+    for name in EFFECT_NAMES:
+        setup, fps = bench_effect(name, frame, out)
+        print(f"{name:20s} {fps:8.1f} fps   (setup {setup * 1000:6.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from moviepy.editor import ColorClip, CompositeVideoClip, VideoClip
+
+from scripts.masks import set_circle_mask
+
+# Same geometry as the intro/outro cat layer
+W, H = 1920, 1080
+CAT_SIZE = 450
+DURATION = 2.0
+FPS = 30
+
+
+def legacy_circle_mask(size):
+    """The per-frame float64 mask the intro/outro used to rebuild."""
+    Wc, Hc = size
+    Y, X = np.ogrid[:Hc, :Wc]
+    dist = np.sqrt((X - Wc / 2) ** 2 + (Y - Hc / 2) ** 2)
+    return (dist <= Wc / 2).astype(float)
+
+
+def make_cat():
+    rng = np.random.default_rng(0)
+    frames = rng.integers(0, 256, (8, CAT_SIZE, CAT_SIZE, 3), dtype=np.uint8)
+    return VideoClip(lambda t: frames[int(t * FPS) % len(frames)], duration=DURATION)
+
+
+def build(mode):
+    cat = make_cat()
+    if mode == "legacy":
+        cat = cat.add_mask()
+        cat.mask.get_frame = lambda t: legacy_circle_mask(cat.size)
+    else:
+        cat = set_circle_mask(cat)
+    bg = ColorClip((W, H), color=(20, 20, 20)).set_duration(DURATION)
+    return CompositeVideoClip([bg, cat.set_position(("center", H // 2 - 120))], size=(W, H))
+
+
+def bench(mode):
+    clip = build(mode)
+    n = int(DURATION * FPS)
+    t0 = time.perf_counter()
+    for i in range(n):
+        clip.get_frame(i / FPS)
+    elapsed = time.perf_counter() - t0
+    return n / elapsed, clip.get_frame(0.5)
+
+
+def main():
+    print("========================================")
+    print("   Mask benchmark (450x450 circle PiP)  ")
+    print("========================================")
+    legacy_fps, legacy_frame = bench("legacy")
+    cached_fps, cached_frame = bench("cached")
+    diff = np.abs(legacy_frame.astype(int) - cached_frame.astype(int)).max()
+
+    print(f"legacy  (mask rebuilt per frame): {legacy_fps:6.1f} fps")
+    print(f"cached  (one float32 mask):       {cached_fps:6.1f} fps")
+    print(f"speedup: {cached_fps / legacy_fps:.2f}x, max pixel diff: {diff}")
+
+
+if __name__ == "__main__":
+    main()
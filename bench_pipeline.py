@@ -0,0 +1,392 @@
+"""
+Reproducible benchmark for the rendering hot paths.
+
+Builds synthetic fixtures (images, cutout layers, WAVs of fixed length,
+caption text) in a temp dir, then times:
+
+    scene_clip[_<effect>]   scripts.clip.generate_scene_clip
+    choice_<n>              scripts.interactive_clip.generate_single_clip_from_data, every effect choice
+    collage_<template>      the scripts.clip collage templates (create_collage picks one at random)
+    intro_template, intro, outro
+    final                   run_pipeline.generate_final_video on the clips rendered above
+
+Results (wall time, frames, fps per case, plus machine info) go to a JSON
+file. Any case that raises makes the script exit with status 1. Pass
+--baseline to compare against an earlier results file; a case slower than
+the baseline by more than --tolerance, or a baseline case missing from the
+new results, is reported and also fails the run.
+
+    python bench_pipeline.py                        # everything, writes bench_results.json
+    python bench_pipeline.py --only choice_ --repeat 3
+    python bench_pipeline.py --baseline bench_baseline.json
+"""
+import os
+import sys
+import json
+import math
+import time
+import wave
+import random
+import shutil
+import platform
+import argparse
+import tempfile
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+SIZE = (1920, 1080)
+AUDIO_SECONDS = 2.0
+AUDIO_DELAY = 0.5
+SAMPLE_RATE = 22050
+CLIP_FPS = 24
+INTRO_FPS = 30
+N_SCENES = 3
+TOLERANCE = 0.15
+OUTPUT_PATH = "bench_results.json"
+
+CAPTION = "A calm narrator explains one small idea at a time, with clear words and steady pacing."
+SCENE_EFFECT = "zoom_in_center"
+
+
+# =========================================================
+# FIXTURES
+# =========================================================
+
+def make_image(path, seed, size=SIZE):
+    """Smooth gradients plus a few shapes: encodes like an illustration, not like noise."""
+    w, h = size
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[:h, :w].astype(np.float32)
+    img = np.empty((h, w, 3), dtype=np.uint8)
+    for c in range(3):
+        fx, fy, phase = rng.uniform(0.5, 3.0), rng.uniform(0.5, 3.0), rng.uniform(0, math.pi)
+        img[:, :, c] = (127 + 100 * np.sin(fx * xx / w * math.pi + phase) * np.cos(fy * yy / h * math.pi)).astype(np.uint8)
+
+    pil = Image.fromarray(img)
+    draw = ImageDraw.Draw(pil)
+    for _ in range(6):
+        x, y = int(rng.integers(0, w)), int(rng.integers(0, h))
+        r = int(rng.integers(h // 12, h // 4))
+        draw.ellipse((x - r, y - r, x + r, y + r), fill=tuple(int(v) for v in rng.integers(0, 256, 3)))
+    pil.save(path)
+    return path
+
+
+def make_layers(image_path):
+    """Stand-ins for extract_layers(): an elliptical RGBA cutout and a blurred background."""
+    img = Image.open(image_path).convert("RGB")
+    w, h = img.size
+    alpha = Image.new("L", (w, h), 0)
+    ImageDraw.Draw(alpha).ellipse((w * 0.3, h * 0.2, w * 0.7, h * 0.9), fill=255)
+    fg = img.copy()
+    fg.putalpha(alpha.filter(ImageFilter.GaussianBlur(3)))
+    bg = img.filter(ImageFilter.GaussianBlur(25))
+    return fg, bg
+
+
+def make_wav(path, seconds, freq=220.0):
+    n = int(seconds * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+    samples = (0.3 * np.sin(2 * math.pi * freq * t) * 32767).astype(np.int16)
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(samples.tobytes())
+    return path
+
+
+def make_fixtures(root, seconds=AUDIO_SECONDS):
+    """Synthetic inputs under `root`; returns a dict of paths and layers."""
+    images = [make_image(os.path.join(root, f"img_{i}.png"), seed=i) for i in range(1, N_SCENES + 1)]
+    fx = {
+        "root": root,
+        "images": images,
+        "thumb": make_image(os.path.join(root, "thumb.png"), seed=99, size=(1280, 720)),
+        "wav": make_wav(os.path.join(root, "scene.wav"), seconds),
+        "intro_wav": make_wav(os.path.join(root, "intro.wav"), seconds, freq=330.0),
+        "outro_wav": make_wav(os.path.join(root, "outro.wav"), seconds, freq=165.0),
+        "out_dir": os.path.join(root, "out"),
+    }
+    fx["fg"], fx["bg"] = make_layers(images[0])
+    os.makedirs(fx["out_dir"], exist_ok=True)
+    return fx
+
+
+# =========================================================
+# CASES
+# =========================================================
+
+def clip_frames(seconds, fps=CLIP_FPS, delay=AUDIO_DELAY):
+    return int(seconds * fps) + int(round(delay * fps))
+
+
+def bench_scene_clips(fx, seconds):
+    from scripts.clip import generate_scene_clip
+
+    cases = {}
+    for name, effect in (("scene_clip", None), (f"scene_clip_{SCENE_EFFECT}", SCENE_EFFECT)):
+        def run(effect=effect, name=name):
+            random.seed(0)  # generate_scene_clip picks fades at random
+            generate_scene_clip(fx["images"][0], fx["wav"], os.path.join(fx["out_dir"], f"{name}.mp4"),
+                                CAPTION, audio_delay=AUDIO_DELAY, effect=effect)
+        cases[name] = {"run": run, "frames": clip_frames(seconds)}
+    return cases
+
+
+def bench_choices(fx, seconds, renderers):
+    from scripts.frame_effects import EFFECT_CHOICES
+    from scripts.interactive_clip import generate_single_clip_from_data
+
+    cases = {}
+    for renderer in renderers:
+        suffix = "" if renderer == "frames" else f"_{renderer}"
+        for choice in EFFECT_CHOICES:
+            name = f"choice_{choice}{suffix}"
+
+            def run(choice=choice, renderer=renderer, name=name):
+                generate_single_clip_from_data(
+                    fx["fg"], fx["bg"], choice, fx["wav"], os.path.join(fx["out_dir"], f"{name}.mp4"),
+                    CAPTION, audio_delay=AUDIO_DELAY, renderer=renderer
+                )
+            cases[name] = {"run": run, "frames": clip_frames(seconds)}
+    return cases
+
+
+def bench_collages(fx):
+    from scripts import clip
+
+    templates = [clip.t2_vertical_split, clip.t2_horizontal_split, clip.t2_diagonal_pip,
+                 clip.t2_polaroid_side, clip.t2_floating_overlap,
+                 clip.t3_columns, clip.t3_one_left_two_right, clip.t3_one_top_two_bottom,
+                 clip.t3_grid_cards, clip.t3_steps]
+    cases = {}
+    for tmpl in templates:
+        count = 2 if tmpl.__name__.startswith("t2_") else 3
+
+        def run(tmpl=tmpl, count=count):
+            canvas = tmpl(fx["images"][:count], *SIZE)
+            canvas.save(os.path.join(fx["out_dir"], f"collage_{tmpl.__name__}.png"))
+        cases[f"collage_{tmpl.__name__}"] = {"run": run, "frames": None}
+    return cases
+
+
+def bench_intros(fx, seconds):
+    from scripts import intro_outro
+
+    # Render the cat/ring template into the temp dir so the cold case is really cold
+    intro_outro.TEMPLATE_DIR = os.path.join(fx["root"], "templates")
+    total = seconds + 2 * intro_outro.PRE_DELAY
+    n_frames = int(total * INTRO_FPS)
+
+    def clear_template():
+        shutil.rmtree(intro_outro.TEMPLATE_DIR, ignore_errors=True)
+
+    def warm_template():
+        intro_outro.get_cat_ring_template(INTRO_FPS)
+
+    return {
+        "intro_template": {
+            "run": lambda: (clear_template(), warm_template()),
+            "frames": None,
+        },
+        "intro": {
+            "prepare": warm_template,
+            "run": lambda: intro_outro.render_intro_frames(
+                fx["thumb"], fx["intro_wav"], "How Habits Quietly Shape Your Day",
+                os.path.join(fx["out_dir"], "intro.mp4"), fps=INTRO_FPS),
+            "frames": n_frames,
+        },
+        "outro": {
+            "prepare": warm_template,
+            "run": lambda: intro_outro.render_outro_frames(
+                fx["outro_wav"], os.path.join(fx["out_dir"], "outro.mp4"), fps=INTRO_FPS),
+            "frames": n_frames,
+        },
+    }
+
+
+def bench_final(fx, seconds, scene_case):
+    """Final assembly of N_SCENES copies of the scene clip, plus the intro/outro if they were rendered."""
+    from run_pipeline.generate_final_video import generate_final_video
+    from scripts.intro_outro import PRE_DELAY
+
+    base_dir = os.path.join(fx["root"], "final")
+    clips_dir = os.path.join(base_dir, "clips", "1")
+    audio_dir = os.path.join(base_dir, "audios", "1")
+    scene_seconds = clip_frames(seconds) / CLIP_FPS
+    case = {"frames": None}
+
+    def prepare():
+        source = os.path.join(fx["out_dir"], "scene_clip.mp4")
+        if not os.path.exists(source):
+            scene_case["run"]()
+        os.makedirs(clips_dir, exist_ok=True)
+        os.makedirs(audio_dir, exist_ok=True)
+        for i in range(1, N_SCENES + 1):
+            shutil.copy(source, os.path.join(clips_dir, f"scene_{i}.mp4"))
+
+        total = N_SCENES * scene_seconds
+        for name in ("intro.mp4", "outro.mp4"):
+            path = os.path.join(fx["out_dir"], name)
+            if os.path.exists(path):
+                shutil.copy(path, os.path.join(clips_dir, name))
+                total += seconds + 2 * PRE_DELAY
+        make_wav(os.path.join(audio_dir, "full_audio.wav"), N_SCENES * scene_seconds)
+        case["frames"] = int(total * CLIP_FPS)
+
+    case["prepare"] = prepare
+    case["run"] = lambda: generate_final_video(os.path.join(base_dir, "script_1.json"), base_dir=base_dir)
+    return {"final": case}
+
+
+# =========================================================
+# RUNNER
+# =========================================================
+
+def machine_info():
+    import cv2
+    return {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "opencv_threads": cv2.getNumThreads(),
+    }
+
+
+def time_case(run, repeat):
+    """Best wall time of `repeat` runs."""
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_cases(fx, seconds, renderers, only=None, repeat=1):
+    scene_cases = bench_scene_clips(fx, seconds)
+    groups = [
+        scene_cases,
+        bench_choices(fx, seconds, renderers),
+        bench_collages(fx),
+        bench_intros(fx, seconds),
+        # Reuses the scene_clip / intro / outro outputs rendered above
+        bench_final(fx, seconds, scene_cases["scene_clip"]),
+    ]
+    results = {}
+    for group in groups:
+        for name, case in group.items():
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            try:
+                if "prepare" in case:
+                    case["prepare"]()  # untimed setup
+                wall = time_case(case["run"], repeat)
+            except Exception as e:
+                print(f"❌ {name:28s} failed: {e}")
+                results[name] = {"error": str(e)}
+                continue
+
+            frames = case["frames"]
+            row = {"wall_s": round(wall, 4), "frames": frames}
+            if frames:
+                row["fps"] = round(frames / wall, 2)
+            results[name] = row
+            fps = f"{row['fps']:8.1f} fps" if frames else ""
+            print(f"{name:30s} {wall:8.3f} s {fps}")
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE, only=None):
+    """
+    Return [(case, baseline wall, new wall, ratio)] for cases slower than baseline by > tolerance.
+    Baseline cases (within `only`) that errored or did not run come back with a None new wall and ratio.
+    """
+    regressions = []
+    print("\n----------------------------------------")
+    print(f"  vs baseline (tolerance {tolerance:.0%})")
+    print("----------------------------------------")
+    for name, old in baseline.get("results", {}).items():
+        if "wall_s" not in old or (only and not any(name.startswith(prefix) for prefix in only)):
+            continue
+        row = results.get(name)
+        if row is None or "wall_s" not in row:
+            regressions.append((name, old["wall_s"], None, None))
+            print(f"{name:30s} {old['wall_s']:8.3f} ->   {'failed' if row else 'missing'}  <-- REGRESSION")
+    for name, row in results.items():
+        old = baseline.get("results", {}).get(name)
+        if not old or "wall_s" not in old or "wall_s" not in row:
+            continue
+        ratio = row["wall_s"] / old["wall_s"] if old["wall_s"] else 1.0
+        flag = ""
+        if ratio > 1 + tolerance:
+            regressions.append((name, old["wall_s"], row["wall_s"], ratio))
+            flag = "  <-- REGRESSION"
+        print(f"{name:30s} {old['wall_s']:8.3f} -> {row['wall_s']:8.3f} s  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the rendering hot paths on synthetic fixtures.")
+    parser.add_argument("--only", action="append", help="Run only cases whose name starts with this (repeatable)")
+    parser.add_argument("--seconds", type=float, default=AUDIO_SECONDS, help="Narration length per scene")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case; the best time is kept")
+    parser.add_argument("--renderers", default="frames", help="Comma list for choice_* cases: frames,moviepy")
+    parser.add_argument("--output", default=OUTPUT_PATH, help="Where to write the JSON results")
+    parser.add_argument("--baseline", help="Results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="Allowed slowdown vs baseline (0.15 = 15%%)")
+    parser.add_argument("--keep", action="store_true", help="Keep the fixture/output temp dir")
+    args = parser.parse_args(argv)
+
+    print("========================================")
+    print(f"  Pipeline benchmark ({SIZE[0]}x{SIZE[1]}, {args.seconds:g}s scenes)")
+    print("========================================")
+
+    # Static assets (cat/dog videos) are resolved relative to the repo root
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    root = tempfile.mkdtemp(prefix="bench_pipeline_")
+    try:
+        fx = make_fixtures(root, args.seconds)
+        results = run_cases(fx, args.seconds, args.renderers.split(","), args.only, args.repeat)
+    finally:
+        if args.keep:
+            print(f"Fixtures kept in {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": machine_info(),
+        "config": {"size": SIZE, "seconds": args.seconds, "audio_delay": AUDIO_DELAY,
+                   "repeat": args.repeat, "renderers": args.renderers},
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    failed = sorted(name for name, row in results.items() if "error" in row)
+    if failed:
+        print(f"\n❌ {len(failed)} case(s) failed: {', '.join(failed)}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.only)
+        if regressions:
+            print(f"\n❌ {len(regressions)} case(s) regressed")
+            return 1
+        if not failed:
+            print("\n✅ No regressions")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Persistent LLM response cache.
+
+Responses are stored as JSON files under outputs/cache/llm, keyed by
+sha256(model, prompt, generation config, attempt). Modes (LLM_CACHE_MODE):
+
+    off     always call the model, store nothing
+    record  serve fresh hits, call and store on a miss (default)
+    replay  serve hits only, ignoring the TTL; a miss raises CacheMiss,
+            so a recorded run can be repeated offline and deterministically
+
+LLM_CACHE_TTL (seconds) makes older entries count as misses in record mode,
+so cached output can be refreshed on purpose (LLM_CACHE_TTL=0 refreshes all).
+
+`attempt` is part of the key so a retry loop does not get the same rejected
+reply back on every attempt; replaying a recorded run follows the same path.
+"""
+import os
+import json
+import time
+import hashlib
+
+CACHE_DIR = os.path.join("outputs", "cache", "llm")
+MODES = ("off", "record", "replay")
+DEFAULT_MODE = "record"
+DEFAULT_TTL = None  # seconds; None = never expires
+
+
+class CacheMiss(KeyError):
+    """Raised in replay mode when a prompt was never recorded."""
+
+
+class ResponseCache:
+
+    def __init__(self, cache_dir=CACHE_DIR, mode=None, ttl=None):
+        mode = mode or os.getenv("LLM_CACHE_MODE", DEFAULT_MODE)
+        if mode not in MODES:
+            raise ValueError(f"LLM cache mode must be one of {', '.join(MODES)}, got '{mode}'")
+        if ttl is None and os.getenv("LLM_CACHE_TTL"):
+            ttl = float(os.getenv("LLM_CACHE_TTL"))
+
+        self.cache_dir = cache_dir
+        self.mode = mode
+        self.ttl = DEFAULT_TTL if ttl is None else ttl
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model, prompt, config=None, attempt=0):
+        payload = json.dumps(
+            {"model": model, "prompt": prompt, "config": config, "attempt": attempt},
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """Cached text for `key`, or None (missing, unreadable or expired)."""
+        try:
+            with open(self.path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if self.mode != "replay" and self.ttl is not None and time.time() - entry["created"] > self.ttl:
+            return None
+        return entry["text"]
+
+    def put(self, key, model, text):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.part"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"model": model, "created": time.time(), "text": text}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _before_call(self, model, prompt, config, attempt):
+        """Return (key, cached text or None); raise CacheMiss when replay has nothing."""
+        key = self.key(model, prompt, config, attempt)
+        text = self.get(key)
+        if text is not None:
+            self.hits += 1
+            return key, text
+        self.misses += 1
+        if self.mode == "replay":
+            raise CacheMiss(f"No recorded {model} response for prompt {key[:12]} (attempt {attempt})")
+        return key, None
+
+    def lookup(self, model, prompt, config, call, attempt=0):
+        """Return the cached reply, or `call()` and store it. Empty replies are not stored."""
+        if self.mode == "off":
+            return call()
+        key, text = self._before_call(model, prompt, config, attempt)
+        if text is None:
+            text = call()
+            if text:
+                self.put(key, model, text)
+        return text
+
+    async def alookup(self, model, prompt, config, call, attempt=0):
+        """lookup() for an async `call`."""
+        if self.mode == "off":
+            return await call()
+        key, text = self._before_call(model, prompt, config, attempt)
+        if text is None:
+            text = await call()
+            if text:
+                self.put(key, model, text)
+        return text
+
+    def stream(self, model, prompt, config, call_stream, attempt=0):
+        """Generator: yield the cached reply as one chunk, or relay `call_stream()` and store the joined text."""
+        if self.mode == "off":
+            yield from call_stream()
+            return
+        key, text = self._before_call(model, prompt, config, attempt)
+        if text is not None:
+            yield text
+            return
+        chunks = []
+        for chunk in call_stream():
+            chunks.append(chunk)
+            yield chunk
+        if chunks:
+            self.put(key, model, "".join(chunks).strip())
+
+
+_cache = None
+
+
+def get_cache():
+    """Process-wide cache, configured from LLM_CACHE_MODE / LLM_CACHE_TTL on first use."""
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache()
+    return _cache
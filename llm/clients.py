@@ -0,0 +1,113 @@
+"""
+Async LLM clients with a common interface:
+
+    text = await client.generate(prompt)
+    text = await client.generate(prompt, response_schema=SCRIPT_SCHEMA, attempt=2)
+
+GeminiClient talks to the API; OfflineStubClient returns canned, valid
+responses so the script stage can run without a key or network.
+CachedClient wraps either one with the response cache (llm/cache.py).
+`attempt` (the caller's retry number) only matters for cache keys.
+"""
+import asyncio
+import json
+import re
+
+from llm.generate_script import get_client, json_config, model as DEFAULT_MODEL
+from llm.cache import get_cache
+
+
+class GeminiClient:
+    """Gemini through google-genai's async API. Raises on errors so callers can back off."""
+
+    def __init__(self, model_name: str = DEFAULT_MODEL):
+        self.model = model_name
+
+    async def generate(self, prompt: str, response_schema: dict = None, attempt: int = 0) -> str:
+        response = await get_client().aio.models.generate_content(
+            model=self.model,
+            contents=prompt.strip(),
+            config=json_config(response_schema)
+        )
+        if not response.text:
+            raise RuntimeError("No response text received")
+        return response.text.strip()
+
+
+class OfflineStubClient:
+    """
+    Deterministic stand-in for Gemini.
+
+    Answers the educational-script prompt with filler narration and the
+    scene prompt with a valid `n_scenes` script. `fail_first` makes the first
+    N calls raise (to exercise backoff); `latency` simulates network time.
+    Scenes whose id is in `broken_ids` come back with too few image prompts
+    until a repair prompt asks for them.
+    """
+
+    model = "offline-stub"
+
+    def __init__(self, n_scenes: int = 6, latency: float = 0.0, fail_first: int = 0, broken_ids=()):
+        self.n_scenes = n_scenes
+        self.broken_ids = set(broken_ids)
+        self.latency = latency
+        self.failures_left = fail_first
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate(self, prompt: str, response_schema: dict = None, attempt: int = 0) -> str:
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if self.failures_left > 0:
+                self.failures_left -= 1
+                raise RuntimeError("stub: simulated API error")
+            if "SCENES TO FIX" in prompt:
+                ids = re.search(r"SCENES TO FIX \(ids\): ([\d, ]+)", prompt).group(1)
+                return self.repair_json([int(i) for i in ids.split(",")])
+            if "INPUT SCRIPT" in prompt:
+                return self.scene_json()
+            return self.narration(prompt)
+        finally:
+            self.in_flight -= 1
+
+    def narration(self, prompt):
+        match = re.search(r'topic: "([^"]*)"', prompt)
+        topic = match.group(1) if match else "the topic"
+        return " ".join(f"Sentence {i} about {topic}, told calmly and clearly." for i in range(1, 3 * self.n_scenes + 1))
+
+    def scene(self, i, broken=False):
+        return {
+            "id": i,
+            "text": f"Narration for scene {i}.",
+            "image_prompts": [f"cartoonish image of idea {i}{c}" for c in ("ab" if broken else "abc")],
+            "audio_delay": 0.5,
+            "emotion": "calm"
+        }
+
+    def scene_json(self):
+        scenes = [self.scene(i, i in self.broken_ids) for i in range(1, self.n_scenes + 1)]
+        return json.dumps({"title": "Stub", "description": "Offline stub script", "scenes": scenes})
+
+    def repair_json(self, ids):
+        return json.dumps({"scenes": [self.scene(i) for i in ids]})
+
+
+class CachedClient:
+    """Serves `client` replies from a ResponseCache (record/replay/off, see llm/cache.py)."""
+
+    def __init__(self, client, cache=None):
+        self.client = client
+        self.cache = cache or get_cache()
+        self.model = client.model
+
+    async def generate(self, prompt: str, response_schema: dict = None, attempt: int = 0) -> str:
+        return await self.cache.alookup(
+            self.model, prompt, json_config(response_schema),
+            lambda: self.client.generate(prompt, response_schema=response_schema, attempt=attempt),
+            attempt=attempt
+        )
@@ -10,33 +10,86 @@ Features:
 """
 
 import os
-from google import genai
-from dotenv import load_dotenv
 
-# === Load environment variables ===
-load_dotenv()
-API_KEY = os.getenv("GOOGLE_API_KEY")
+model = "gemini-2.5-flash"
+_client = None
 
-if not API_KEY:
-    raise EnvironmentError(
-        "❌ Missing GOOGLE_API_KEY in .env file.\n"
-        "Get one from https://aistudio.google.com/app/apikey"
-    )
 
-# === Initialize Gemini client ===
-client = genai.Client(api_key=API_KEY)
-model = "gemini-2.5-flash"
+def get_client():
+    """
+    Create the Gemini client on first use.
+    Loads GOOGLE_API_KEY from .env and fails loudly if it is missing.
+    """
+    global _client
+    if _client is None:
+        from google import genai
+        from dotenv import load_dotenv
+
+        # === Load environment variables ===
+        load_dotenv()
+        api_key = os.getenv("GOOGLE_API_KEY")
+
+        if not api_key:
+            raise EnvironmentError(
+                "❌ Missing GOOGLE_API_KEY in .env file.\n"
+                "Get one from https://aistudio.google.com/app/apikey"
+            )
 
-def generate_script(prompt: str) -> str:
+        # === Initialize Gemini client ===
+        _client = genai.Client(api_key=api_key)
+    return _client
+
+def json_config(response_schema):
+    """generate_content config asking for JSON that matches `response_schema` (None: plain text)."""
+    if response_schema is None:
+        return None
+    return {"response_mime_type": "application/json", "response_schema": response_schema}
+
+
+def generate_script(prompt: str, response_schema: dict = None, attempt: int = 0) -> str:
     """
     Sends a text prompt to Gemini and returns the plain text response.
+    With `response_schema`, Gemini is constrained to JSON of that shape.
+    Replies go through the response cache (llm/cache.py); `attempt` keeps
+    retries of the same prompt apart in it.
     """
-    try:
-        response = client.models.generate_content(
+    from llm.cache import get_cache, CacheMiss
+
+    config = json_config(response_schema)
+
+    def call():
+        response = get_client().models.generate_content(
             model=model,
-            contents=prompt.strip()
+            contents=prompt.strip(),
+            config=config
         )
-        return response.text.strip() if response.text else "⚠️ No response text received."
+        return response.text.strip() if response.text else None
+
+    try:
+        text = get_cache().lookup(model, prompt, config, call, attempt=attempt)
+        return text if text else "⚠️ No response text received."
+    except CacheMiss:
+        raise
     except Exception as e:
         return f"❌ Gemini API Error: {e}"
 
+
+def generate_script_stream(prompt: str, response_schema: dict = None, attempt: int = 0):
+    """
+    Like generate_script, but yields the reply in chunks as Gemini writes it.
+    Errors are raised, not returned as text. Cached replies come back as one chunk.
+    """
+    from llm.cache import get_cache
+
+    config = json_config(response_schema)
+
+    def call_stream():
+        for chunk in get_client().models.generate_content_stream(
+            model=model,
+            contents=prompt.strip(),
+            config=config
+        ):
+            if chunk.text:
+                yield chunk.text
+
+    yield from get_cache().stream(model, prompt, config, call_stream, attempt=attempt)
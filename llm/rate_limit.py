@@ -0,0 +1,47 @@
+"""
+Async rate limiting helpers for LLM calls: a token bucket shared by all
+in-flight requests, and capped exponential backoff with jitter.
+"""
+import asyncio
+import random
+import time
+
+
+class TokenBucket:
+    """
+    Allows `rate` requests per second on average, with bursts of up to
+    `capacity`. acquire() waits until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: float, burst: float = 1.0):
+        return cls(requests_per_minute / 60.0, burst)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, tokens: float = 1.0):
+        # The lock makes waiters queue up in order instead of racing for refills
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """Delay before retry number `attempt` (0-based): base * 2^attempt, capped, with 50-100% jitter."""
+    return min(cap, base * (2 ** attempt)) * random.uniform(0.5, 1.0)
@@ -0,0 +1,163 @@
+"""
+Parsing and validation of the scene JSON the LLM returns.
+Shared by the sync and async script generators.
+"""
+import re
+import json
+
+from json_repair import repair_json
+
+MIN_SCENES = 5
+IMAGE_PROMPTS_PER_SCENE = 3
+
+# Structured-output schemas (Gemini `response_schema`). Constraining the
+# reply to this shape removes most fence/garbage/count failures up front.
+SCENE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "id": {"type": "INTEGER"},
+        "text": {"type": "STRING"},
+        "image_prompts": {
+            "type": "ARRAY",
+            "items": {"type": "STRING"},
+            "min_items": IMAGE_PROMPTS_PER_SCENE,
+            "max_items": IMAGE_PROMPTS_PER_SCENE,
+        },
+        "audio_delay": {"type": "NUMBER"},
+        "emotion": {"type": "STRING"},
+    },
+    "required": ["id", "text", "image_prompts", "audio_delay", "emotion"],
+    "property_ordering": ["id", "text", "image_prompts", "audio_delay", "emotion"],
+}
+
+SCRIPT_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "title": {"type": "STRING"},
+        "description": {"type": "STRING"},
+        "scenes": {"type": "ARRAY", "items": SCENE_SCHEMA, "min_items": MIN_SCENES},
+    },
+    "required": ["title", "description", "scenes"],
+    "property_ordering": ["title", "description", "scenes"],
+}
+
+# Reply to build_scene_repair_prompt: only the fixed scenes
+SCENE_LIST_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {"scenes": {"type": "ARRAY", "items": SCENE_SCHEMA}},
+    "required": ["scenes"],
+}
+
+
+def extract_first_json_block(text: str) -> str:
+    """
+    Extract the first { ... } block by bracket counting.
+    Works even if text contains garbage before/after JSON.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+
+    depth = 0
+    for i, ch in enumerate(text[start:], start=start):
+        if ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+def parse_script_json(raw_output: str):
+    """Return the first JSON object in an LLM reply (code fences stripped, repaired if needed), or None."""
+    cleaned = re.sub(r"```(?:json)?|```", "", raw_output).strip()
+
+    block = extract_first_json_block(cleaned)
+    if not block:
+        print("No JSON block.")
+        return None
+
+    try:
+        return json.loads(block)
+    except Exception:
+        try:
+            data = json.loads(repair_json(block))
+            print("JSON repaired successfully.")
+            return data
+        except Exception:
+            print("JSON unrecoverable.")
+            return None
+
+
+def structure_problem(script_data):
+    """Problems no per-scene repair can fix (the whole conversion must be redone)."""
+    if not isinstance(script_data, dict):
+        return "not a JSON object"
+
+    if "scenes" not in script_data:
+        return "'scenes' missing"
+
+    if not isinstance(script_data["scenes"], list) or len(script_data["scenes"]) < MIN_SCENES:
+        return "Invalid scenes array (too short)"
+
+    return None
+
+
+def scene_problem(scene):
+    """Return None if one scene is usable, else a short reason."""
+    prompts = scene.get("image_prompts") if isinstance(scene, dict) else None
+    if not isinstance(prompts, list) or len(prompts) != IMAGE_PROMPTS_PER_SCENE:
+        scene_id = scene.get("id") if isinstance(scene, dict) else None
+        return f"Invalid image_prompts in scene {scene_id}: must be a list of {IMAGE_PROMPTS_PER_SCENE}"
+    return None
+
+
+def broken_scenes(script_data):
+    """Indices of the scenes that fail scene_problem()."""
+    return [i for i, scene in enumerate(script_data["scenes"]) if scene_problem(scene)]
+
+
+def validate_script(script_data):
+    """Return None if `script_data` is a usable script, else a short reason."""
+    problem = structure_problem(script_data)
+    if problem:
+        return problem
+
+    for scene in script_data["scenes"]:
+        problem = scene_problem(scene)
+        if problem:
+            return problem
+
+    return None
+
+
+def merge_scene_fixes(script_data, fixes, broken):
+    """
+    Put repaired scenes back into `script_data` in place.
+    `fixes` is the parsed repair reply ({"scenes": [...]}) for the scenes at
+    indices `broken`; matched by id, else by order. Invalid fixes are ignored.
+    Returns how many scenes were replaced.
+    """
+    fixed = fixes.get("scenes") if isinstance(fixes, dict) else None
+    if not isinstance(fixed, list):
+        return 0
+
+    by_id = {scene.get("id"): scene for scene in fixed if isinstance(scene, dict)}
+    scenes = script_data["scenes"]
+    replaced = 0
+    for order, index in enumerate(broken):
+        old = scenes[index]
+        old_id = old.get("id") if isinstance(old, dict) else index + 1
+        new = by_id.get(old_id)
+        if new is None and order < len(fixed):
+            new = fixed[order]
+        if new is None or scene_problem(new):
+            continue
+        # Keep the original narration/timing for any field the fix left out
+        merged = dict(old) if isinstance(old, dict) else {}
+        merged.update(new)
+        merged["id"] = old_id
+        scenes[index] = merged
+        replaced += 1
+    return replaced
@@ -0,0 +1,107 @@
+"""
+Incremental parser for streamed scene JSON.
+
+Feed it text chunks as the LLM produces them; it returns every scene object
+of the top-level "scenes" array as soon as that object's closing brace
+arrives, so downstream work on scene 1 can start while later scenes are
+still being written.
+
+    parser = SceneStreamParser()
+    for chunk in stream:
+        for scene in parser.feed(chunk):
+            ...
+
+Like extract_first_json_block, anything before the first "{" (code fences,
+chatter) and after the matching "}" is ignored.
+"""
+import json
+
+from json_repair import repair_json
+
+
+class SceneStreamParser:
+
+    def __init__(self, key="scenes"):
+        self.key = key
+        self.text = ""
+        self.pos = 0
+        self.stack = []          # open "{" / "[" of the top-level object
+        self.started = False
+        self.finished = False
+        self.in_string = False
+        self.escape = False
+        self.string_start = 0
+        self.last_string = None  # most recent completed string (candidate key)
+        self.pending_key = None  # key whose value comes next
+        self.array_depth = None  # len(stack) inside the scenes array
+        self.scene_start = None
+        self.scenes_seen = 0
+
+    def feed(self, chunk):
+        """Consume `chunk`; return the list of scenes completed by it."""
+        self.text += chunk
+        done = []
+        text = self.text
+
+        for i in range(self.pos, len(text)):
+            if self.finished:
+                break
+            c = text[i]
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif c == "\\":
+                    self.escape = True
+                elif c == '"':
+                    self.in_string = False
+                    self.last_string = text[self.string_start + 1:i]
+                continue
+
+            if not self.started:
+                if c == "{":
+                    self.started = True
+                    self.stack.append(c)
+                continue
+
+            if c == '"':
+                self.in_string = True
+                self.string_start = i
+            elif c == ":":
+                self.pending_key = self.last_string
+            elif c == ",":
+                self.pending_key = None
+            elif c in "{[":
+                if c == "[" and len(self.stack) == 1 and self.pending_key == self.key:
+                    self.array_depth = 2
+                self.stack.append(c)
+                if c == "{" and self.array_depth is not None and len(self.stack) == self.array_depth + 1:
+                    self.scene_start = i
+                self.pending_key = None
+            elif c in "}]":
+                if c == "}" and self.scene_start is not None and len(self.stack) == self.array_depth + 1:
+                    scene = self._load(text[self.scene_start:i + 1])
+                    self.scene_start = None
+                    if scene is not None:
+                        self.scenes_seen += 1
+                        done.append(scene)
+                if c == "]" and len(self.stack) == self.array_depth:
+                    self.array_depth = None
+                if self.stack:
+                    self.stack.pop()
+                if not self.stack:
+                    self.finished = True
+
+        self.pos = len(text)
+        return done
+
+    @staticmethod
+    def _load(block):
+        try:
+            scene = json.loads(block)
+        except Exception:
+            try:
+                scene = json.loads(repair_json(block))
+            except Exception:
+                return None
+        return scene if isinstance(scene, dict) else None
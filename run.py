@@ -1,15 +1,13 @@
-# from run_pipeline.generate_script import generate_Script_Gemini
-# from run_pipeline.generate_images import generate_images
-# from run_pipeline.generate_audios import generate_audios
-# from scripts.tts_env import activate_ttsenv, deactivate_ttsenv
-# from run_pipeline.generate_intros_outros import generate_intros_outros
-from run_pipeline.generate_all_clips import generate_all_clips
-# from run_pipeline.generate_thumbnails import generate_thumbnails
-from run_pipeline.generate_final_video import generate_final_video
-
+import argparse
 import json
 import os
 
+from scripts.instrument import span, start_run, write_report
+
+# Stage modules are imported inside run_title(), so a run only pays for the
+# models/toolkits of the stages it actually executes
+# (e.g. `python run.py --stage final` never loads VITS, Kandinsky or Tk).
+
 # =====================================================
 # USER INPUT: Process titles from START → END
 # =====================================================
@@ -17,6 +15,11 @@ import os
 START_ID = 1
 END_ID = 1
 
+# Stages run when no --stage is given
+DEFAULT_STAGES = ["clips", "final"]
+
+STAGES = ["script", "audio", "images", "scores", "clips", "intros", "thumbnails", "final"]
+
 # Load the titles file
 with open("static/titles.json", "r", encoding="utf-8") as f:
     TITLE_DATA = json.load(f)
@@ -29,54 +32,118 @@ def get_title_data(title_id: str):
     return None, None
 
 
-# =====================================================
-# MAIN LOOP – PROCESS ALL TITLES
-# =====================================================
-
-for tid in range(START_ID, END_ID + 1):
-
-    TITLE_ID = str(tid)
-    TITLE_NAME, TITLE_PROMPT = get_title_data(TITLE_ID)
-
-    if not TITLE_NAME:
-        print(f"❌ Title ID {TITLE_ID} not found. Skipping.")
-        continue
-
-    print("\n====================================")
-    print(f"▶ Processing Title ID: {TITLE_ID}")
-    print("TITLE_NAME:", TITLE_NAME)
-    print("TITLE_PROMPT:", TITLE_PROMPT)
-    print("====================================\n")
+def run_title(TITLE_ID: str, TITLE_NAME: str, stages, clip_mode=None):
+    # Overwrite to ensure correct path format
+    script_path = f"outputs/scripts/script_{TITLE_ID}.json"
 
     # -------------------------------------
     # 1) Generate script
     # -------------------------------------
-    # generate_Script_Gemini(TITLE_NAME, TITLE_ID)
-
-    # Overwrite to ensure correct path format
-    script_path = f"outputs/scripts/script_{TITLE_ID}.json"
+    if "script" in stages:
+        from run_pipeline.generate_script import generate_Script_Gemini
+        with span("script", title=TITLE_ID) as s:
+            s.add_output(generate_Script_Gemini(TITLE_NAME, TITLE_ID))
 
     # -------------------------------------
     # 2) Generate audios
     # -------------------------------------
-    # generate_audios(script_path)
+    if "audio" in stages:
+        from run_pipeline.generate_audios import generate_audios
+        with span("audio", title=TITLE_ID) as s:
+            s.add_output(generate_audios(script_path))
 
-    # generate_images(script_path)
+    # -------------------------------------
+    # 3) Generate images
+    # -------------------------------------
+    if "images" in stages:
+        from run_pipeline.generate_images import generate_images
+        with span("images", title=TITLE_ID) as s:
+            s.add_output(generate_images(script_path))
 
+    # Rank each scene's candidate images (default pick for the UI, choice for --clip-mode auto)
+    if "scores" in stages:
+        from run_pipeline.score_images import score_images
+        with span("scores", title=TITLE_ID) as s:
+            s.add_output(score_images(script_path))
 
     # -------------------------------------
     # 4) Merge image + audio into clips (optional)
     # -------------------------------------
-    generate_all_clips(script_path)
+    if "clips" in stages:
+        from run_pipeline.generate_all_clips import generate_all_clips
+        with span("clips", title=TITLE_ID) as s:
+            generate_all_clips(script_path, mode=clip_mode)
+            s.add_output(f"outputs/clips/{TITLE_ID}")
 
     #  generate intro and outro clip
-    # generate_intros_outros(TITLE_ID)
+    if "intros" in stages:
+        from run_pipeline.generate_intros_outros import generate_intros_outros
+        with span("intros", title=TITLE_ID) as s:
+            s.add_output(generate_intros_outros(TITLE_ID))
 
+    if "thumbnails" in stages:
+        from run_pipeline.generate_thumbnails import generate_thumbnails
+        with span("thumbnails", title=TITLE_ID) as s:
+            s.add_output(generate_thumbnails(TITLE_ID, TITLE_NAME))
 
-    # generate_thumbnails(TITLE_ID, TITLE_NAME)
     # -------------------------------------
     # 6) Merge all clips into one final video (optional)
     # -------------------------------------
-    final_video_path = generate_final_video(script_path)
+    if "final" in stages:
+        from run_pipeline.generate_final_video import generate_final_video
+        with span("final", title=TITLE_ID) as s:
+            s.add_output(generate_final_video(script_path))
+
+
+def run_titles(start, end, stages, clip_mode=None):
+    for tid in range(start, end + 1):
+
+        TITLE_ID = str(tid)
+        TITLE_NAME, TITLE_PROMPT = get_title_data(TITLE_ID)
+
+        if not TITLE_NAME:
+            print(f"❌ Title ID {TITLE_ID} not found. Skipping.")
+            continue
+
+        print("\n====================================")
+        print(f"▶ Processing Title ID: {TITLE_ID}")
+        print("TITLE_NAME:", TITLE_NAME)
+        print("TITLE_PROMPT:", TITLE_PROMPT)
+        print("STAGES:", ", ".join(s for s in STAGES if s in stages))
+        print("====================================\n")
+
+        with span("title", title=TITLE_ID):
+            run_title(TITLE_ID, TITLE_NAME, stages, clip_mode)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the video pipeline for a range of title IDs.")
+    parser.add_argument("--stage", action="append", choices=STAGES + ["all"],
+                        help=f"Stage to run (repeatable). Default: {' '.join(DEFAULT_STAGES)}")
+    parser.add_argument("--start", type=int, default=START_ID, help="First title ID")
+    parser.add_argument("--end", type=int, default=END_ID, help="Last title ID")
+    parser.add_argument("--clip-mode", choices=["interactive", "auto", "static"],
+                        help="How scene clips get effects (default: ask, or auto when not on a terminal)")
+    parser.add_argument("--trace", action="store_true",
+                        help="Also write a Chrome trace next to the run report (outputs/reports)")
+    args = parser.parse_args(argv)
+
+    stages = args.stage or DEFAULT_STAGES
+    if "all" in stages:
+        stages = STAGES
+
+    # =====================================================
+    # MAIN LOOP – PROCESS ALL TITLES
+    # =====================================================
+
+    start_run()
+    try:
+        run_titles(args.start, args.end, stages, args.clip_mode)
+    finally:
+        write_report(trace=args.trace)
+
+    print("\n✅ ALL TITLES PROCESSED SUCCESSFULLY!")
+
 
-print("\n✅ ALL TITLES PROCESSED SUCCESSFULLY!")
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,30 @@
 import os
+import sys
 import json
 import wave
 import contextlib
 from scripts.clip import generate_scene_clip
+from scripts.instrument import span
 
+# interactive: Tk review windows, auto: headless effect policy, static: no effects
+CLIP_MODES = ("interactive", "auto", "static")
+HEADLESS_MODE = "auto"  # used when nobody is at the terminal to ask
+
+
+def resolve_clip_mode(mode=None):
+    """`mode` if given, else ask on a terminal, else HEADLESS_MODE."""
+    if mode is None:
+        if not sys.stdin or not sys.stdin.isatty():
+            return HEADLESS_MODE
+        answer = input("\nClip mode? [i]nteractive review / [a]uto effects / [S]tatic: ").strip().lower()
+        mode = {"i": "interactive", "y": "interactive", "a": "auto"}.get(answer[:1], "static")
+    if mode not in CLIP_MODES:
+        raise ValueError(f"Clip mode must be one of {', '.join(CLIP_MODES)}, got '{mode}'")
+    return mode
 
-def generate_all_clips(filepath_to_script: str):
-    
+
+def generate_all_clips(filepath_to_script: str, mode: str = None):
+    """Build every scene clip; `mode` is one of CLIP_MODES (None = ask, or auto when unattended)."""
 
     # Extract script ID from filename
     filename = os.path.basename(filepath_to_script)          # script_12.json
@@ -30,7 +48,7 @@ def generate_all_clips(filepath_to_script: str):
 
     # Iterate scenes
     
-    use_interactive = input("\nEnable Interactive Mode? (This will require manual verification for each clip) [y/N]: ").strip().lower() == 'y'
+    mode = resolve_clip_mode(mode)
     
     # Collect scenes for batch processing
     batch_scenes = []
@@ -92,12 +110,17 @@ def generate_all_clips(filepath_to_script: str):
         }
         batch_scenes.append(scene_data)
 
-    # Run Batch Processor if interactive
-    from scripts.interactive_clip import run_batch_processor
+    # Run Batch Processor if interactive, or the effect policy if unattended
+    decisions = {} # scene_id -> effect policy decision (auto mode)
     
-    if use_interactive and batch_scenes:
+    if mode == "interactive" and batch_scenes:
+        from scripts.interactive_clip import run_batch_processor
         print(f"\n[Main] Sending {len(batch_scenes)} scenes to Batch Processor...")
         run_batch_processor(batch_scenes)
+    elif mode == "auto" and batch_scenes:
+        from scripts.effect_policy import run_auto_processor
+        print(f"\n[Main] Choosing effects for {len(batch_scenes)} scenes automatically...")
+        decisions = run_auto_processor(batch_scenes, policy_path=os.path.join(clips_dir, "policy.json"))
         
     # Final Pass: Check exists (Batch might have skipped some) and generate static fallback
     for scene in script["scenes"]:
@@ -107,6 +130,13 @@ def generate_all_clips(filepath_to_script: str):
         output_path = os.path.join(clips_dir, f"scene_{scene_id}.mp4")
         audio_text = scene.get("text", "") # Getting text again
         audio_delay = scene.get("audio_delay", 0.5)
+        effect = scene.get("effect") # optional scripts/video_effects.py name
+
+        # Auto mode: the policy's image, and its full-frame effect if the cutout was unusable
+        decision = decisions.get(scene_id)
+        if decision:
+            image_path = decision["image_path"]
+            effect = effect or decision.get("finish")
 
         # Same checks
         # Same checks
@@ -121,7 +151,9 @@ def generate_all_clips(filepath_to_script: str):
         if os.path.exists(output_path): continue # If batch made it, we skip
 
         print(f"Generating STATIC clip for scene {scene_id} (Fallback)...")
-        generate_scene_clip(image_path, audio_path, output_path, audio_text, audio_delay=audio_delay)
+        with span("scene_clip", scene=scene_id) as s:
+            generate_scene_clip(image_path, audio_path, output_path, audio_text, audio_delay=audio_delay, effect=effect)
+            s.add_output(output_path)
 
     print("All clips generated successfully.")
 
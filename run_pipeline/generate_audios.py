@@ -3,6 +3,7 @@ import json
 import time
 from scripts.vits import generate_tts_audio
 from pydub import AudioSegment
+from scripts.instrument import span
 # from scripts.bark import generate_tts_audio
 
 
@@ -66,7 +67,9 @@ def generate_audios(filepath: str) -> list:
         scene_path = os.path.join(audio_dir, filename)
 
         try:
-            generate_tts_audio(text, scene_path, emotion)
+            with span("tts", scene=scene_id) as s:
+                generate_tts_audio(text, scene_path, emotion)
+                s.add_output(scene_path)
             full_audio += AudioSegment.from_wav(scene_path)
             # Do NOT remove it. interactive_clip.py needs it.
         except Exception as e:
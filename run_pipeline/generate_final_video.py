@@ -1,31 +1,147 @@
 import os
 import re
-import numpy as np
+import tempfile
 from moviepy.editor import (
     VideoFileClip, concatenate_videoclips,
-    CompositeVideoClip, ColorClip, ImageClip, AudioFileClip
+    CompositeVideoClip, ColorClip, AudioFileClip
 )
 from moviepy.video.fx.crop import crop
 
+from scripts.ffmpeg_io import FFmpegFrameWriter
+from scripts.ffmpeg_filters import build_circle_pip_filter
+from scripts.masks import circle_mask, static_mask_clip
+from scripts.timeline import Timeline
+from scripts.instrument import span
+
+PIP_VIDEO = "static/vid/dog.mp4"
+PIP_SIZE = 110
+PIP_BORDER = 6
+PIP_MARGIN = 30
+PIP_FEATHER = 2
+
+# "ffmpeg": PiP is drawn by an ffmpeg filter graph while encoding (no Python work per frame)
+# "moviepy": PiP is composited by MoviePy with numpy masks (legacy)
+PIP_MODE = "ffmpeg"
+
+# "stream": clips are read one at a time while encoding (flat memory for any scene count,
+#           needs the ffmpeg PiP); "compose": every clip opened up front with MoviePy (legacy)
+ASSEMBLY_MODE = "stream"
+
 
 def make_circle_mask(size, feather=2):
+    """Feathered circle mask for an (h, w) frame; cached, float32 and read-only."""
     h, w = size
-    y, x = np.ogrid[:h, :w]
-    cy, cx = h / 2, w / 2
-    r = min(cx, cy)
+    return circle_mask(w, h, feather)
+
+
+def overlay_pip_moviepy(base, pip_path=PIP_VIDEO):
+    """Composite the circular PiP (with white border) over `base` using MoviePy masks."""
+    pip = VideoFileClip(pip_path)
+
+    pip_size = PIP_SIZE
+    side = min(pip.w, pip.h)
+
+    pip = crop(
+        pip,
+        x_center=pip.w / 2,
+        y_center=pip.h / 2,
+        width=side,
+        height=side
+    ).resize(width=pip_size)
+
+    mask_array = make_circle_mask((pip_size, pip_size), feather=PIP_FEATHER)
+    pip_mask = static_mask_clip(mask_array, pip.duration)
+    pip = pip.set_mask(pip_mask)
+
+    border_size = pip_size + 2 * PIP_BORDER
+    border_mask_arr = make_circle_mask((border_size, border_size), feather=PIP_FEATHER)
+    border_mask = static_mask_clip(border_mask_arr, pip.duration)
+
+    border = ColorClip((border_size, border_size), color=(255, 255, 255))
+    border = border.set_mask(border_mask).set_duration(pip.duration)
+
+    margin = PIP_MARGIN
+    pip_pos = (margin, base.h - pip_size - margin)
+    border_pos = (pip_pos[0] - PIP_BORDER, pip_pos[1] - PIP_BORDER)
+
+    base_with_pip = CompositeVideoClip(
+        [
+            base,
+            border.set_position(border_pos).set_end(pip.duration),
+            pip.set_position(pip_pos).set_end(pip.duration)
+        ],
+        size=base.size
+    )
+    return base_with_pip, pip
+
+
+def write_with_pip_ffmpeg(final, output_path, pip_start, base_h, base_duration, fps=24,
+                          pip_path=PIP_VIDEO, audio_path=None):
+    """
+    Encode `final` while ffmpeg draws the PiP through a single filter_complex.
+    Python only streams the already-composited frames of `final`.
+    The PiP starts at `pip_start` and, like the MoviePy path, never outlives the main part.
+    """
+    pip_reader = VideoFileClip(pip_path, audio=False)
+    pip_duration = min(pip_reader.duration, base_duration)
+    pip_reader.close()
+
+    filter_complex = build_circle_pip_filter(
+        "0:v", "1:v", base_h,
+        pip_size=PIP_SIZE, border=PIP_BORDER, margin=PIP_MARGIN,
+        feather=PIP_FEATHER, start=pip_start, duration=pip_duration, fps=fps
+    )
 
-    dist = np.sqrt((x - cx)**2 + (y - cy)**2)
-    mask = (dist <= r).astype(float)
+    inputs = [["-i", pip_path]]
+    maps = []
+    if audio_path:
+        inputs.append(["-i", audio_path])
+        maps.append("2:a")
 
-    edge = (dist > r - feather) & (dist < r + feather)
-    mask[edge] = (1 - (dist[edge] - (r - feather)) / (2 * feather)).clip(0, 1)
+    with FFmpegFrameWriter(
+        output_path, final.size, fps,
+        inputs=inputs, filter_complex=filter_complex, maps=maps,
+        output_params=["-t", f"{final.duration:.6f}"]
+    ) as writer:
+        for frame in final.iter_frames(fps=fps, dtype="uint8"):
+            writer.write_frame(frame)
 
-    return mask
+    return output_path
 
 
-def generate_final_video(filepath_to_script: str):
+def write_streamed(scene_files, output_path, audio_path=None, intro_path=None, outro_path=None, fps=24):
+    """
+    Encode intro + scenes + outro with a single clip reader open at a time
+    (see scripts.timeline), so peak memory does not grow with the scene count.
+    """
+    heads = [intro_path] if intro_path else []
+    tails = [outro_path] if outro_path else []
+    timeline = Timeline(heads + scene_files + tails, fps=fps)
+    scenes = timeline.segments[len(heads):len(timeline.segments) - len(tails)]
+
+    pip_start = timeline.segments[0].duration if intro_path else 0.0
+    base_h = max(seg.size[1] for seg in scenes)
+    base_duration = sum(seg.duration for seg in scenes)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if audio_path and os.path.exists(audio_path):
+            mux_audio = audio_path
+        elif timeline.has_audio:
+            # No global track: mux whatever audio the clips carry (intro/outro)
+            mux_audio = timeline.write_audio(os.path.join(tmp_dir, "final_audio.wav"))
+        else:
+            mux_audio = None
+
+        write_with_pip_ffmpeg(timeline, output_path, pip_start, base_h, base_duration,
+                              fps=fps, audio_path=mux_audio)
+    return timeline
+
+
+def generate_final_video(filepath_to_script: str, pip_mode: str = PIP_MODE, base_dir: str = "outputs",
+                         assembly: str = ASSEMBLY_MODE):
+    """Concatenate intro + scene clips + outro under `base_dir` into <base_dir>/videos/<id>.mp4."""
     script_id = os.path.basename(filepath_to_script).replace("script_", "").replace(".json", "")
-    BASE = "outputs"
+    BASE = base_dir
 
     clips_dir = os.path.join(BASE, "clips", script_id)
     videos_dir = os.path.join(BASE, "videos")
@@ -38,9 +154,8 @@ def generate_final_video(filepath_to_script: str):
     # ------------------------------------------------------------------------------------
     intro_path = os.path.join(clips_dir, "intro.mp4")
     outro_path = os.path.join(clips_dir, "outro.mp4")
-
-    intro_clip = VideoFileClip(intro_path) if os.path.exists(intro_path) else None
-    outro_clip = VideoFileClip(outro_path) if os.path.exists(outro_path) else None
+    intro_path = intro_path if os.path.exists(intro_path) else None
+    outro_path = outro_path if os.path.exists(outro_path) else None
 
     # ------------------------------------------------------------------------------------
     # GET MAIN VIDEO CLIPS
@@ -62,48 +177,36 @@ def generate_final_video(filepath_to_script: str):
         print("No video clips found:", clips_dir)
         return None
 
+    audio_path = os.path.join(BASE, "audios", script_id, "full_audio.wav")
+
+    if assembly == "stream" and pip_mode != "moviepy":
+        if os.path.exists(audio_path):
+            print(f"Merging Global Audio: {audio_path}")
+        else:
+            print(f"WARNING: Global audio not found at {audio_path}. Video will be silent (or use clip audio).")
+        print(f"Streaming {len(video_files)} scene clips into {output_path}")
+        with span("final_mux", scenes=len(video_files)) as s:
+            timeline = write_streamed(video_files, output_path, audio_path, intro_path, outro_path, fps=24)
+            s.annotate(max_open_readers=timeline.max_open_readers)
+            s.add_output(output_path)
+        print("Saved:", output_path)
+        return output_path
+
+    intro_clip = VideoFileClip(intro_path) if intro_path else None
+    outro_clip = VideoFileClip(outro_path) if outro_path else None
+
     clips = [VideoFileClip(v) for v in video_files]
     base = concatenate_videoclips(clips, method="compose")
 
     # ------------------------------------------------------------------------------------
     # PiP OVERLAY (dog.mp4)
     # ------------------------------------------------------------------------------------
-    pip = VideoFileClip("static/vid/dog.mp4")
-
-    pip_size = 110
-    side = min(pip.w, pip.h)
-
-    pip = crop(
-        pip,
-        x_center=pip.w / 2,
-        y_center=pip.h / 2,
-        width=side,
-        height=side
-    ).resize(width=pip_size)
-
-    mask_array = make_circle_mask((pip_size, pip_size), feather=2)
-    pip_mask = ImageClip(mask_array, ismask=True).set_duration(pip.duration)
-    pip = pip.set_mask(pip_mask)
-
-    border_size = pip_size + 12
-    border_mask_arr = make_circle_mask((border_size, border_size), feather=2)
-    border_mask = ImageClip(border_mask_arr, ismask=True).set_duration(pip.duration)
-
-    border = ColorClip((border_size, border_size), color=(255, 255, 255))
-    border = border.set_mask(border_mask).set_duration(pip.duration)
-
-    margin = 30
-    pip_pos = (margin, base.h - pip_size - margin)
-    border_pos = (pip_pos[0] - 6, pip_pos[1] - 6)
-
-    base_with_pip = CompositeVideoClip(
-        [
-            base,
-            border.set_position(border_pos).set_end(pip.duration),
-            pip.set_position(pip_pos).set_end(pip.duration)
-        ],
-        size=base.size
-    )
+    pip = None
+    if pip_mode == "moviepy":
+        base_with_pip, pip = overlay_pip_moviepy(base)
+    else:
+        # Drawn by ffmpeg at encode time, see write_with_pip_ffmpeg
+        base_with_pip = base
 
     # ------------------------------------------------------------------------------------
     # MERGE INTRO + MAIN + OUTRO
@@ -123,7 +226,6 @@ def generate_final_video(filepath_to_script: str):
     # ------------------------------------------------------------------------------------
     # SET GLOBAL AUDIO (from full_audio.wav)
     # ------------------------------------------------------------------------------------
-    audio_path = os.path.join(BASE, "audios", script_id, "full_audio.wav")
     if os.path.exists(audio_path):
         print(f"Merging Global Audio: {audio_path}")
         global_audio = AudioFileClip(audio_path)
@@ -139,10 +241,27 @@ def generate_final_video(filepath_to_script: str):
     # ------------------------------------------------------------------------------------
     # Export
     # ------------------------------------------------------------------------------------
-    final.write_videofile(output_path, codec="libx264", audio_codec="aac", fps=24)
+    with span("final_mux") as s:
+        if pip_mode == "moviepy":
+            final.write_videofile(output_path, codec="libx264", audio_codec="aac", fps=24)
+        else:
+            pip_start = intro_clip.duration if intro_clip else 0.0
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                if os.path.exists(audio_path):
+                    mux_audio = audio_path
+                elif final.audio is not None:
+                    # No global track: mux whatever audio the clips carry (intro/outro)
+                    mux_audio = os.path.join(tmp_dir, "final_audio.m4a")
+                    final.audio.write_audiofile(mux_audio, fps=44100, codec="aac", logger=None)
+                else:
+                    mux_audio = None
+
+                write_with_pip_ffmpeg(final, output_path, pip_start, base.h, base.duration,
+                                      fps=24, audio_path=mux_audio)
+        s.add_output(output_path)
 
     base.close()
-    pip.close()
+    if pip: pip.close()
     base_with_pip.close()
     final.close()
 
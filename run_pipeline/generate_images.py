@@ -2,9 +2,35 @@ import os
 import json
 import time
 from scripts.kandisky import generate_image_from_prompt
+from scripts.image_scores import score_image
+from scripts.instrument import span, annotate
 
+# "sequential": stop generating a scene's candidates once one is good enough
+# (CLIP similarity to the scene text and sharpness); "all": always every prompt
+CANDIDATE_MODE = "sequential"
+GOOD_ENOUGH_CLIP = 0.27   # Kandinsky prior CLIP (ViT-L/14) cosine; on-topic images score ~0.25-0.35
+MIN_SHARPNESS = 3.0       # image_scores sharpness (log Laplacian variance); blurry images score lower
 
-def generate_images(filepath: str) -> list:
+
+_score_error = None  # why scoring failed; not retried for the rest of the run
+
+
+def good_enough(image_path, text):
+    """(accept?, metrics): without a CLIP score, or if scoring fails, nothing is accepted early."""
+    global _score_error
+    if _score_error is not None:
+        return False, {}
+    try:
+        metrics = score_image(image_path, text)
+    except Exception as e:  # e.g. OpenCV missing: fall back to generating every candidate
+        _score_error = str(e)
+        print(f"[SCORES] Image scoring unavailable ({e}); generating every candidate")
+        return False, {}
+    ok = metrics.get("clip", 0.0) >= GOOD_ENOUGH_CLIP and metrics.get("sharpness", 0.0) >= MIN_SHARPNESS
+    return ok, metrics
+
+
+def generate_images(filepath: str, mode: str = CANDIDATE_MODE) -> list:
 
     if not os.path.exists(filepath):
         raise FileNotFoundError(f"File not found: {filepath}")
@@ -50,6 +76,8 @@ def generate_images(filepath: str) -> list:
     print(f"\nGenerating images for project: {title} ({len(scenes)} scenes)\n")
 
     generated = []
+    n_generated = n_skipped = 0
+    diffusion_s = 0.0
 
     for scene in scenes:
         scene_id = scene.get("id", "unknown")
@@ -69,10 +97,8 @@ def generate_images(filepath: str) -> list:
         scene_dir = os.path.join(image_dir, f"scene_{scene_id}")
         os.makedirs(scene_dir, exist_ok=True)
 
-        for i, prompt in enumerate(prompts, start=1):
-            if not prompt.strip():
-                continue
-                
+        jobs = [(i, prompt) for i, prompt in enumerate(prompts, start=1) if prompt.strip()]
+        for n, (i, prompt) in enumerate(jobs):
             # filename: img_1.png, img_2.png inside scene_X folder
             filename = f"img_{i}.png" 
             output_path = os.path.join(scene_dir, filename)
@@ -80,16 +106,41 @@ def generate_images(filepath: str) -> list:
             if os.path.exists(output_path):
                  print(f"  -> {filename} already exists in scene_{scene_id}, skipping.")
                  generated.append(output_path)
-                 continue
-
-            try:
-                print(f"Generating scene {scene_id} image {i}...")
-                path = generate_image_from_prompt(prompt, output_path)
-                generated.append(path)
-            except Exception as e:
-                print(f"Error generating scene {scene_id} image {i}: {e}")
-            
-            time.sleep(0.2)
+            else:
+                try:
+                    print(f"Generating scene {scene_id} image {i}...")
+                    t0 = time.perf_counter()
+                    with span("diffusion", scene=scene_id, image=i) as s:
+                        path = generate_image_from_prompt(prompt, output_path)
+                        s.add_output(path)
+                    diffusion_s += time.perf_counter() - t0
+                    n_generated += 1
+                    generated.append(path)
+                except Exception as e:
+                    print(f"Error generating scene {scene_id} image {i}: {e}")
+                
+                time.sleep(0.2)
+
+            # Sequential mode: later prompts are only generated if this candidate falls short
+            remaining = [os.path.join(scene_dir, f"img_{j}.png") for j, _ in jobs[n + 1:]]
+            remaining = [p for p in remaining if not os.path.exists(p)]
+            if mode == "sequential" and remaining and os.path.exists(output_path):
+                ok, metrics = good_enough(output_path, scene.get("text", ""))
+                if ok:
+                    print(f"  -> img_{i} is good enough (clip {metrics['clip']:.3f}), "
+                          f"skipping {len(remaining)} more for scene {scene_id}")
+                    n_skipped += len(remaining)
+                    break
+
+    # Compute saved by stopping early, estimated from this run's average diffusion time
+    if mode == "sequential":
+        avg_s = diffusion_s / n_generated if n_generated else None
+        saved_s = avg_s * n_skipped if avg_s is not None else None
+        total = n_generated + n_skipped
+        saved_text = f", ~{saved_s / 60:.1f} min of diffusion saved" if saved_s is not None else ""
+        print(f"\nEarly stop: skipped {n_skipped} of {total} candidates to generate{saved_text}")
+        annotate(images_generated=n_generated, images_skipped=n_skipped,
+                 est_saved_s=round(saved_s, 1) if saved_s is not None else None)
 
     print(f"\nFinished. {len(generated)} images saved in {image_dir}")
     return generated
@@ -1,8 +1,11 @@
 import json
 import os
 from scripts.intro_outro import  generate_intro_clip , generate_outro_clip
+from scripts.intro_outro import render_intro_frames, render_outro_frames
+from scripts.frame_server import DEFAULT_RENDERER
+from scripts.instrument import span
 
-def generate_intros_outros(TITLE_ID: str):
+def generate_intros_outros(TITLE_ID: str, renderer: str = DEFAULT_RENDERER):
     # Load titles.json
     with open("static/titles.json", "r", encoding="utf-8") as f:
         titles = json.load(f)
@@ -26,6 +29,20 @@ def generate_intros_outros(TITLE_ID: str):
 
     os.makedirs(f"outputs/clips/{TITLE_ID}", exist_ok=True)
 
+    if renderer == "frames":
+        try:
+            with span("intro") as s:
+                render_intro_frames(thumb_path, intro_audio, title_text, save_intro, fps=30)
+                s.add_output(save_intro)
+            with span("outro") as s:
+                render_outro_frames(outro_audio, save_outro, fps=30)
+                s.add_output(save_outro)
+            return save_intro, save_outro
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            print(f"Frame server failed ({e}), falling back to MoviePy...")
+
     # Generate 2-sec intro
     intro_clip = generate_intro_clip(
         image_path=thumb_path,
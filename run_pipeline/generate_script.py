@@ -1,44 +1,147 @@
-import re
 import json
 import os
-from json_repair import repair_json
-from llm.generate_script import generate_script
-from scripts.prompt import build_educational_script_prompt, build_scene_generation_prompt
+import asyncio
+from llm.generate_script import generate_script, generate_script_stream
+from llm.script_json import (
+    parse_script_json, validate_script, structure_problem,
+    broken_scenes, merge_scene_fixes, scene_problem, SCRIPT_SCHEMA, SCENE_LIST_SCHEMA
+)
+from llm.stream_parser import SceneStreamParser
+from llm.rate_limit import TokenBucket, backoff_delay
+from llm.cache import CacheMiss
+from scripts.prompt import build_educational_script_prompt, build_scene_generation_prompt, build_scene_repair_prompt
 
 OUTPUT_DIR = "outputs"
 MAX_RETRIES = 5
 
+TITLES_PATH = "static/titles.json"
 
-def extract_first_json_block(text: str) -> str:
+# Async batch generation (generate_all_scripts)
+MAX_CONCURRENT_TITLES = 4
+REQUESTS_PER_MINUTE = 10   # Gemini free tier for 2.5 Flash
+REQUEST_BURST = 2
+API_RETRIES = 4            # per call, with exponential backoff
+
+
+def save_script(script_data, TITLE_ID):
+    # Save in new location: outputs/scripts/script_<id>.json
+    scripts_dir = os.path.join(OUTPUT_DIR, "scripts")
+    os.makedirs(scripts_dir, exist_ok=True)
+
+    filepath = os.path.join(scripts_dir, f"script_{TITLE_ID}.json")
+
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(script_data, f, indent=2, ensure_ascii=False)
+
+    print(f"Script saved at: {filepath}")
+    return filepath
+
+
+def stream_scene_json(prompt_json, attempt, announce):
+    """Stream the scene conversion, passing each scene to `announce` as it closes. Returns the full reply."""
+    parser = SceneStreamParser()
+    chunks = []
+    try:
+        for chunk in generate_script_stream(prompt_json, SCRIPT_SCHEMA, attempt=attempt):
+            chunks.append(chunk)
+            for scene in parser.feed(chunk):
+                announce(scene)
+    except CacheMiss:
+        raise
+    except Exception as e:
+        print(f"❌ Gemini API Error: {e}")
+    return "".join(chunks)
+
+
+def scene_conversion(prompt_json, label=None, on_update=None):
     """
-    Extract the first { ... } block by bracket counting.
-    Works even if text contains garbage before/after JSON.
+    STEP 2 retry loop, shared by generate_Script_Gemini and generate_script_async.
+
+    A generator that yields (prompt, response_schema, attempt) for every LLM
+    call it needs and is sent back the raw reply; the caller makes the call,
+    sync or async. A structurally bad reply is regenerated whole; if only some
+    scenes are broken, just those are re-prompted and merged back. Returns
+    (via StopIteration) the script, or an error dict after MAX_RETRIES.
+    `on_update(script)` runs after every structurally sound attempt.
     """
-    start = text.find("{")
-    if start == -1:
-        return None
+    prefix = f"[{label}] " if label else ""
+    script_data = None
+    raw_output = ""
+
+    for attempt in range(1, MAX_RETRIES + 1):
+
+        if script_data is None:
+            print(f"\n{prefix}[Step 2] Attempt {attempt}/{MAX_RETRIES} for JSON Conversion...")
+            raw_output = yield prompt_json, SCRIPT_SCHEMA, attempt
+
+            candidate = parse_script_json(raw_output)
+            problem = structure_problem(candidate) if candidate is not None else "no usable JSON"
+            if problem:
+                print(f"{prefix}{problem}. Retrying...")
+                continue
+            script_data = candidate
+        else:
+            broken = broken_scenes(script_data)
+            print(f"\n{prefix}[Step 2] Attempt {attempt}/{MAX_RETRIES}: repairing {len(broken)} scene(s)...")
+            raw_output = yield build_scene_repair_prompt(script_data, broken), SCENE_LIST_SCHEMA, attempt
+            fixed = merge_scene_fixes(script_data, parse_script_json(raw_output), broken)
+            print(f"{prefix}Repaired {fixed}/{len(broken)} scene(s).")
+
+        if on_update is not None:
+            on_update(script_data)
+
+        problem = validate_script(script_data)
+        if problem:
+            print(f"{prefix}{problem}. Repairing broken scenes...")
+            continue
+
+        print(f"{prefix}Valid script generated ({len(script_data['scenes'])} scenes).")
+        return script_data
+
+    return {
+        "error": "Failed to generate valid script after retries.",
+        "raw_output": raw_output
+    }
+
 
-    depth = 0
-    for i, ch in enumerate(text[start:], start=start):
-        if ch == "{":
-            depth += 1
-        elif ch == "}":
-            depth -= 1
-            if depth == 0:
-                return text[start:i + 1]
-    return None
+def run_conversion(steps, call_llm):
+    """Drive a scene_conversion() generator with a blocking call_llm(prompt, schema, attempt)."""
+    try:
+        request = next(steps)
+        while True:
+            request = steps.send(call_llm(*request))
+    except StopIteration as done:
+        return done.value
 
-def generate_Script_Gemini(TITLE_NAME, TITLE_ID):
+
+def generate_Script_Gemini(TITLE_NAME, TITLE_ID, on_scene=None):
+    """
+    Generate outputs/scripts/script_<id>.json for one title.
+
+    With `on_scene`, the scene JSON is streamed and on_scene(scene) is called
+    for each valid scene as soon as the LLM finishes writing it (repaired
+    scenes follow later). If a retry replaces a scene, it is announced again
+    under the same id.
+    """
 
     os.makedirs(OUTPUT_DIR, exist_ok=True)
-    
+
+    announced = {}
+
+    def announce(scene):
+        if on_scene is None or scene_problem(scene):
+            return
+        if announced.get(scene.get("id")) != scene:
+            announced[scene.get("id")] = scene
+            on_scene(scene)
+
     # ---------------------------------------------------------
     # STEP 1: Generate Educational Script (Text Only)
     # ---------------------------------------------------------
     print(f"\n[Step 1] Generating Educational Script for: {TITLE_NAME}...")
     prompt_text = build_educational_script_prompt(TITLE_NAME)
     educational_script_text = generate_script(prompt_text)
-    
+
     if not educational_script_text or len(educational_script_text) < 100:
          print("Error: Generated script text is too short.")
          return None
@@ -46,73 +149,104 @@ def generate_Script_Gemini(TITLE_NAME, TITLE_ID):
     print(f"[Step 1] Script generated ({len(educational_script_text)} chars). Proceeding to Scene generation...")
 
     # ---------------------------------------------------------
-    # STEP 2: Convert to JSON Scenes (with Retry)
+    # STEP 2: Convert to JSON Scenes (with Retry, see scene_conversion)
     # ---------------------------------------------------------
     prompt_json = build_scene_generation_prompt(educational_script_text)
-    
-    script_data = None
-    raw_output = ""
 
-    for attempt in range(1, MAX_RETRIES + 1):
+    def call_llm(prompt, schema, attempt):
+        if on_scene is not None and schema is SCRIPT_SCHEMA:
+            return stream_scene_json(prompt, attempt, announce)
+        return generate_script(prompt, schema, attempt=attempt)
 
-        print(f"\n[Step 2] Attempt {attempt}/{MAX_RETRIES} for JSON Conversion...")
+    def announce_all(script):
+        for scene in script["scenes"]:
+            announce(scene)
 
-        raw_output = generate_script(prompt_json)
+    script_data = run_conversion(scene_conversion(prompt_json, on_update=announce_all), call_llm)
+    return save_script(script_data, TITLE_ID)
 
-        cleaned = re.sub(r"```(?:json)?|```", "", raw_output).strip()
 
-        block = extract_first_json_block(cleaned)
-        if not block:
-            print("No JSON block. Retrying...")
-            continue
+# =========================================================
+# ASYNC BATCH GENERATION
+# =========================================================
 
+async def _call_llm(client, limiter, prompt, label, response_schema=None, attempt=0):
+    """One rate-limited LLM call, retried with exponential backoff on errors."""
+    for retry in range(API_RETRIES + 1):
+        await limiter.acquire()
         try:
-            script_data = json.loads(block)
-        except:
-            try:
-                repaired = repair_json(block)
-                script_data = json.loads(repaired)
-                print("JSON repaired successfully.")
-            except:
-                print("JSON unrecoverable. Retrying...")
-                continue
+            return await client.generate(prompt, response_schema=response_schema, attempt=attempt)
+        except CacheMiss:
+            raise
+        except Exception as e:
+            if retry == API_RETRIES:
+                raise
+            delay = backoff_delay(retry)
+            print(f"[{label}] LLM error ({e}). Retrying in {delay:.1f}s...")
+            await asyncio.sleep(delay)
+
+
+async def generate_script_async(TITLE_NAME, TITLE_ID, client, limiter):
+    """Async twin of generate_Script_Gemini using a pluggable `client` (see llm/clients.py)."""
+    label = f"title {TITLE_ID}"
+
+    # STEP 1: Educational script
+    prompt_text = build_educational_script_prompt(TITLE_NAME)
+    educational_script_text = await _call_llm(client, limiter, prompt_text, label)
 
-        if "scenes" not in script_data:
-            print("'scenes' missing. Retrying...")
-            continue
+    if not educational_script_text or len(educational_script_text) < 100:
+        print(f"[{label}] Error: Generated script text is too short.")
+        return None
 
-        if not isinstance(script_data["scenes"], list) or len(script_data["scenes"]) < 5:
-            print("Invalid scenes array (too short). Retrying...")
-            continue
-            
-        # Validate Image Prompts
-        valid_images = True
-        for scene in script_data["scenes"]:
-            if "image_prompts" not in scene or not isinstance(scene["image_prompts"], list) or len(scene["image_prompts"]) != 3:
-                 print(f"Invalid image_prompts in scene {scene.get('id')}. Must be list of 3.")
-                 valid_images = False
-                 break
-        
-        if not valid_images:
-            continue
+    # STEP 2: JSON scenes (same retry loop as the sync path, calls awaited here)
+    steps = scene_conversion(build_scene_generation_prompt(educational_script_text), label=label)
+    try:
+        prompt, schema, attempt = next(steps)
+        while True:
+            raw_output = await _call_llm(client, limiter, prompt, label, schema, attempt)
+            prompt, schema, attempt = steps.send(raw_output)
+    except StopIteration as done:
+        script_data = done.value
 
-        print("Valid script generated.")
-        break
+    return save_script(script_data, TITLE_ID)
 
-    if script_data is None:
-        script_data = {
-            "error": "Failed to generate valid script after retries.",
-            "raw_output": raw_output
-        }
 
-    # Save in new location: outputs/scripts/script_<id>.json
-    scripts_dir = os.path.join(OUTPUT_DIR, "scripts")
-    os.makedirs(scripts_dir, exist_ok=True)
+async def generate_all_scripts_async(titles, client=None, max_concurrency=MAX_CONCURRENT_TITLES,
+                                     requests_per_minute=REQUESTS_PER_MINUTE, burst=REQUEST_BURST):
+    """
+    Generate scripts for many titles at once.
+    `titles` is a list of {"id", "title"} dicts; returns {id: script path or None}.
+    """
+    if client is None:
+        from llm.clients import GeminiClient, CachedClient
+        client = CachedClient(GeminiClient())
 
-    filepath = os.path.join(scripts_dir, f"script_{TITLE_ID}.json")
+    limiter = TokenBucket.per_minute(requests_per_minute, burst)
+    semaphore = asyncio.Semaphore(max_concurrency)
 
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(script_data, f, indent=2, ensure_ascii=False)
+    async def run_one(item):
+        async with semaphore:
+            try:
+                return await generate_script_async(item["title"], item["id"], client, limiter)
+            except Exception as e:
+                print(f"❌ Script for title {item['id']} failed: {e}")
+                return None
 
-    print(f"Script saved at: {filepath}")
-    return filepath
+    paths = await asyncio.gather(*(run_one(item) for item in titles))
+    return {item["id"]: path for item, path in zip(titles, paths)}
+
+
+def generate_all_scripts(titles_path=TITLES_PATH, client=None, **kwargs):
+    """Sync entry point: generate scripts for every title in `titles_path` concurrently."""
+    with open(titles_path, "r", encoding="utf-8") as f:
+        titles = json.load(f)
+
+    print(f"📝 Generating {len(titles)} scripts...")
+    results = asyncio.run(generate_all_scripts_async(titles, client=client, **kwargs))
+    done = sum(1 for path in results.values() if path)
+    print(f"✅ {done}/{len(titles)} scripts generated")
+    return results
+
+
+if __name__ == "__main__":
+    generate_all_scripts()
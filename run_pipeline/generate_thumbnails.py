@@ -1,12 +1,61 @@
 import os
-from scripts.thumbnail import create_clickbait_thumbnail
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from scripts.thumbnail import create_clickbait_thumbnail, render_thumbnail_variants, CAT_PATH, BOX_PATH
+
+TITLES_PATH = "static/titles.json"
+
+# Thumbnails for different titles are independent. Each worker process decodes
+# and resizes the cat/bubble/font assets once, then reuses them for its titles.
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# One A/B variant per seed
+VARIANT_SEEDS = [1, 2, 3, 4]
+
 
 def generate_thumbnails(title_id, title_name):
-    bg_path = f"outputs/thumbnails/thumb_{title_id}.png"   
-    cat_path = "static/img/cat-exc.png"
-    box_path = "static/img/comment_box.png"
+    bg_path = f"outputs/thumbnails/thumb_{title_id}.png"
+    cat_path = CAT_PATH
+    box_path = BOX_PATH
     output_path = f"outputs/thumbnails/thumbnail_{title_id}.png"
 
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-    create_clickbait_thumbnail(bg_path, cat_path, box_path, title_name, output_path)
\ No newline at end of file
+    return create_clickbait_thumbnail(bg_path, cat_path, box_path, title_name, output_path)
+
+
+def generate_thumbnail_variants(title_id, title_name, seeds=VARIANT_SEEDS):
+    """A/B variants: thumbnail_<id>_v<n>.png plus thumbnail_<id>_variants.json."""
+    bg_path = f"outputs/thumbnails/thumb_{title_id}.png"
+    output_dir = "outputs/thumbnails"
+
+    return render_thumbnail_variants(bg_path, title_name, seeds, output_dir, f"thumbnail_{title_id}")
+
+
+def generate_all_thumbnails(titles_path=TITLES_PATH, max_workers=MAX_WORKERS):
+    """Render the thumbnail of every title in `titles_path` in parallel. Returns {id: path or None}."""
+    with open(titles_path, "r", encoding="utf-8") as f:
+        titles = json.load(f)
+
+    print(f"🖼️  Rendering {len(titles)} thumbnails with {max_workers} workers...")
+    results = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(generate_thumbnails, item["id"], item["title"]): item["id"]
+            for item in titles
+        }
+        for future in as_completed(futures):
+            title_id = futures[future]
+            try:
+                results[title_id] = future.result()
+            except Exception as e:
+                print(f"❌ Thumbnail for title {title_id} failed: {e}")
+                results[title_id] = None
+
+    done = sum(1 for path in results.values() if path)
+    print(f"✅ {done}/{len(titles)} thumbnails rendered")
+    return results
+
+
+if __name__ == "__main__":
+    generate_all_thumbnails()
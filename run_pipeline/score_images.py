@@ -0,0 +1,42 @@
+import os
+import json
+from scripts.image_scores import rank_candidates
+from scripts.instrument import span
+
+
+def scene_candidates_for(script, images_dir):
+    """[{id, candidates, text}] for every scene with images in images/<id>/scene_<sid>/img_<n>.png."""
+    scenes = []
+    for scene in script["scenes"]:
+        scene_id = scene["id"]
+        scene_dir = os.path.join(images_dir, f"scene_{scene_id}")
+        candidates = [os.path.join(scene_dir, f"img_{i}.png") for i in range(1, 4)]
+        candidates = [p for p in candidates if os.path.exists(p)]
+        if candidates:
+            scenes.append({"id": scene_id, "candidates": candidates, "text": scene.get("text", "")})
+    return scenes
+
+
+def score_images(filepath: str) -> list:
+    """Rank each scene's candidate images (cached) and save images/<id>/ranking.json."""
+    with open(filepath, "r", encoding="utf-8") as f:
+        script = json.load(f)
+
+    filename = os.path.basename(filepath)
+    script_id = filename.replace("script_", "").replace(".json", "")
+    images_dir = os.path.join("outputs", "images", script_id)
+
+    scenes = scene_candidates_for(script, images_dir)
+    n_images = sum(len(s["candidates"]) for s in scenes)
+    print(f"\nScoring {n_images} candidate images for {len(scenes)} scenes...")
+
+    with span("image_scores", images=n_images):
+        rank_candidates(scenes)
+
+    ranking_path = os.path.join(images_dir, "ranking.json")
+    with open(ranking_path, "w", encoding="utf-8") as f:
+        json.dump([{"id": s["id"], "candidates": s["candidates"], "scores": s.get("scores", {})} for s in scenes],
+                  f, indent=2)
+
+    print(f"Ranking saved at {ranking_path}")
+    return [ranking_path]
@@ -1,11 +1,19 @@
 import os
 import time
-from bark import SAMPLE_RATE, generate_audio, preload_models
 from scipy.io.wavfile import write as write_wav
 
-# --------- SETUP ---------
-print("Loading Bark models...")
-preload_models()
+_models_loaded = False
+
+
+def load_bark():
+    """Import bark and preload its models on first use."""
+    global _models_loaded
+    import bark
+    if not _models_loaded:
+        print("Loading Bark models...")
+        bark.preload_models()
+        _models_loaded = True
+    return bark
 
 # Default Bark speaker (choose any from the list below)
 DEFAULT_SPEAKER = "v2/en_speaker_6"
@@ -33,13 +41,15 @@ def generate_tts_audio(text: str, output_path: str, emotion: str = "calm") -> st
     emotion_prefix = EMOTION_TAGS.get(emotion, EMOTION_TAGS["calm"])
     final_text = f"{emotion_prefix} {text}"
 
+    bark = load_bark()
+
     try:
-        audio_array = generate_audio(
+        audio_array = bark.generate_audio(
             final_text,
             history_prompt=DEFAULT_SPEAKER
         )
 
-        write_wav(output_path, SAMPLE_RATE, audio_array)
+        write_wav(output_path, bark.SAMPLE_RATE, audio_array)
 
     except Exception as e:
         print(f"Error generating Bark audio ({emotion}): {e}")
@@ -6,6 +6,9 @@ from PIL import Image, ImageDraw, ImageFont
 import numpy as np
 from moviepy.editor import ImageClip, AudioFileClip, CompositeVideoClip
 
+from scripts.video_effects import apply_clip_effect
+from scripts.frame_profiler import profile_render, profile_name
+
 
 def split_text_by_time(text: str, audio_duration: float, max_chars=40):
     wrapped = textwrap.wrap(text, max_chars)
@@ -83,7 +86,9 @@ def create_caption_image(text, width, fontsize=34, min_fontsize=34):
     return np.array(img)
 
 
-def generate_scene_clip(image_path: str, audio_path: str, output_path: str, audio_text: str, audio_delay: float = 0.5):
+def generate_scene_clip(image_path: str, audio_path: str, output_path: str, audio_text: str, audio_delay: float = 0.5,
+                        effect: str = None):
+    """Static image clip with captions; `effect` optionally names a scripts.video_effects effect."""
     audio = AudioFileClip(audio_path)
     duration = audio.duration
     
@@ -99,6 +104,9 @@ def generate_scene_clip(image_path: str, audio_path: str, output_path: str, audi
     clip = ImageClip(image_path, duration=video_duration)
     clip = clip.resize(newsize=(1920, 1080))
 
+    if effect:
+        clip = apply_clip_effect(clip, effect)
+
     if random.random() < 0.30:
         clip = clip.fadein(random.uniform(0.3, 1.0))
     if random.random() < 0.30:
@@ -120,15 +128,16 @@ def generate_scene_clip(image_path: str, audio_path: str, output_path: str, audi
     final = CompositeVideoClip([clip] + subtitle_clips, size=clip.size)
     
     # Write video only (Silent)
-    final.write_videofile(
-        output_path,
-        fps=24,
-        codec="libx264",
-        audio=False,
-        preset='medium',
-        threads=4,
-        logger=None
-    )
+    with profile_render(profile_name(output_path), final):
+        final.write_videofile(
+            output_path,
+            fps=24,
+            codec="libx264",
+            audio=False,
+            preset='medium',
+            threads=4,
+            logger=None
+        )
     
     # Cleanup
     clip.close()
@@ -0,0 +1,120 @@
+"""
+Headless effect selection for unattended runs.
+
+Stands in for the two review windows of run_batch_processor: for every scene
+it takes the best candidate image by scripts.image_scores (CLIP relevance,
+sharpness, saturation), extracts it, measures the cutout and assigns an
+effect from EFFECT_RULES (first match wins), then renders on the same
+ReviewPipeline worker pools, so extraction and rendering overlap.
+
+Features per scene:
+    score       the chosen image's combined image_scores rank score
+    fg_ratio    share of the frame covered by the rembg alpha (> 50%)
+    fg_offset   horizontal distance of the subject's box center from the
+                frame center, as a fraction of the width (-0.5 .. 0.5)
+
+Decisions (with their features and reason) are saved to policy.json next to
+the clips, so an overnight run can be audited or replayed.
+"""
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from scripts.image_scores import SCORE_DIR, rank_candidates
+
+POLICY_WORKERS = 2  # scenes being decided at once (each mostly waits on its extraction)
+
+# Outside this range rembg either found nothing or kept the whole frame:
+# animate the full picture instead of a cutout
+MIN_FG_RATIO = 0.03
+MAX_FG_RATIO = 0.85
+FULL_FRAME_EFFECT = "zoom_in_center"
+
+# (reason, test(features), choice, finish); choices are run_batch_processor's effect numbers
+EFFECT_RULES = [
+    ("no clean cutout", lambda f: not MIN_FG_RATIO <= f["fg_ratio"] <= MAX_FG_RATIO, "0", FULL_FRAME_EFFECT),
+    ("small subject", lambda f: f["fg_ratio"] < 0.12, "1", None),              # Zoom Subject
+    ("subject off-center", lambda f: abs(f["fg_offset"]) > 0.15, "2", None),  # Parallax
+    ("large subject", lambda f: f["fg_ratio"] > 0.45, "4", None),              # Zoom BG
+]
+
+# Medium, centered subjects rotate through these so neighboring scenes differ
+VARIETY_CHOICES = ["3", "11", "1", "12", "10", "4"]
+
+
+def cutout_features(fg_pil):
+    """fg_ratio and fg_offset of an RGBA cutout."""
+    alpha = np.asarray(fg_pil.getchannel("A")) > 127
+    ratio = float(alpha.mean())
+    if not alpha.any():
+        return {"fg_ratio": 0.0, "fg_offset": 0.0}
+    cols = np.flatnonzero(alpha.any(axis=0))
+    center = (cols[0] + cols[-1] + 1) / 2 / alpha.shape[1]
+    return {"fg_ratio": round(ratio, 4), "fg_offset": round(float(center - 0.5), 4)}
+
+
+def choose_effect(features, index=0):
+    """(choice, finish, reason) for a scene's features; `index` drives VARIETY_CHOICES."""
+    for reason, test, choice, finish in EFFECT_RULES:
+        if test(features):
+            return choice, finish, reason
+    return VARIETY_CHOICES[index % len(VARIETY_CHOICES)], None, "variety"
+
+
+def decide(pipeline, scene, ranked, index):
+    """Take the top-ranked image, wait for its cutout, pick the effect and start the render."""
+    sid = scene['id']
+    image_path = ranked['candidates'][0]
+    pipeline.select_image(sid, image_path)
+    decision = {"id": sid, "image_path": image_path, "score": ranked.get('scores', {}).get(image_path)}
+    try:
+        fg, _, _ = pipeline.cutout(sid)
+    except Exception as e:
+        print(f"  -> Scene {sid}: extraction failed ({e}), static clip")
+        decision.update(choice="0", finish=None, reason="extraction failed")
+        return decision
+
+    decision.update(cutout_features(fg))
+    choice, finish, reason = choose_effect(decision, index)
+    decision.update(choice=choice, finish=finish, reason=reason)
+    print(f"  -> Scene {sid}: effect {choice}{f' + {finish}' if finish else ''} ({reason})")
+    if choice != "0":
+        pipeline.choose_effect(sid, choice, finish)
+    return decision
+
+
+def run_auto_processor(scenes_to_process, policy_path=None, score_dir=SCORE_DIR):
+    """
+    Headless run_batch_processor: decide and render every scene without a window.
+    Returns {scene_id: decision}; scenes decided "0" are left to the caller's
+    static clip (with decision["finish"] as its effect). Image scores are cached in `score_dir`.
+    """
+    from scripts.interactive_clip import ReviewPipeline, find_candidates
+
+    print("\n[AUTO] Scanning and scoring image candidates...")
+    ranked = {c['id']: c for c in rank_candidates(find_candidates(scenes_to_process), score_dir=score_dir)}
+    scenes = [s for s in scenes_to_process if s['id'] in ranked]
+    print(f"[AUTO] Choosing images and effects for {len(scenes)} scenes...")
+
+    pipeline = ReviewPipeline(scenes)
+    try:
+        with ThreadPoolExecutor(max_workers=POLICY_WORKERS, thread_name_prefix="policy") as pool:
+            futures = [pool.submit(decide, pipeline, scene, ranked[scene['id']], i)
+                       for i, scene in enumerate(scenes)]
+            decisions = {f.result()["id"]: f.result() for f in futures}
+    finally:
+        pipeline.close()
+
+    for sid, ok in pipeline.results.items():
+        decisions[sid]["rendered"] = ok
+
+    if policy_path:
+        os.makedirs(os.path.dirname(policy_path) or ".", exist_ok=True)
+        with open(policy_path, "w", encoding="utf-8") as f:
+            json.dump(list(decisions.values()), f, indent=2)
+        print(f"[AUTO] Decisions saved to {policy_path}")
+
+    print("\n[AUTO] All processing complete.")
+    return decisions
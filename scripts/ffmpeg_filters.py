@@ -0,0 +1,72 @@
+"""
+Builders for ffmpeg filter graphs used by the render pipeline.
+
+Everything here returns plain strings, so the heavy lifting (crop, scale,
+masking, overlay) happens inside ffmpeg instead of in Python per frame.
+"""
+
+
+def circle_alpha_expr(feather=2):
+    """
+    geq expression for a feathered circle, matching `make_circle_mask`:
+    1 inside r - feather, 0 outside r + feather, linear ramp in between.
+    """
+    if feather <= 0:
+        return "255*lte(hypot(X-W/2,Y-H/2),min(W,H)/2)"
+    return f"255*clip((min(W,H)/2+{feather}-hypot(X-W/2,Y-H/2))/{2 * feather},0,1)"
+
+
+def circle_masked(label_in, label_out, feather=2):
+    """Turn any video stream into RGBA with a feathered circular alpha."""
+    return (
+        f"[{label_in}]format=rgba,"
+        f"geq=r='r(X,Y)':g='g(X,Y)':b='b(X,Y)':a='{circle_alpha_expr(feather)}'"
+        f"[{label_out}]"
+    )
+
+
+def build_circle_pip_filter(base_label, pip_input, base_h, pip_size=110, border=6,
+                            margin=30, feather=2, start=0.0, duration=None, fps=24,
+                            border_color="white", out_label="vout"):
+    """
+    Single filter_complex that reproduces the PiP of `generate_final_video`:
+
+        crop square (centered) -> scale -> circular alpha (feathered)
+        + a circular `border_color` ring `border` px wide behind it
+        overlaid bottom-left `margin` px from the edges, from `start` for `duration`.
+
+    `base_label` is the main stream (e.g. "0:v"), `pip_input` the PiP stream
+    (e.g. "1:v"). The result is `[out_label]` in yuv420p, ready for libx264.
+    """
+    ring_size = pip_size + 2 * border
+    pip_x = margin
+    pip_y = base_h - pip_size - margin
+    ring_x = pip_x - border
+    ring_y = pip_y - border
+
+    if duration is None:
+        end_expr = "1e9"
+        ring_dur = ""
+        pip_trim = ""
+    else:
+        end_expr = f"{start + duration:.6f}"
+        ring_dur = f":d={duration:.6f}"
+        pip_trim = f"trim=duration={duration:.6f},"
+
+    enable = f"enable='between(t,{start:.6f},{end_expr})'"
+
+    parts = [
+        # PiP: centered square crop, resize, circle alpha, shift to its start time
+        f"[{pip_input}]{pip_trim}crop='min(iw,ih)':'min(iw,ih)',"
+        f"scale={pip_size}:{pip_size},fps={fps},"
+        f"setpts=PTS-STARTPTS+{start:.6f}/TB[pip_sq]",
+        circle_masked("pip_sq", "pip", feather),
+        # Border ring: a solid disc drawn behind the PiP
+        f"color=c={border_color}:s={ring_size}x{ring_size}:r={fps}{ring_dur},"
+        f"setpts=PTS-STARTPTS+{start:.6f}/TB[ring_src]",
+        circle_masked("ring_src", "ring", feather),
+        f"[{base_label}][ring]overlay=x={ring_x}:y={ring_y}:eof_action=pass:format=rgb:{enable}[with_ring]",
+        f"[with_ring][pip]overlay=x={pip_x}:y={pip_y}:eof_action=pass:format=rgb:{enable},"
+        f"format=yuv420p[{out_label}]",
+    ]
+    return ";".join(parts)
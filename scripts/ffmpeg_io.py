@@ -0,0 +1,177 @@
+import subprocess
+
+import numpy as np
+
+
+def tail_hold_filter(seconds):
+    """ffmpeg filter that freezes the last frame for `seconds` (no extra frames from Python)."""
+    return f"tpad=stop_mode=clone:stop_duration={seconds:.6f}"
+
+
+def get_ffmpeg_exe():
+    """Return the ffmpeg binary MoviePy is configured with (falls back to PATH)."""
+    try:
+        from moviepy.config import get_setting
+        return get_setting("FFMPEG_BINARY")
+    except Exception:
+        return "ffmpeg"
+
+
+class FFmpegFrameWriter:
+    """
+    Writes raw frames straight into an ffmpeg process over stdin.
+
+    Input 0 is always the raw frame pipe. Extra inputs (PiP videos, audio files...)
+    are passed as ready-made argument lists, e.g. ["-i", "static/vid/dog.mp4"],
+    and are numbered from 1 in `filter_complex` and `maps`.
+
+    If `filter_complex` is given it must produce a "[vout]" label, which is
+    mapped as the output video stream.
+
+    `tail_hold` (seconds) makes ffmpeg clone the last written frame at the end
+    of the stream, so a freeze-frame costs no compositing or pipe writes.
+    """
+
+    def __init__(self, output_path, size, fps, pix_fmt="rgb24", codec="libx264",
+                 preset="medium", threads=4, inputs=None, filter_complex=None,
+                 maps=None, audio_codec="aac", output_params=None, quiet=True,
+                 tail_hold=0.0):
+        w, h = size
+        self.output_path = output_path
+        self.size = (w, h)
+        self.fps = fps
+        self.frame_bytes = w * h * (4 if pix_fmt in ("rgba", "bgra") else 3)
+        self.frames_written = 0
+
+        cmd = [
+            get_ffmpeg_exe(), "-y", "-loglevel", "error",
+            "-f", "rawvideo",
+            "-pix_fmt", pix_fmt,
+            "-s", f"{w}x{h}",
+            "-r", str(fps),
+            "-i", "-",
+        ]
+        for input_args in inputs or []:
+            cmd.extend(input_args)
+
+        if tail_hold > 0:
+            if filter_complex:
+                filter_complex = f"{filter_complex};[vout]{tail_hold_filter(tail_hold)}[vout_held]"
+            else:
+                filter_complex = f"[0:v]{tail_hold_filter(tail_hold)}[vout_held]"
+            video_label = "[vout_held]"
+        else:
+            video_label = "[vout]"
+
+        if filter_complex:
+            cmd.extend(["-filter_complex", filter_complex, "-map", video_label])
+        else:
+            cmd.extend(["-map", "0:v"])
+
+        has_audio = False
+        for m in maps or []:
+            cmd.extend(["-map", m])
+            has_audio = has_audio or ":a" in m
+
+        cmd.extend(["-c:v", codec])
+        if codec in ("png", "qtrle") and pix_fmt in ("rgba", "bgra"):
+            # Lossless intermediates keep their alpha channel
+            cmd.extend(["-pix_fmt", "rgba" if codec == "png" else "argb"])
+        if codec == "libx264":
+            cmd.extend(["-preset", preset, "-pix_fmt", "yuv420p"])
+        if threads:
+            cmd.extend(["-threads", str(threads)])
+        if has_audio:
+            cmd.extend(["-c:a", audio_codec])
+        else:
+            cmd.append("-an")
+
+        cmd.extend(output_params or [])
+        cmd.append(output_path)
+
+        self.cmd = cmd
+        self.proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL if quiet else None
+        )
+
+    def write_frame(self, frame):
+        """Write one HxWxC uint8 frame. The caller may reuse the buffer afterwards."""
+        self.proc.stdin.write(memoryview(frame).cast("B") if frame.flags.c_contiguous else frame.tobytes())
+        self.frames_written += 1
+
+    def close(self):
+        if self.proc.stdin and not self.proc.stdin.closed:
+            self.proc.stdin.close()
+        self.proc.wait()
+        if self.proc.returncode != 0:
+            raise IOError(f"ffmpeg exited with code {self.proc.returncode} while writing {self.output_path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Don't mask the original error with an ffmpeg exit code
+            try:
+                self.proc.stdin.close()
+            except Exception:
+                pass
+            self.proc.wait()
+        return False
+
+
+class FFmpegFrameReader:
+    """
+    Decodes a video into raw frames through an ffmpeg pipe.
+
+    Frames are read into one preallocated buffer (the returned array is
+    overwritten by the next read). With loop=True the input repeats forever,
+    so a short template can be played under a clip of any length. `fps`
+    resamples the output to a constant frame rate (frames are dropped or
+    repeated by ffmpeg).
+    """
+
+    def __init__(self, path, size, pix_fmt="rgba", loop=False, fps=None):
+        w, h = size
+        channels = 4 if pix_fmt in ("rgba", "bgra") else 3
+        self.path = path
+        self.buf = np.empty((h, w, channels), dtype=np.uint8)
+        self._view = memoryview(self.buf).cast("B")
+
+        cmd = [get_ffmpeg_exe(), "-loglevel", "error"]
+        if loop:
+            cmd.extend(["-stream_loop", "-1"])
+        cmd.extend(["-i", path, "-f", "rawvideo", "-pix_fmt", pix_fmt, "-s", f"{w}x{h}"])
+        if fps:
+            cmd.extend(["-r", str(fps)])
+        cmd.append("-")
+
+        self.proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def read_frame(self):
+        """Return the next frame, or None at the end of the stream."""
+        got = 0
+        while got < len(self._view):
+            n = self.proc.stdout.readinto(self._view[got:])
+            if not n:
+                return None
+            got += n
+        return self.buf
+
+    def close(self):
+        if self.proc.poll() is None:
+            self.proc.kill()
+        self.proc.stdout.close()
+        self.proc.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
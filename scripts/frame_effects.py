@@ -0,0 +1,210 @@
+"""
+Frame-server versions of the interactive effects (choices 1-12 of
+`generate_single_clip_from_data`). Each builder does its per-clip work once
+and returns `draw(comp, t)`, which paints one frame in place.
+"""
+import cv2
+import numpy as np
+
+from scripts.frame_server import Compositor, Sprite
+from scripts.ken_burns import KenBurns
+from scripts.video_effects import REFERENCE_WIDTH, make_effect
+
+# Same weights MoviePy's vfx.blackwhite uses by default (plain channel average)
+BW_WEIGHTS = np.full(3, 1.0 / 3.0, dtype=np.float32)
+
+EFFECT_CHOICES = [str(i) for i in range(1, 13)]
+
+
+def to_grayscale_rgb(rgb):
+    gray = (rgb.astype(np.float32) @ BW_WEIGHTS).astype(np.uint8)
+    return np.repeat(gray[:, :, None], 3, axis=2)
+
+
+def centered(size, w, h):
+    """MoviePy ("center", "center") position of a w x h layer on a canvas of `size`."""
+    W, H = size
+    return int(W / 2 - w / 2), int(H / 2 - h / 2)
+
+
+class WarpLayer:
+    """
+    Scales/rotates an RGB(A) source into a fixed canvas-sized buffer with one
+    cv2.warpAffine call, so zooms and rotations never allocate per frame.
+    """
+
+    def __init__(self, src, size):
+        self.src = np.ascontiguousarray(src)
+        W, H = size
+        self.size = (W, H)
+        self.buf = np.zeros((H, W, src.shape[2]), dtype=np.uint8)
+
+    def scaled(self, scale):
+        """Layer scaled by `scale` around its center, centered on the canvas."""
+        h, w = self.src.shape[:2]
+        W, H = self.size
+        tx, ty = W / 2 - scale * w / 2, H / 2 - scale * h / 2
+        m = np.float32([[scale, 0, tx], [0, scale, ty]])
+        return self._warp(m)
+
+    def rotated(self, angle):
+        """Counter-clockwise rotation in degrees around the layer center, centered on the canvas."""
+        h, w = self.src.shape[:2]
+        W, H = self.size
+        m = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+        m[0, 2] += W / 2 - w / 2
+        m[1, 2] += H / 2 - h / 2
+        return self._warp(m)
+
+    def _warp(self, m):
+        cv2.warpAffine(
+            self.src, m, self.size, dst=self.buf,
+            flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT, borderValue=0
+        )
+        return self.buf
+
+
+def build_effect_drawer(choice, fg_rgba, bg_rgb, duration, size, captions=None, finish=None):
+    """
+    Return draw(comp, t) for effect `choice`, or None if the choice has no effect.
+
+    fg_rgba / bg_rgb are uint8 arrays already resized to `size`.
+    `captions` is a list of (Sprite, start, end, x, y) drawn on top.
+    `finish` names a scripts.video_effects effect applied to the picture
+    (before the captions, so they stay put).
+    """
+    W, H = size
+    px = W / REFERENCE_WIDTH  # motion is given in 1920-wide pixels
+    fg = Sprite(fg_rgba)
+    fg_w, fg_h = fg.full_w, fg.full_h
+    captions = captions or []
+
+    finish_fx = make_effect(finish, size, duration) if finish else None
+    finish_buf = np.empty((H, W, 3), dtype=np.uint8) if finish_fx else None
+
+    def draw_overlays(comp, t):
+        if finish_fx is not None:
+            np.copyto(comp.canvas, finish_fx.apply(comp.canvas, t, finish_buf))
+        for sprite, start, end, x, y in captions:
+            if start <= t < end:
+                comp.blend(sprite, x, y)
+
+    draw_fg_static = lambda comp: comp.blend(fg, *centered(size, fg_w, fg_h))
+
+    if choice == "1":  # Zoom Subject
+        fg_warp = WarpLayer(fg_rgba, size)
+        bg_zoom = KenBurns(bg_rgb, size, 1.0, 1.08, duration)
+
+        def draw(comp, t):
+            comp.blit(bg_zoom.frame(t))
+            layer = fg_warp.scaled(1.0 + 0.15 * t / duration)
+            comp.blend(layer)
+            draw_overlays(comp, t)
+
+    elif choice == "2":  # Parallax
+        bg_large = cv2.resize(bg_rgb, (int(W * 1.1), int(H * 1.1)), interpolation=cv2.INTER_LINEAR)
+        bg_y = int(H / 2 - bg_large.shape[0] / 2)
+
+        def draw(comp, t):
+            comp.clear()
+            comp.blit(bg_large, -40 * px * t, bg_y)
+            comp.blend(fg, 40 * px * t, int(H / 2 - fg_h / 2))
+            draw_overlays(comp, t)
+
+    elif choice == "3":  # Floating
+        def draw(comp, t):
+            comp.blit(bg_rgb)
+            y = H / 2 - fg_h / 2 + 25 * px * np.sin(2 * np.pi * t / 4)
+            comp.blend(fg, int(W / 2 - fg_w / 2), y)
+            draw_overlays(comp, t)
+
+    elif choice == "4":  # Zoom BG (MoviePy default position: anchored top-left)
+        bg_zoom = KenBurns(bg_rgb, size, 1.0, 1.2, duration, anchor="topleft")
+
+        def draw(comp, t):
+            comp.blit(bg_zoom.frame(t))
+            draw_fg_static(comp)
+            draw_overlays(comp, t)
+
+    elif choice in ("5", "10"):  # Rotate / Tilt L/R
+        fg_warp = WarpLayer(fg_rgba, size)
+        if choice == "5":
+            angle_at = lambda t: -15 * t
+        else:
+            angle_at = lambda t: 5 * np.sin(2.5 * t)
+
+        def draw(comp, t):
+            comp.blit(bg_rgb)
+            comp.blend(fg_warp.rotated(angle_at(t)))
+            draw_overlays(comp, t)
+
+    elif choice == "6":  # BW to Color Reveal
+        # Grayscale is linear, so crossfading bg and fg separately equals
+        # crossfading the composited frame: precompute both ends once.
+        tmp = Compositor(size)
+        tmp.blit(bg_rgb)
+        tmp.blend(fg, *centered(size, fg_w, fg_h))
+        color = tmp.canvas.copy()
+        gray = to_grayscale_rgb(color)
+
+        def draw(comp, t):
+            p = min(max(t / duration, 0.0), 1.0)
+            cv2.addWeighted(color, p, gray, 1.0 - p, 0.0, dst=comp.canvas)
+            draw_overlays(comp, t)
+
+    elif choice == "7":  # Flash / Strobe
+        levels = np.arange(256, dtype=np.float32)
+        lut = np.empty(256, dtype=np.uint8)
+
+        def draw(comp, t):
+            factor = 1 + 0.5 * np.sin(10 * t) ** 2
+            np.copyto(lut, np.clip(levels * factor, 0, 255), casting="unsafe")
+            cv2.LUT(bg_rgb, lut, dst=comp.canvas)
+            draw_fg_static(comp)
+            draw_overlays(comp, t)
+
+    elif choice == "8":  # Vignette Pulse
+        # mask = dist * opacity / 255 never reaches 1 (opacity <= 200), so
+        # bg * (1 - mask) = bg - (opacity / 255) * (bg * dist): precompute bg * dist.
+        Y, X = np.ogrid[:H, :W]
+        cx, cy = W / 2, H / 2
+        dist = (np.sqrt((X - cx) ** 2 + (Y - cy) ** 2) / np.sqrt(cx ** 2 + cy ** 2)).astype(np.float32)
+        bg_f = bg_rgb.astype(np.float32)
+        bg_dist = bg_f * dist[:, :, None]
+
+        def draw(comp, t):
+            opacity = 150 + 50 * np.sin(3 * t)
+            cv2.addWeighted(bg_f, 1.0, bg_dist, -opacity / 255.0, 0.0, dst=comp.canvas, dtype=cv2.CV_8U)
+            draw_fg_static(comp)
+            draw_overlays(comp, t)
+
+    elif choice == "9":  # Spotlight: every frame is the same, composite once
+        tmp = Compositor(size)
+        np.copyto(tmp.canvas, np.clip(bg_rgb.astype(np.float32) * 0.3, 0, 255), casting="unsafe")
+        tmp.blend(fg, *centered(size, fg_w, fg_h))
+        still = tmp.canvas.copy()
+
+        def draw(comp, t):
+            comp.blit(still)
+            draw_overlays(comp, t)
+
+    elif choice == "11":  # Left/Right Movement
+        def draw(comp, t):
+            comp.blit(bg_rgb)
+            offset = 40 * px * np.sin(2 * t)
+            comp.blend(fg, W / 2 - fg_w / 2 + offset, H / 2 - fg_h / 2)
+            draw_overlays(comp, t)
+
+    elif choice == "12":  # Invisible to Visible (Fade In)
+        fade_dur = min(1.5, duration)
+        x, y = centered(size, fg_w, fg_h)
+
+        def draw(comp, t):
+            comp.blit(bg_rgb)
+            comp.blend(fg, x, y, opacity=min(t / fade_dur, 1.0) if fade_dur > 0 else 1.0)
+            draw_overlays(comp, t)
+
+    else:
+        return None
+
+    return draw
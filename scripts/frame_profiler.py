@@ -0,0 +1,256 @@
+"""
+Opt-in per-frame profiler for clip renders.
+
+Set FRAME_PROFILE=<n> to time every n-th frame of each scene clip render
+(unset or 0 = off). For the sampled frames it records how long each layer
+takes, split into the layer's own frame (make_frame), its mask, the blit
+onto the composite, and the ffmpeg pipe write, then writes one
+flame-graph-compatible "folded stacks" file per clip to outputs/profiles:
+
+    scene_3;layer1:ImageClip;make_frame 8123
+    scene_3;layer1:ImageClip;mask 2210
+    scene_3;ffmpeg_write 40411
+
+(values are microseconds of self time summed over the sampled frames).
+Render with flamegraph.pl, speedscope or any folded-stack viewer.
+
+MoviePy renders wrap get_frame/blit_on of every clip in the composite tree;
+frame-server renders wrap `draw` and the Compositor calls it makes.
+
+A profiler only sees calls made on the thread that started it, so preview or
+other renders running on other threads meanwhile neither show up in its
+stacks nor corrupt them. The shared class patches (Compositor methods and
+writer write_frame) are installed once, while any profiler is active.
+"""
+import os
+import time
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+PROFILE_DIR = os.path.join("outputs", "profiles")
+COMPOSITOR_METHODS = ("clear", "blit", "blend", "blend_masked", "fade_to")
+
+_lock = threading.Lock()
+_active = {}          # thread ident -> FrameProfiler profiling on that thread
+_class_patches = []   # (cls, attr, original) while any profiler is active
+
+
+def _profiler():
+    """The profiler started on the calling thread, if any."""
+    return _active.get(threading.get_ident())
+
+
+def _compositor_hook(method, original):
+    def timed(comp, *a, **k):
+        prof = _profiler()
+        if prof is None or not prof.sampling:
+            return original(comp, *a, **k)
+        prof._call_counts[method] += 1
+        return prof._call(f"{method}#{prof._call_counts[method]}", original, comp, *a, **k)
+    return timed
+
+
+def _writer_hook(original):
+    def write_frame(writer, frame):
+        prof = _profiler()
+        if prof is None:
+            return original(writer, frame)
+        return prof._writer_call(original, writer, frame)
+    return write_frame
+
+
+def _install_class_patches():
+    from moviepy.video.io.ffmpeg_writer import FFMPEG_VideoWriter
+    from scripts.ffmpeg_io import FFmpegFrameWriter
+    from scripts.frame_server import Compositor
+
+    for method in COMPOSITOR_METHODS:
+        original = vars(Compositor)[method]
+        _class_patches.append((Compositor, method, original))
+        setattr(Compositor, method, _compositor_hook(method, original))
+    for cls in (FFMPEG_VideoWriter, FFmpegFrameWriter):
+        original = vars(cls)["write_frame"]
+        _class_patches.append((cls, "write_frame", original))
+        cls.write_frame = _writer_hook(original)
+
+
+def _remove_class_patches():
+    for cls, attr, original in reversed(_class_patches):
+        setattr(cls, attr, original)
+    _class_patches.clear()
+
+
+def sample_interval():
+    """FRAME_PROFILE as an int (0 = profiling off)."""
+    try:
+        return max(0, int(os.getenv("FRAME_PROFILE", "0")))
+    except ValueError:
+        return 0
+
+
+class FrameProfiler:
+
+    def __init__(self, name, sample_every=1):
+        self.name = name
+        self.sample_every = max(1, sample_every)
+        self.self_time = defaultdict(float)
+        self.frames_seen = 0
+        self.frames_sampled = 0
+        self.sampling = False
+        self._stack = []         # [label, child seconds]
+        self._call_counts = defaultdict(int)
+        self._restore = []       # (obj, attr, had own attribute, previous value)
+        self._thread = None
+        self._outer = None       # profiler this one shadows on the same thread
+
+    # ---------- timing core ----------
+    def _call(self, label, fn, *args, **kwargs):
+        if not self.sampling:
+            return fn(*args, **kwargs)
+        self._stack.append([label, 0.0])
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            total = time.perf_counter() - t0
+            path = ";".join(entry[0] for entry in self._stack)
+            _, child = self._stack.pop()
+            self.self_time[path] += total - child
+            if self._stack:
+                self._stack[-1][1] += total
+
+    def _root_call(self, fn, *args, **kwargs):
+        """One output frame: decide whether it is sampled, then time it as the root."""
+        index = self.frames_seen
+        self.frames_seen += 1
+        self.sampling = index % self.sample_every == 0
+        if not self.sampling:
+            return fn(*args, **kwargs)
+        self.frames_sampled += 1
+        self._call_counts.clear()
+        return self._call(self.name, fn, *args, **kwargs)
+
+    def _writer_call(self, fn, *args, **kwargs):
+        # The write of a sampled frame happens after its root call returned
+        if not self.sampling or self._stack:
+            return fn(*args, **kwargs)
+        return self._call(self.name, self._call, "ffmpeg_write", fn, *args, **kwargs)
+
+    # ---------- patching ----------
+    def start(self):
+        """Profile calls made on the calling thread (installs the shared class patches if needed)."""
+        with _lock:
+            if not _active:
+                _install_class_patches()
+            self._thread = threading.get_ident()
+            self._outer = _active.get(self._thread)
+            _active[self._thread] = self
+
+    def _set(self, obj, attr, value):
+        own = vars(obj)
+        self._restore.append((obj, attr, attr in own, own.get(attr)))
+        setattr(obj, attr, value)
+
+    def _wrap_instance(self, obj, attr, label):
+        original = getattr(obj, attr)
+
+        def timed(*a, **k):
+            if threading.get_ident() != self._thread:
+                return original(*a, **k)
+            return self._call(label, original, *a, **k)
+        self._set(obj, attr, timed)
+
+    def wrap_clip(self, clip):
+        """Profile a MoviePy clip tree; `clip` is the one being written."""
+        original = clip.get_frame
+        self._set(clip, "get_frame", lambda t: self._root_call(original, t))
+        self._wrap_children(clip)
+        return clip
+
+    def _wrap_children(self, clip):
+        for i, child in enumerate(getattr(clip, "clips", None) or []):
+            self._wrap_instance(child, "blit_on", f"layer{i}:{type(child).__name__}")
+            self._wrap_instance(child, "get_frame", "make_frame")
+            if child.mask is not None:
+                self._wrap_instance(child.mask, "get_frame", "mask")
+            self._wrap_children(child)
+
+    def wrap_draw(self, draw):
+        """Profile a frame-server draw(comp, t) function and the Compositor calls it makes."""
+        return lambda comp, t: self._root_call(draw, comp, t)
+
+    def restore(self):
+        for obj, attr, had, previous in reversed(self._restore):
+            if had:
+                setattr(obj, attr, previous)
+            else:
+                delattr(obj, attr)  # drop the instance override, back to the class method
+        self._restore.clear()
+
+        with _lock:
+            if self._thread is not None and _active.get(self._thread) is self:
+                if self._outer is not None:
+                    _active[self._thread] = self._outer
+                else:
+                    del _active[self._thread]
+            self._thread = None
+            if not _active and _class_patches:
+                _remove_class_patches()
+
+    # ---------- output ----------
+    def folded(self):
+        """Folded-stack lines ("a;b;c <microseconds>"), heaviest first."""
+        rows = sorted(self.self_time.items(), key=lambda kv: -kv[1])
+        return [f"{path} {int(seconds * 1e6)}" for path, seconds in rows if seconds > 0]
+
+    def write(self, profile_dir=PROFILE_DIR):
+        os.makedirs(profile_dir, exist_ok=True)
+        path = os.path.join(profile_dir, f"{self.name}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.folded()) + "\n")
+
+        total = sum(self.self_time.values())
+        per_frame = total / self.frames_sampled * 1000 if self.frames_sampled else 0
+        print(f"🔥 Frame profile: {path} ({self.frames_sampled}/{self.frames_seen} frames, {per_frame:.1f} ms/frame)")
+        return path
+
+
+def profile_name(output_path):
+    """Profile name for a clip: outputs/clips/12/scene_3.mp4 -> 12_scene_3."""
+    stem = os.path.splitext(os.path.basename(output_path))[0]
+    parent = os.path.basename(os.path.dirname(os.path.abspath(output_path)))
+    return f"{parent}_{stem}" if parent else stem
+
+
+class _NullProfiler:
+
+    def wrap_clip(self, clip):
+        return clip
+
+    def wrap_draw(self, draw):
+        return draw
+
+
+@contextmanager
+def profile_render(name, clip=None, sample_every=None, profile_dir=PROFILE_DIR):
+    """
+    Profile the render inside the block if FRAME_PROFILE (or `sample_every`) is set.
+    Pass the MoviePy `clip` being written, or call prof.wrap_draw(draw) for
+    frame-server renders. Patches are undone and the profile written on exit.
+    """
+    sample_every = sample_interval() if sample_every is None else sample_every
+    if not sample_every:
+        yield _NullProfiler()
+        return
+
+    prof = FrameProfiler(name, sample_every)
+    try:
+        prof.start()
+        if clip is not None:
+            prof.wrap_clip(clip)
+        yield prof
+    finally:
+        prof.restore()
+        if prof.frames_sampled:
+            prof.write(profile_dir)
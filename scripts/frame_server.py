@@ -0,0 +1,218 @@
+"""
+Lightweight frame server: a NumPy compositing core plus a generator that
+yields one preallocated uint8 RGB canvas per frame.
+
+Renders built on it bypass MoviePy's CompositeVideoClip (which allocates new
+arrays per layer per frame) and stream straight into an ffmpeg rawvideo pipe.
+MoviePy stays available as a fallback: callers pick a renderer with
+DEFAULT_RENDERER ("frames" or "moviepy").
+"""
+import time
+
+import numpy as np
+
+from scripts.ffmpeg_io import FFmpegFrameWriter
+from scripts.instrument import annotate
+
+DEFAULT_RENDERER = "frames"
+
+
+def frame_count(duration, fps):
+    """Same frame count MoviePy's write_videofile produces for `duration`."""
+    return int(duration * fps)
+
+
+class Sprite:
+    """
+    A static RGBA layer prepared once for fast blending.
+
+    Premultiplied colour and inverse alpha are cached as uint16 and the layer is
+    trimmed to the bounding box of its visible pixels, so blending a mostly
+    transparent full-frame cutout only touches the pixels that matter.
+    """
+
+    def __init__(self, rgba):
+        rgba = np.asarray(rgba)
+        if rgba.ndim != 3 or rgba.shape[2] != 4:
+            raise ValueError("Sprite expects an HxWx4 RGBA array")
+
+        self.full_w = rgba.shape[1]
+        self.full_h = rgba.shape[0]
+
+        alpha = rgba[:, :, 3]
+        ys, xs = np.nonzero(alpha)
+        if len(ys) == 0:
+            self.offset = (0, 0)
+            rgba = rgba[:0, :0]
+        else:
+            y0, y1, x0, x1 = ys.min(), ys.max() + 1, xs.min(), xs.max() + 1
+            self.offset = (int(x0), int(y0))
+            rgba = rgba[y0:y1, x0:x1]
+
+        self.rgba = np.ascontiguousarray(rgba)
+        self.h, self.w = self.rgba.shape[:2]
+
+        a = self.rgba[:, :, 3:4].astype(np.uint16)
+        self.opaque = bool(a.size) and bool(a.min() == 255)
+        self.premul = self.rgba[:, :, :3].astype(np.uint16) * a
+        self.inv_alpha = 255 - a
+
+
+class Compositor:
+    """
+    Owns the output canvas and the scratch buffers used for blending.
+    All operations draw in place; positions may be negative or partly off-canvas.
+    """
+
+    def __init__(self, size, bg_color=(0, 0, 0)):
+        w, h = size
+        self.size = (w, h)
+        self.canvas = np.zeros((h, w, 3), dtype=np.uint8)
+        self.bg_color = np.array(bg_color, dtype=np.uint8)
+        self._acc = np.empty((h, w, 3), dtype=np.uint16)
+        self._tmp = np.empty((h, w, 3), dtype=np.uint16)
+        self._alpha = np.empty((h, w, 1), dtype=np.uint16)
+
+    # ------------------------------------------------------------------
+    # Geometry
+    # ------------------------------------------------------------------
+    def _clip(self, x, y, w, h):
+        """Return (canvas slice, source slice) for a w x h layer at (x, y), or None."""
+        cw, ch = self.size
+        x, y = int(x), int(y)
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, cw), min(y + h, ch)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        dst = (slice(y0, y1), slice(x0, x1))
+        src = (slice(y0 - y, y1 - y), slice(x0 - x, x1 - x))
+        return dst, src
+
+    # ------------------------------------------------------------------
+    # Drawing
+    # ------------------------------------------------------------------
+    def clear(self, color=None):
+        self.canvas[:] = self.bg_color if color is None else color
+
+    def blit(self, rgb, x=0, y=0):
+        """Copy an opaque RGB array onto the canvas."""
+        region = self._clip(x, y, rgb.shape[1], rgb.shape[0])
+        if region is None:
+            return
+        dst, src = region
+        self.canvas[dst] = rgb[src][:, :, :3]
+
+    def blend(self, layer, x=0, y=0, opacity=1.0):
+        """
+        Alpha-blend an RGBA array or a Sprite at (x, y).
+        For Sprites, (x, y) is where the untrimmed image's top-left corner goes.
+        """
+        if opacity <= 0:
+            return
+
+        if isinstance(layer, Sprite):
+            if opacity >= 1 and layer.opaque:
+                self.blit(layer.rgba, x + layer.offset[0], y + layer.offset[1])
+                return
+            if opacity >= 1:
+                self._blend_premultiplied(layer, x + layer.offset[0], y + layer.offset[1])
+                return
+            x, y = x + layer.offset[0], y + layer.offset[1]
+            layer = layer.rgba
+
+        self.blend_masked(layer[:, :, :3], layer[:, :, 3], x, y, opacity)
+
+    def blend_masked(self, rgb, alpha, x=0, y=0, opacity=1.0):
+        """Alpha-blend an RGB array using a separate HxW uint8 alpha."""
+        region = self._clip(x, y, rgb.shape[1], rgb.shape[0])
+        if region is None or opacity <= 0:
+            return
+        dst, src = region
+        out = self.canvas[dst]
+        hh, ww = out.shape[:2]
+
+        a = self._alpha[:hh, :ww]
+        np.copyto(a[:, :, 0], alpha[src])
+        if opacity < 1:
+            a *= int(round(opacity * 255))
+            a += 127
+            a //= 255
+
+        acc = self._acc[:hh, :ww]
+        tmp = self._tmp[:hh, :ww]
+        np.multiply(rgb[src], a, out=acc)
+        np.subtract(255, a, out=a)
+        np.multiply(out, a, out=tmp)
+        acc += tmp
+        acc += 127
+        acc //= 255
+        np.copyto(out, acc, casting="unsafe")
+
+    def _blend_premultiplied(self, sprite, x, y):
+        region = self._clip(x, y, sprite.w, sprite.h)
+        if region is None:
+            return
+        dst, src = region
+        out = self.canvas[dst]
+        hh, ww = out.shape[:2]
+
+        acc = self._acc[:hh, :ww]
+        np.multiply(out, sprite.inv_alpha[src], out=acc)
+        acc += sprite.premul[src]
+        acc += 127
+        acc //= 255
+        np.copyto(out, acc, casting="unsafe")
+
+    def fade_to(self, color, amount):
+        """Mix the canvas towards `color` by `amount` (0 = unchanged, 1 = solid color)."""
+        if amount <= 0:
+            return
+        if amount >= 1:
+            self.clear(color)
+            return
+        keep = int(round((1 - amount) * 256))
+        acc = self._acc
+        np.multiply(self.canvas, keep, out=acc)
+        acc >>= 8
+        np.copyto(self.canvas, acc, casting="unsafe")
+        if any(color):
+            self.canvas += (np.array(color, dtype=np.float32) * amount).astype(np.uint8)
+
+
+def serve_frames(draw, duration, fps, size, bg_color=(0, 0, 0)):
+    """
+    Yield the same preallocated HxWx3 uint8 canvas once per frame.
+
+    `draw(comp, t)` paints frame time `t` into `comp` (a Compositor). The yielded
+    array is overwritten on the next iteration; copy it if you need to keep it.
+    """
+    comp = Compositor(size, bg_color)
+    for i in range(frame_count(duration, fps)):
+        draw(comp, i / fps)
+        yield comp.canvas
+
+
+def render_to_ffmpeg(draw, duration, fps, size, output_path, bg_color=(0, 0, 0), tail_hold=0.0,
+                     **writer_kwargs):
+    """
+    Run `draw` through the frame server and pipe every frame into ffmpeg.
+    `tail_hold` seconds of freeze-frame are added by the encoder (tpad), not by `draw`.
+    """
+    # Time spent drawing vs. blocked on the encoder pipe, for the run report
+    render_s = encode_s = 0.0
+    frames = serve_frames(draw, duration, fps, size, bg_color)
+    with FFmpegFrameWriter(output_path, size, fps, tail_hold=tail_hold, **writer_kwargs) as writer:
+        while True:
+            t0 = time.perf_counter()
+            frame = next(frames, None)
+            t1 = time.perf_counter()
+            render_s += t1 - t0
+            if frame is None:
+                break
+            writer.write_frame(frame)
+            encode_s += time.perf_counter() - t1
+        t_close = time.perf_counter()
+    encode_s += time.perf_counter() - t_close
+
+    annotate(frames=frame_count(duration, fps), render_s=round(render_s, 3), encode_s=round(encode_s, 3))
+    return output_path
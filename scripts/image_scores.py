@@ -0,0 +1,193 @@
+"""
+Automatic ranking of each scene's candidate images.
+
+Every candidate gets two cheap quality metrics and, when torch/diffusers are
+installed, a relevance score:
+
+    sharpness   log variance of the Laplacian (512 px wide grayscale)
+    saturation  mean HSV saturation (0..1)
+    clip        cosine similarity between the scene text and the image, from
+                the CLIP encoders inside the Kandinsky prior (batched)
+
+Within a scene each metric is min-max normalized over its candidates and
+combined with SCORE_WEIGHTS, so only relative differences matter.
+rank_candidates() reorders find_candidates()-style lists best first: the
+selection window uses that as its default, headless runs as their choice.
+
+Metrics are cached in outputs/cache/scores per image path, size and
+modification time (CLIP per scene text), so re-ranking a title only scores
+new or rewritten images and changed text, and looking scores up never reads
+the images themselves.
+"""
+import os
+import json
+import math
+import hashlib
+
+import numpy as np
+from PIL import Image
+
+SCORE_DIR = os.path.join("outputs", "cache", "scores")
+SCORE_WEIGHTS = {"clip": 0.6, "sharpness": 0.25, "saturation": 0.15}
+SHARPNESS_WIDTH = 512
+CLIP_BATCH = 16
+
+_clip_error = None  # why CLIP could not be loaded; not retried for the rest of the run
+
+
+def image_key(path):
+    """Cache key from the file's path, size and mtime (a stat call, the image is not read)."""
+    st = os.stat(path)
+    return hashlib.sha1(f"{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}".encode("utf-8")).hexdigest()
+
+
+def text_key(text):
+    return hashlib.sha1(text.strip().encode("utf-8")).hexdigest()[:16]
+
+
+def _entry_path(key, score_dir):
+    return os.path.join(score_dir, key[:2], f"{key}.json")
+
+
+def load_entry(key, score_dir=SCORE_DIR):
+    try:
+        with open(_entry_path(key, score_dir), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_entry(key, entry, score_dir=SCORE_DIR):
+    path = _entry_path(key, score_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.part"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, path)
+
+
+def quality_metrics(path, width=SHARPNESS_WIDTH):
+    """sharpness and saturation of the image at `path`."""
+    import cv2
+
+    with Image.open(path) as img:
+        small = img.convert("RGB")
+        small.thumbnail((width, width * 4))
+    gray = np.asarray(small.convert("L"))
+    saturation = np.asarray(small.convert("HSV"))[:, :, 1]
+    return {
+        "sharpness": round(math.log1p(cv2.Laplacian(gray, cv2.CV_64F).var()), 4),
+        "saturation": round(float(saturation.mean()) / 255, 4),
+    }
+
+
+def clip_similarities(pairs, batch_size=CLIP_BATCH):
+    """Cosine similarity for each (image path, text) pair, batched through the Kandinsky prior's CLIP."""
+    import torch
+    from scripts.kandisky import get_prior
+
+    prior = get_prior()
+    texts = sorted({text for _, text in pairs})
+    sims = []
+    with torch.no_grad():
+        tokens = prior.tokenizer(texts, padding="max_length", truncation=True,
+                                 max_length=prior.tokenizer.model_max_length, return_tensors="pt")
+        text_embeds = prior.text_encoder(input_ids=tokens.input_ids, attention_mask=tokens.attention_mask).text_embeds
+        text_embeds = torch.nn.functional.normalize(text_embeds, dim=-1)
+        text_index = {text: i for i, text in enumerate(texts)}
+
+        for start in range(0, len(pairs), batch_size):
+            batch = pairs[start:start + batch_size]
+            images = [Image.open(path).convert("RGB") for path, _ in batch]
+            pixels = prior.image_processor(images, return_tensors="pt").pixel_values
+            image_embeds = prior.image_encoder(pixels.to(prior.image_encoder.dtype)).image_embeds
+            image_embeds = torch.nn.functional.normalize(image_embeds, dim=-1)
+            rows = text_embeds[[text_index[text] for _, text in batch]]
+            sims.extend((image_embeds * rows).sum(dim=-1).tolist())
+    return sims
+
+
+def score_candidates(scene_candidates, compute=True, use_clip=True, score_dir=SCORE_DIR):
+    """
+    Metrics for every candidate of [{id, candidates: [paths], text}], as {path: metrics}.
+    With compute=False only cached metrics are returned (nothing is decoded or loaded).
+    """
+    global _clip_error
+    keys, entries, dirty = {}, {}, set()
+    for scene in scene_candidates:
+        for path in scene['candidates']:
+            if path in keys:
+                continue
+            keys[path] = image_key(path)
+            entries[path] = load_entry(keys[path], score_dir) or {}
+            if compute and "sharpness" not in entries[path]:
+                entries[path].update(quality_metrics(path))
+                dirty.add(path)
+
+    missing_clip = [
+        (path, scene.get('text', '').strip())
+        for scene in scene_candidates if scene.get('text', '').strip()
+        for path in scene['candidates']
+        if text_key(scene['text']) not in entries[path].get("clip", {})
+    ]
+    if compute and use_clip and missing_clip and _clip_error is None:
+        try:
+            sims = clip_similarities(missing_clip)
+        except Exception as e:  # torch/diffusers missing, or the prior could not be loaded
+            _clip_error = str(e)
+            print(f"[SCORES] CLIP scoring unavailable ({e}); ranking on image quality only")
+        else:
+            for (path, text), sim in zip(missing_clip, sims):
+                entries[path].setdefault("clip", {})[text_key(text)] = round(sim, 4)
+                dirty.add(path)
+
+    for path in dirty:
+        save_entry(keys[path], entries[path], score_dir)
+
+    scores = {}
+    for scene in scene_candidates:
+        tkey = text_key(scene.get('text', ''))
+        for path in scene['candidates']:
+            metrics = {k: v for k, v in entries[path].items() if k != "clip"}
+            if tkey in entries[path].get("clip", {}):
+                metrics["clip"] = entries[path]["clip"][tkey]
+            scores[path] = metrics
+    return scores
+
+
+def score_image(path, text, **kwargs):
+    """Absolute metrics of one image for `text` (cached): sharpness, saturation and, if available, clip."""
+    return score_candidates([{"id": None, "candidates": [path], "text": text}], **kwargs)[path]
+
+
+def combine(metrics_by_path, weights=SCORE_WEIGHTS):
+    """Weighted sum of per-scene min-max normalized metrics, as {path: score in 0..1}."""
+    paths = list(metrics_by_path)
+    total = {p: 0.0 for p in paths}
+    used = 0.0
+    for name, weight in weights.items():
+        values = [metrics_by_path[p].get(name) for p in paths]
+        if any(v is None for v in values):
+            continue  # only compare metrics every candidate has
+        lo, hi = min(values), max(values)
+        for p, v in zip(paths, values):
+            total[p] += weight * ((v - lo) / (hi - lo) if hi > lo else 0.5)
+        used += weight
+    return {p: round(total[p] / used, 4) if used else 0.0 for p in paths}
+
+
+def rank_candidates(scene_candidates, **kwargs):
+    """
+    Sort each scene's candidates best first, in place, and attach
+    scene["scores"] = {path: combined score}. Scenes without metrics keep their order.
+    kwargs go to score_candidates().
+    """
+    scores = score_candidates(scene_candidates, **kwargs)
+    for scene in scene_candidates:
+        metrics = {p: scores[p] for p in scene['candidates'] if scores.get(p)}
+        if len(metrics) != len(scene['candidates']):
+            continue
+        combined = combine(metrics)
+        scene['candidates'] = sorted(scene['candidates'], key=lambda p: -combined[p])
+        scene['scores'] = combined
+    return scene_candidates
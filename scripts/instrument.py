@@ -0,0 +1,358 @@
+"""
+Lightweight run instrumentation.
+
+Stages wrap their work in spans; each span records wall time, CPU time,
+memory and the bytes it wrote:
+
+    with span("tts", scene=scene_id) as s:
+        generate_tts_audio(text, path, emotion)
+        s.add_output(path)
+
+CPU time is the whole process's on the main thread (a stage's worker pools
+included) and the span's own thread's on worker threads (cpu_scope), plus
+finished child processes such as ffmpeg. peak_rss_mb is the highest RSS of
+this process seen while the span was open, sampled every RSS_SAMPLE_S;
+the process_* columns are high-water marks since the process started.
+
+Spans nest, and inherit `title`/`scene` from the enclosing span. Nothing is
+recorded until start_run() is called, so library code can use span()
+freely. write_report() saves a JSON + CSV report and, optionally, a Chrome
+trace (open in chrome://tracing or https://ui.perfetto.dev).
+"""
+import os
+import csv
+import json
+import time
+import threading
+
+try:
+    import resource  # POSIX only
+except ImportError:
+    resource = None
+
+REPORT_DIR = os.path.join("outputs", "reports")
+RSS_SAMPLE_S = 0.05  # how often open spans sample this process's RSS
+
+CSV_FIELDS = [
+    "name", "title", "scene", "thread", "thread_id", "depth", "start_s", "wall_s",
+    "cpu_s", "cpu_scope", "child_cpu_s",
+    "rss_mb", "peak_rss_mb", "process_peak_rss_mb", "process_child_peak_rss_mb", "output_bytes", "error",
+]
+
+_recorder = None
+
+
+def _rss_mb():
+    """Current resident set size of this process in MB (None if unknown)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2 ** 20
+    except ImportError:
+        return None
+
+
+def _peak_rss_mb(who):
+    """Process-lifetime high-water RSS in MB for RUSAGE_SELF / RUSAGE_CHILDREN (largest child so far)."""
+    if resource is None:
+        return None
+    # ru_maxrss is KB on Linux
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+def _path_bytes(path):
+    if os.path.isdir(path):
+        return sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, files in os.walk(path) for name in files
+        )
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+class Span:
+
+    def __init__(self, name, title=None, scene=None, **extra):
+        self.name = name
+        self.title = title
+        self.scene = scene
+        self.extra = extra
+        self.depth = 0
+        self.outputs = []
+        self.error = None
+        self.peak_rss = None
+
+    def add_output(self, paths):
+        """Count the size of `paths` (file, directory or list of them) as this span's output."""
+        if not paths:
+            return
+        if isinstance(paths, (str, os.PathLike)):
+            paths = [paths]
+        self.outputs.extend(p for p in paths if p)
+
+    def annotate(self, **fields):
+        """Attach extra numbers (e.g. render_s / encode_s splits) to the report row."""
+        self.extra.update(fields)
+
+    def sample_rss(self, rss):
+        """Raise this span's peak RSS to `rss` (MB) if higher."""
+        if rss is not None and (self.peak_rss is None or rss > self.peak_rss):
+            self.peak_rss = rss
+
+    def _cpu_time(self):
+        if self.cpu_scope == "thread":
+            return time.thread_time()
+        times = os.times()
+        return times.user + times.system
+
+    def __enter__(self):
+        thread = threading.current_thread()
+        self.thread, self.thread_id = thread.name, threading.get_ident()
+        # Worker threads run concurrently with other spans: only count their own CPU time
+        self.cpu_scope = "process" if thread is threading.main_thread() else "thread"
+        self.cpu_start = self._cpu_time()
+        times = os.times()
+        self.child_cpu_start = times.children_user + times.children_system
+        self.sample_rss(_rss_mb())
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.wall = time.perf_counter() - self.t0
+        self.cpu = self._cpu_time() - self.cpu_start
+        times = os.times()
+        self.child_cpu = times.children_user + times.children_system - self.child_cpu_start
+        self.rss = _rss_mb()
+        self.sample_rss(self.rss)
+        self.process_peak_rss = _peak_rss_mb(resource.RUSAGE_SELF) if resource else None
+        self.process_child_peak_rss = _peak_rss_mb(resource.RUSAGE_CHILDREN) if resource else None
+        self.output_bytes = sum(_path_bytes(p) for p in self.outputs)
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        return False
+
+    def row(self, t_origin):
+        def mb(value):
+            return round(value, 1) if value is not None else None
+
+        row = {
+            "name": self.name,
+            "title": self.title,
+            "scene": self.scene,
+            "thread": self.thread,
+            "thread_id": self.thread_id,
+            "depth": self.depth,
+            "start_s": round(self.t0 - t_origin, 4),
+            "wall_s": round(self.wall, 4),
+            "cpu_s": round(self.cpu, 4),
+            "cpu_scope": self.cpu_scope,
+            "child_cpu_s": round(self.child_cpu, 4),
+            "rss_mb": mb(self.rss),
+            "peak_rss_mb": mb(self.peak_rss),
+            "process_peak_rss_mb": mb(self.process_peak_rss),
+            "process_child_peak_rss_mb": mb(self.process_child_peak_rss),
+            "output_bytes": self.output_bytes,
+            "error": self.error,
+        }
+        row.update(self.extra)
+        return row
+
+
+class RunRecorder:
+    """Collects finished spans (thread-safe) for one run and samples RSS for the open ones."""
+
+    def __init__(self, sample_s=RSS_SAMPLE_S):
+        self.t_origin = time.perf_counter()
+        self.started_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.spans = []
+        self.open_spans = set()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stopped = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, args=(sample_s,), name="rss-sampler", daemon=True)
+        self._sampler.start()
+
+    def _sample(self, interval):
+        while not self._stopped.wait(interval) and _recorder is self:
+            rss = _rss_mb()
+            with self._lock:
+                for s in self.open_spans:
+                    s.sample_rss(rss)
+
+    def stop(self):
+        self._stopped.set()
+
+    def stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def rows(self):
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.t0)
+        return [s.row(self.t_origin) for s in spans]
+
+
+class _RecordedSpan:
+    """Context manager that pushes a Span on the thread's stack while it runs."""
+
+    def __init__(self, recorder, span):
+        self.recorder = recorder
+        self.span = span
+
+    def __enter__(self):
+        stack = self.recorder.stack()
+        if stack:
+            parent = stack[-1]
+            self.span.title = self.span.title if self.span.title is not None else parent.title
+            self.span.scene = self.span.scene if self.span.scene is not None else parent.scene
+        self.span.depth = len(stack)
+        stack.append(self.span)
+        self.span.__enter__()
+        with self.recorder._lock:
+            self.recorder.open_spans.add(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        with self.recorder._lock:
+            self.recorder.open_spans.discard(self.span)
+        self.span.__exit__(exc_type, exc, tb)
+        self.recorder.stack().pop()
+        with self.recorder._lock:
+            self.recorder.spans.append(self.span)
+        return False
+
+
+class _NullSpan:
+
+    def add_output(self, paths):
+        pass
+
+    def annotate(self, **fields):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def start_run():
+    """Start recording spans for this process (replaces any previous run)."""
+    global _recorder
+    if _recorder is not None:
+        _recorder.stop()
+    _recorder = RunRecorder()
+    return _recorder
+
+
+def enabled():
+    return _recorder is not None
+
+
+def span(name, title=None, scene=None, **extra):
+    """Time a block as `name`; a no-op unless start_run() was called."""
+    if _recorder is None:
+        return _NULL_SPAN
+    return _RecordedSpan(_recorder, Span(name, title=title, scene=scene, **extra))
+
+
+def annotate(**fields):
+    """Attach fields to the innermost open span of this thread (no-op if none)."""
+    if _recorder is None:
+        return
+    stack = _recorder.stack()
+    if stack:
+        stack[-1].annotate(**fields)
+
+
+def current_title():
+    """`title` of the innermost open span of this thread, so worker threads can carry it over."""
+    if _recorder is None:
+        return None
+    stack = _recorder.stack()
+    return stack[-1].title if stack else None
+
+
+def summarize(rows):
+    """Total wall/cpu seconds and output bytes per span name."""
+    totals = {}
+    for row in rows:
+        t = totals.setdefault(row["name"], {"count": 0, "wall_s": 0.0, "cpu_s": 0.0, "output_bytes": 0})
+        t["count"] += 1
+        t["wall_s"] = round(t["wall_s"] + row["wall_s"], 4)
+        t["cpu_s"] = round(t["cpu_s"] + row["cpu_s"] + row["child_cpu_s"], 4)
+        t["output_bytes"] += row["output_bytes"]
+    return totals
+
+
+def chrome_trace(rows, pid=None):
+    """
+    Chrome trace-event JSON ("X" complete events in microseconds). One track per
+    (title, thread): spans on worker pools overlap the stage span that started them,
+    and overlapping events on one track would render as broken slices.
+    """
+    pid = pid or os.getpid()
+    tracks = {}
+    events = []
+    for row in rows:
+        track = (row["title"], row.get("thread_id"))
+        if track not in tracks:
+            tracks[track] = len(tracks)
+            label = f"title {row['title']}" if row["title"] is not None else "run"
+            if row.get("thread") and row["thread"] != "MainThread":
+                label += f" · {row['thread']}"
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tracks[track],
+                           "args": {"name": label}})
+        args = {k: v for k, v in row.items() if k not in ("name", "start_s", "wall_s") and v is not None}
+        events.append({
+            "name": row["name"] if row["scene"] is None else f"{row['name']} #{row['scene']}",
+            "cat": row["name"],
+            "ph": "X",
+            "ts": int(row["start_s"] * 1e6),
+            "dur": int(row["wall_s"] * 1e6),
+            "pid": pid,
+            "tid": tracks[track],
+            "args": args,
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_report(report_dir=REPORT_DIR, trace=False, name=None):
+    """Write run_<time>.json and .csv (plus .trace.json if `trace`); return the written paths."""
+    if _recorder is None:
+        return []
+
+    rows = _recorder.rows()
+    os.makedirs(report_dir, exist_ok=True)
+    name = name or "run_" + _recorder.started_at.replace(":", "").replace("-", "")
+    base = os.path.join(report_dir, name)
+
+    json_path = base + ".json"
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({"started_at": _recorder.started_at, "summary": summarize(rows), "spans": rows}, f, indent=2)
+
+    csv_path = base + ".csv"
+    extra_fields = sorted({k for row in rows for k in row} - set(CSV_FIELDS))
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS + extra_fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    paths = [json_path, csv_path]
+    if trace:
+        trace_path = base + ".trace.json"
+        with open(trace_path, "w", encoding="utf-8") as f:
+            json.dump(chrome_trace(rows), f)
+        paths.append(trace_path)
+
+    print(f"📊 Run report: {json_path}")
+    return paths
@@ -1,16 +1,93 @@
 
 import os
-import cv2
+import io
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-from rembg import remove
-from PIL import Image, ImageTk, ImageEnhance, ImageFilter
+from PIL import Image, ImageEnhance, ImageFilter
 from moviepy.editor import ImageClip, CompositeVideoClip, AudioFileClip, ColorClip, VideoClip, vfx
 import random
-import tkinter as tk
-from tkinter import ttk, Canvas, Frame, Scrollbar
 
 # Reuse caption logic from static clip script
 from scripts.clip import split_text_by_time, create_caption_image, create_collage
+from scripts.frame_server import DEFAULT_RENDERER, Sprite, render_to_ffmpeg, serve_frames
+from scripts.ffmpeg_io import tail_hold_filter
+from scripts.masks import freeze_mask, last_frame_memo, radial_distance
+from scripts.ken_burns import ken_burns_clip
+from scripts.video_effects import EFFECT_NAMES, REFERENCE_WIDTH, apply_clip_effect
+from scripts.instrument import span, current_title
+from scripts.frame_profiler import profile_render, profile_name
+from scripts.image_scores import rank_candidates
+
+# Review pipeline: extraction starts when a scene's image is picked and its
+# effect clip renders as soon as the effect is picked, while the UI stays live.
+EXTRACT_WORKERS = 1  # rembg/OpenCV already use every core for one image
+RENDER_WORKERS = min(2, os.cpu_count() or 1)
+POLL_MS = 200  # how often the review windows refresh per-scene progress
+
+# Effect previews in BatchVerificationApp: same drawer as the real render, smaller and slower
+PREVIEW_SIZE = (480, 270)
+PREVIEW_FPS = 8
+PREVIEW_KEEP = 4  # previews held in memory (~30 MB each for a 10 s scene)
+
+# ImageSelectionApp: rows are built in small batches and only rows near the
+# viewport get their thumbnails, decoded off the Tk thread and cached on disk
+THUMB_HEIGHT = 180
+THUMB_CACHE_DIR = os.path.join("outputs", "cache", "thumbs")
+ROWS_PER_TICK = 10
+
+# rembg, OpenCV and Tk are only needed once a scene is actually extracted or a
+# window is opened, so they are loaded on first use through these accessors.
+_rembg_session = None
+
+
+def get_rembg_session():
+    """Load the rembg background-removal model once and reuse it for every image."""
+    global _rembg_session
+    if _rembg_session is None:
+        from rembg import new_session
+        _rembg_session = new_session()
+    return _rembg_session
+
+
+def get_tk():
+    """Import tkinter and PIL's ImageTk bridge on first use."""
+    import tkinter as tk
+    from PIL import ImageTk
+    return tk, ImageTk
+
+
+def load_thumbnail(path, height=THUMB_HEIGHT, cache_dir=THUMB_CACHE_DIR):
+    """
+    RGB thumbnail of the image at `path`, `height` px tall. Thumbnails are cached
+    as small JPEGs keyed by the image's content hash and the height, so reopening
+    the selection window (or the same image under another name) skips the decode.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    key = hashlib.sha1(data).hexdigest()
+    cached = os.path.join(cache_dir, key[:2], f"{key}_{height}.jpg")
+    try:
+        with Image.open(cached) as thumb:
+            return thumb.convert("RGB")
+    except OSError:
+        pass
+
+    img = Image.open(io.BytesIO(data))
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    width = max(1, round(height * img.width / img.height))
+    # reducing_gap lets Pillow shrink by whole factors first, then resample the rest
+    thumb = img.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+    os.makedirs(os.path.dirname(cached), exist_ok=True)
+    tmp_path = f"{cached}.{os.getpid()}.{threading.get_ident()}.part"
+    thumb.save(tmp_path, "JPEG", quality=90)
+    os.replace(tmp_path, cached)
+    return thumb
+
 
 # Keep existing helper functions
 def extract_layers(image_path):
@@ -21,11 +98,14 @@ def extract_layers(image_path):
         bg_pil (PIL.Image): RGB inpainted background image.
         original_pil (PIL.Image): Original image for review.
     """
+    import cv2
+    from rembg import remove
+
     print(f"  -> Extracting layers for {os.path.basename(image_path)}...")
     input_image = Image.open(image_path)
     
     # 1. Remove background using rembg
-    fg_pil = remove(input_image)
+    fg_pil = remove(input_image, session=get_rembg_session())
     
     # 2. Create Mask for Inpainting
     fg_np = np.array(fg_pil)
@@ -55,6 +135,8 @@ def create_zooming_clip(pil_image_rgba, duration, max_zoom=1.05):
     """
     w, h = pil_image_rgba.size
     
+    # The RGB and mask clips below both ask for frame t: resize once per frame
+    @last_frame_memo
     def make_frame(t):
         progress = t / duration 
         # Calculate current scale
@@ -90,15 +172,90 @@ def create_zooming_clip(pil_image_rgba, duration, max_zoom=1.05):
 
 from moviepy.editor import ImageClip, CompositeVideoClip, AudioFileClip, ColorClip, VideoClip, vfx, concatenate_videoclips
 
-def generate_single_clip_from_data(fg_pil, bg_pil, choice, audio_path, output_path, audio_text="", audio_delay: float = 0.5):
+def build_caption_sprites(audio_text, duration, video_width, video_height):
+    """
+    Caption layers for the frame server: (Sprite, start, end, x, y), bottom-centered.
+    Captions are laid out for a 1920-wide frame and scaled down for smaller ones (previews).
+    """
+    scale = video_width / REFERENCE_WIDTH
+    captions = []
+    for text, start, end in split_text_by_time(audio_text, duration, max_chars=42):
+        img = create_caption_image(text, REFERENCE_WIDTH)
+        if scale != 1:
+            h, w = img.shape[:2]
+            small = (max(1, round(w * scale)), max(1, round(h * scale)))
+            img = np.array(Image.fromarray(img).resize(small, Image.Resampling.LANCZOS))
+        x = int(video_width / 2 - img.shape[1] / 2)
+        captions.append((Sprite(img), start, end, x, video_height - int(100 * scale)))
+    return captions
+
+
+def build_effect_frames_drawer(fg_pil, bg_pil, choice, duration, size, audio_text="", finish=None):
+    """Frame-server draw(comp, t) for an effect clip at `size`, or None if `choice` has no effect."""
+    from scripts.frame_effects import build_effect_drawer
+
+    video_width, video_height = size
+    fg = np.array(fg_pil.convert("RGBA").resize(size, Image.Resampling.LANCZOS))
+    bg = np.array(bg_pil.convert("RGB").resize(size, Image.Resampling.LANCZOS))
+
+    captions = build_caption_sprites(audio_text, duration, video_width, video_height) if audio_text else []
+    return build_effect_drawer(choice, fg, bg, duration, size, captions, finish=finish)
+
+
+def render_effect_clip_frames(fg_pil, bg_pil, choice, duration, output_path, audio_text="",
+                              audio_delay: float = 0.5, size=(1920, 1080), fps=24, finish=None):
+    """
+    Frame-server render of an effect clip: layers are blended in place with NumPy
+    and streamed straight into ffmpeg. Returns False if `choice` has no effect.
+    `finish` is an optional scripts.video_effects effect name.
+    """
+    draw_effect = build_effect_frames_drawer(fg_pil, bg_pil, choice, duration, size, audio_text, finish)
+    if draw_effect is None:
+        return False
+
+    # The encoder holds the last frame for the audio delay
+    with profile_render(profile_name(output_path)) as prof:
+        render_to_ffmpeg(prof.wrap_draw(draw_effect), duration, fps, size, output_path,
+                         tail_hold=max(audio_delay, 0), threads=4)
+    return True
+
+
+def render_effect_preview(fg_pil, bg_pil, choice, duration, audio_text="", size=PREVIEW_SIZE,
+                          fps=PREVIEW_FPS, finish=None):
+    """
+    Low-res preview of an effect clip as a list of HxWx3 uint8 frames (no encoding).
+    Uses the same drawer as render_effect_clip_frames, so motion, captions and
+    `finish` match the final clip. Returns None if `choice` has no effect.
+    """
+    draw_effect = build_effect_frames_drawer(fg_pil, bg_pil, choice, duration, size, audio_text, finish)
+    if draw_effect is None:
+        return None
+    return [frame.copy() for frame in serve_frames(draw_effect, duration, fps, size)]
+
+
+def generate_single_clip_from_data(fg_pil, bg_pil, choice, audio_path, output_path, audio_text="",
+                                   audio_delay: float = 0.5, renderer: str = DEFAULT_RENDERER,
+                                   finish: str = None):
     """
     Generates a single clip based on pre-calculated assets and choice.
+    renderer="frames" uses the NumPy frame server; "moviepy" (or any frame-server
+    failure) falls back to the MoviePy composite below.
+    `finish` optionally names a scripts.video_effects effect applied on top.
     """
     video_width = 1920
     video_height = 1080
     
     audio = AudioFileClip(audio_path)
     duration = audio.duration
+
+    if renderer == "frames":
+        try:
+            return render_effect_clip_frames(
+                fg_pil, bg_pil, choice, duration, output_path, audio_text,
+                audio_delay=audio_delay, size=(video_width, video_height), finish=finish
+            )
+        except Exception as e:
+            print(f"  -> Frame server failed ({e}), falling back to MoviePy...")
     
     # Resize Logic
     fg_pil = fg_pil.resize((video_width, video_height), Image.Resampling.LANCZOS)
@@ -106,7 +263,7 @@ def generate_single_clip_from_data(fg_pil, bg_pil, choice, audio_path, output_pa
     
     # Base Clips
     bg_clip = ImageClip(np.array(bg_pil), duration=duration)
-    fg_clip_static = ImageClip(np.array(fg_pil), transparent=True, duration=duration)
+    fg_clip_static = freeze_mask(ImageClip(np.array(fg_pil), transparent=True, duration=duration))
     
     final_clip = None
 
@@ -114,8 +271,7 @@ def generate_single_clip_from_data(fg_pil, bg_pil, choice, audio_path, output_pa
     if choice == "1": # Zoom Subject
         fg_clip = create_zooming_clip(fg_pil, duration, max_zoom=1.15)
         fg_clip = fg_clip.set_position(("center", "center"))
-        bg_clip = bg_clip.resize(lambda t: 1 + 0.08 * t / duration)
-        bg_clip = bg_clip.set_position(("center", "center"))
+        bg_clip = ken_burns_clip(np.array(bg_pil), duration, 1.0, 1.08)
         final_clip = CompositeVideoClip([bg_clip, fg_clip], size=(video_width, video_height))
 
     elif choice == "2": # Parallax
@@ -129,7 +285,7 @@ def generate_single_clip_from_data(fg_pil, bg_pil, choice, audio_path, output_pa
         final_clip = CompositeVideoClip([bg_clip, fg_clip], size=(video_width, video_height))
         
     elif choice == "4": # Zoom BG
-        bg_clip = bg_clip.resize(lambda t: 1 + 0.2 * t / duration)
+        bg_clip = ken_burns_clip(np.array(bg_pil), duration, 1.0, 1.2, anchor="topleft")
         fg_clip = fg_clip_static.set_position(("center", "center"))
         final_clip = CompositeVideoClip([bg_clip, fg_clip], size=(video_width, video_height))
         
@@ -169,16 +325,15 @@ def generate_single_clip_from_data(fg_pil, bg_pil, choice, audio_path, output_pa
     # REMOVED Color Cycle (11)
 
     elif choice == "8": # Vignette Pulse (Was 12)
+        # Radial gradient is the same every frame: only the opacity pulses
+        center_x, center_y = video_width/2, video_height/2
+        vignette_base = radial_distance(video_width, video_height) / np.float32(np.sqrt(center_x**2 + center_y**2))
+
         # Create vignette mask
         def make_vignette(t):
             # Pulse opacity
             opacity = 150 + 50 * np.sin(3*t)
-            # Create a radial gradient using CV2/Numpy
-            Y, X = np.ogrid[:video_height, :video_width]
-            center_x, center_y = video_width/2, video_height/2
-            dist_from_center = np.sqrt((X - center_x)**2 + (Y - center_y)**2)
-            mask = dist_from_center / (np.sqrt(center_x**2 + center_y**2))
-            mask = np.clip(mask * (opacity/255.0), 0, 1)
+            mask = np.clip(vignette_base * np.float32(opacity/255.0), 0, 1)
             # Expand to 3 channels for multiplication
             mask_3c = np.dstack([mask]*3) 
             return mask_3c
@@ -225,6 +380,10 @@ def generate_single_clip_from_data(fg_pil, bg_pil, choice, audio_path, output_pa
         # Just return basic
         return False
 
+    # ---- FINISHING EFFECT (video_effects library) ----
+    if finish:
+        final_clip = apply_clip_effect(final_clip.set_duration(duration), finish)
+
     # ---- ADD SUBTITLES ----
     if audio_text:
         subtitles = split_text_by_time(audio_text, duration, max_chars=42)
@@ -237,7 +396,7 @@ def generate_single_clip_from_data(fg_pil, bg_pil, choice, audio_path, output_pa
             img = create_caption_image(text, video_width)
             # Fix positioning using bottom alignment
             txt = (
-                ImageClip(img, transparent=True)
+                freeze_mask(ImageClip(img, transparent=True))
                 .set_position(("center", video_height - 100)) # Bottom
                 .set_start(start)
                 .set_end(end)
@@ -246,40 +405,221 @@ def generate_single_clip_from_data(fg_pil, bg_pil, choice, audio_path, output_pa
         
         # Add to composition
         if subtitle_clips:
-            final_clip = CompositeVideoClip(final_clip.clips + subtitle_clips, size=(video_width, video_height))
+            base_layers = [final_clip] if finish else final_clip.clips
+            final_clip = CompositeVideoClip(base_layers + subtitle_clips, size=(video_width, video_height))
 
     # final_clip = final_clip.set_audio(audio) # NO AUDIO
     
     # ---- ADD FREEZE FRAME (DELAY) ----
+    # ffmpeg clones the last encoded frame (tpad), so the delay costs no
+    # extra composite evaluation and no concatenation layer.
+    ffmpeg_params = None
     if audio_delay > 0 and final_clip is not None:
-        # Capture the very last frame of the effect clip
-        # We take a frame slightly before the end to avoid any out-of-bounds rounding
-        last_frame_img = final_clip.get_frame(duration - 0.05)
-        freeze_clip = ImageClip(last_frame_img, duration=audio_delay)
-        
-        # Concatenate: [Effect Clip] + [Freeze Clip]
-        from moviepy.editor import concatenate_videoclips
-        final_clip = concatenate_videoclips([final_clip, freeze_clip])
+        ffmpeg_params = ["-vf", tail_hold_filter(audio_delay)]
     
     # Write File
-    final_clip.write_videofile(
-        output_path, fps=24, codec="libx264", audio=False, threads=4, logger=None
-    )
+    with profile_render(profile_name(output_path), final_clip):
+        final_clip.write_videofile(
+            output_path, fps=24, codec="libx264", audio=False, threads=4, logger=None,
+            ffmpeg_params=ffmpeg_params
+        )
     return True
 
+# ==================================================================================
+# REVIEW PIPELINE (BACKGROUND WORK FOR THE UIs)
+# ==================================================================================
+
+class ReviewPipeline:
+    """
+    Runs extraction and effect-clip rendering on worker pools while the review
+    windows are open. Tk callbacks call select_image()/choose_effect(); the
+    windows poll status() from the main thread, workers never touch widgets.
+
+    A scene has at most one render in flight (they share output_path); picking
+    another effect meanwhile re-renders once the current one finishes.
+    """
+
+    def __init__(self, scenes, extract_workers=EXTRACT_WORKERS, render_workers=RENDER_WORKERS):
+        self.scenes = {s['id']: s for s in scenes}
+        self.title = current_title()
+        self._extract_pool = ThreadPoolExecutor(max_workers=extract_workers, thread_name_prefix="extract")
+        self._render_pool = ThreadPoolExecutor(max_workers=render_workers, thread_name_prefix="render")
+        self._preview_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="preview")
+        self._lock = threading.Condition()
+        self._extractions = {}  # image path -> Future of (fg, bg, orig)
+        self.selected = {}      # scene_id -> chosen image path
+        self._wanted = {}       # scene_id -> (choice, finish) last picked in the UI
+        self._rendering = {}    # scene_id -> (choice, finish) being rendered
+        self._rendered = {}     # scene_id -> (choice, finish) last written
+        self.results = {}       # scene_id -> True / False
+        self._previews = OrderedDict()  # (scene_id, choice, finish) -> Future of preview frames
+        self._durations = {}    # scene_id -> audio duration
+        self._closed = False
+
+    # ---------- extraction ----------
+    def select_image(self, sid, path):
+        """Make `path` the scene's image and start extracting it (each path is extracted once)."""
+        with self._lock:
+            self.selected[sid] = path
+            if path not in self._extractions:
+                self._extractions[path] = self._extract_pool.submit(self._extract, sid, path)
+
+    def _extract(self, sid, path):
+        with span("extraction", title=self.title, scene=sid):
+            return extract_layers(path)
+
+    def cutout(self, sid):
+        """Block until the selected image is extracted; return (fg, bg, orig) or raise its error."""
+        with self._lock:
+            future = self._extractions[self.selected[sid]]
+        return future.result()
+
+    def layers(self, sid):
+        """(fg, bg, orig) for the selected image, or None until extracted (or if it failed)."""
+        future = self._extractions.get(self.selected.get(sid))
+        if future is None or not future.done() or future.cancelled() or future.exception() is not None:
+            return None
+        return future.result()
+
+    # ---------- rendering ----------
+    def choose_effect(self, sid, choice, finish=None):
+        """Render the scene with `choice`/`finish`, now or right after its current render."""
+        with self._lock:
+            self._wanted[sid] = (choice, finish)
+            if sid not in self._rendering:
+                self._submit_render(sid)
+
+    def _submit_render(self, sid):
+        # Caller holds the lock
+        job = self._wanted[sid]
+        if self._closed or self._rendered.get(sid) == job:
+            return
+        self._rendering[sid] = job
+        self._render_pool.submit(self._render, sid, job)
+
+    def _render(self, sid, job):
+        choice, finish = job
+        data = self.scenes[sid]
+        success = False
+        try:
+            # Waits here if the cutout is still being extracted
+            fg, bg, _ = self.cutout(sid)
+            with span("effect_clip", title=self.title, scene=sid, choice=choice) as s:
+                success = generate_single_clip_from_data(
+                    fg, bg, choice, data['audio_path'], data['output_path'], data['audio_text'],
+                    audio_delay=data['audio_delay'], finish=finish
+                )
+                if success: s.add_output(data['output_path'])
+        except Exception as e:
+            print(f"  -> Scene {sid} failed: {e}")
+
+        if not success and self.results.get(sid) and os.path.exists(data['output_path']):
+            # An earlier pick's clip must not outlive the new pick (e.g. back to "Skip")
+            os.remove(data['output_path'])
+
+        with self._lock:
+            del self._rendering[sid]
+            self._rendered[sid] = job
+            self.results[sid] = success
+            if self._wanted[sid] != job:
+                self._submit_render(sid)
+            elif success:
+                print(f"  -> Scene {sid} Effect Clip Generated.")
+            self._lock.notify_all()
+
+    # ---------- previews ----------
+    def preview(self, sid, choice, finish=None):
+        """Future of render_effect_preview() frames for this pick; recent previews are reused."""
+        key = (sid, choice, finish)
+        with self._lock:
+            future = self._previews.pop(key, None)
+            if future is None:
+                # An older pick of the same scene that has not started is no longer wanted
+                for old_key, old in list(self._previews.items()):
+                    if old_key[0] == sid and old.cancel():
+                        del self._previews[old_key]
+                future = self._preview_pool.submit(self._preview, sid, choice, finish)
+            self._previews[key] = future
+            while len(self._previews) > PREVIEW_KEEP:
+                self._previews.popitem(last=False)
+        return future
+
+    def _preview(self, sid, choice, finish):
+        fg, bg, _ = self.cutout(sid)
+        return render_effect_preview(fg, bg, choice, self.duration(sid), self.scenes[sid]['audio_text'], finish=finish)
+
+    def duration(self, sid):
+        """Scene length in seconds (its narration), which effect timings depend on."""
+        if sid not in self._durations:
+            audio = AudioFileClip(self.scenes[sid]['audio_path'])
+            self._durations[sid] = audio.duration
+            audio.close()
+        return self._durations[sid]
+
+    # ---------- progress ----------
+    def status(self, sid):
+        """Short per-scene progress text for the UI."""
+        with self._lock:
+            rendering = self._rendering.get(sid)
+            rendered = self._rendered.get(sid)
+            future = self._extractions.get(self.selected.get(sid))
+        if rendering:
+            return f"🎬 rendering effect {rendering[0]}..."
+        if rendered:
+            if self.results.get(sid):
+                return "✅ clip ready"
+            return "⏭️ static clip" if rendered[0] == "0" else "❌ render failed"
+        if future is None:
+            return ""
+        if not future.done():
+            return "✂️ extracting..." if future.running() else "⏳ queued for extraction"
+        if future.cancelled() or future.exception() is not None:
+            return "❌ extraction failed"
+        return "✂️ cutout ready"
+
+    def idle(self):
+        """True once every picked effect has been rendered."""
+        with self._lock:
+            return not self._rendering
+
+    def wait(self):
+        """Block until idle(), including re-renders queued by late effect changes."""
+        with self._lock:
+            self._lock.wait_for(lambda: not self._rendering)
+
+    def close(self, cancel=False):
+        """Finish all picked renders and stop the workers; with `cancel`, drop queued work instead."""
+        if not cancel:
+            self.wait()
+        with self._lock:
+            self._closed = True
+        self._preview_pool.shutdown(wait=True, cancel_futures=True)
+        self._extract_pool.shutdown(wait=True, cancel_futures=cancel)
+        self._render_pool.shutdown(wait=True, cancel_futures=cancel)
+
+
 # ==================================================================================
 # UI: IMAGE SELECTION APP
 # ==================================================================================
 
 class ImageSelectionApp:
-    def __init__(self, root, scenes_info):
+    def __init__(self, root, scenes_info, pipeline):
+        tk, _ = get_tk()
+        from tkinter import Canvas, Frame, Scrollbar
+
         self.root = root
         self.root.title("Select Images for Scenes")
         self.root.geometry("1400x900")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         self.scenes_info = scenes_info # List of {id, candidates: [path1, path2...]}
-        self.selections = {} # scene_id -> {path: BooleanVar}
+        self.pipeline = pipeline # Extracts each scene as soon as its image is picked
+        self.selections = {} # scene_id -> StringVar of the chosen path
+        self.status_labels = {} # scene_id -> Label
+        self.rows = [] # (row Frame, [(path, Radiobutton)]) not yet showing thumbnails
+        self.thumb_jobs = {} # Radiobutton -> Future of its PIL thumbnail
         self.thumbnails = [] # Refs
+        self._thumb_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbs")
 
         # Header
         tk.Label(root, text="Select 1 Image for Cutout/Effect OR Multiple for Collage", font=("Arial", 16, "bold")).pack(pady=10)
@@ -291,10 +631,10 @@ class ImageSelectionApp:
         # Scrollable Area
         container = Frame(root)
         container.pack(fill="both", expand=True)
-        canvas = Canvas(container)
+        self.canvas = canvas = Canvas(container)
         v_scroll = Scrollbar(container, orient="vertical", command=canvas.yview)
         
-        scroll_frame = Frame(canvas)
+        self.scroll_frame = scroll_frame = Frame(canvas)
         scroll_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
         canvas.create_window((0, 0), window=scroll_frame, anchor="nw")
         canvas.configure(yscrollcommand=v_scroll.set)
@@ -305,15 +645,41 @@ class ImageSelectionApp:
         # Mousewheel
         canvas.bind_all("<MouseWheel>", lambda e: canvas.yview_scroll(int(-1*(e.delta/120)), "units"))
         
-        # Populate
-        thumb_h = 180
-        
+        # Selections exist up front (the first candidate, already extracting),
+        # so confirming before every row is built keeps the defaults
         for s_data in scenes_info:
             sid = s_data['id']
             paths = s_data['candidates']
+            
+            # Use StringVar for Single Selection
+            selected_var = tk.StringVar(value="") 
+            self.selections[sid] = selected_var
+            
+            # Default to first (best-scored) path if exists (and start extracting it right away)
+            if paths:
+                selected_var.set(paths[0])
+                pipeline.select_image(sid, paths[0])
+            selected_var.trace_add("write", lambda *_, sid=sid, var=selected_var: self.pipeline.select_image(sid, var.get()))
+
+        # Same-size blank until a thumbnail arrives, so rows do not jump around
+        self.placeholder = tk.PhotoImage(width=THUMB_HEIGHT * 16 // 9, height=THUMB_HEIGHT)
+        self._pending = list(scenes_info)
+        self.build_rows()
+        self.poll()
+
+    def build_rows(self):
+        """Add the next ROWS_PER_TICK rows, then yield to Tk so the window stays live."""
+        tk, _ = get_tk()
+        from tkinter import Frame
+
+        batch, self._pending = self._pending[:ROWS_PER_TICK], self._pending[ROWS_PER_TICK:]
+        for s_data in batch:
+            sid = s_data['id']
+            paths = s_data['candidates']
             text_preview = s_data.get('text', '')
+            scores = s_data.get('scores', {})
             
-            row = Frame(scroll_frame, bd=1, relief="solid", padx=10, pady=10)
+            row = Frame(self.scroll_frame, bd=1, relief="solid", padx=10, pady=10)
             row.pack(fill="x", padx=10, pady=5)
             
             # Header with Text
@@ -321,31 +687,68 @@ class ImageSelectionApp:
             header_frame.pack(fill="x", pady=5)
             tk.Label(header_frame, text=f"Scene {sid}", font=("Arial", 12, "bold"), fg="#2196F3").pack(side="left", padx=10)
             tk.Label(header_frame, text=text_preview[:100]+"...", font=("Arial", 10, "italic"), fg="#555").pack(side="left")
+            self.status_labels[sid] = tk.Label(header_frame, text="", font=("Arial", 10), fg="#4CAF50")
+            self.status_labels[sid].pack(side="right", padx=10)
             
-            # Use StringVar for Single Selection
-            selected_var = tk.StringVar(value="") 
-            self.selections[sid] = selected_var
-            
-            # Default to first path if exists
-            if paths:
-                selected_var.set(paths[0])
-            
+            buttons = []
             for p in paths:
-                # Load thumb
-                img = Image.open(p)
-                ratio = img.width / img.height
-                img_thumb = img.resize((int(thumb_h * ratio), thumb_h))
-                tk_thumb = ImageTk.PhotoImage(img_thumb)
-                self.thumbnails.append(tk_thumb)
-                
                 # Checkbox Frame -> Radio Frame
                 chk_frame = Frame(row)
                 chk_frame.pack(side="left", padx=15)
                 
-                # RadioButton
-                rb = tk.Radiobutton(chk_frame, image=tk_thumb, variable=selected_var, value=p)
+                # RadioButton (thumbnail loaded once the row scrolls into view)
+                rb = tk.Radiobutton(chk_frame, image=self.placeholder, variable=self.selections[sid], value=p)
                 rb.pack()
-                tk.Label(chk_frame, text=os.path.basename(p)).pack()
+                caption = os.path.basename(p)
+                if p in scores:
+                    caption += f"  (score {scores[p]:.2f}{', best' if p == paths[0] else ''})"
+                tk.Label(chk_frame, text=caption).pack()
+                buttons.append((p, rb))
+            self.rows.append((row, buttons))
+
+        if self._pending:
+            self._build_job = self.root.after(1, self.build_rows)
+
+    def load_visible_thumbnails(self):
+        """Queue thumbnail decodes for rows within a screen of the viewport."""
+        total = self.scroll_frame.winfo_height()
+        if not self.rows or total <= 1:
+            return
+        top, bottom = self.canvas.yview()
+        view = (bottom - top) * total
+        lo, hi = top * total - view, bottom * total + view
+
+        still_hidden = []
+        for row, buttons in self.rows:
+            y = row.winfo_y()
+            if y + row.winfo_height() >= lo and y <= hi:
+                for p, rb in buttons:
+                    self.thumb_jobs[rb] = self._thumb_pool.submit(load_thumbnail, p)
+            else:
+                still_hidden.append((row, buttons))
+        self.rows = still_hidden
+
+    def show_thumbnails(self):
+        _, ImageTk = get_tk()
+        for rb, future in list(self.thumb_jobs.items()):
+            if not future.done():
+                continue
+            del self.thumb_jobs[rb]
+            if future.exception() is not None:
+                rb.config(image="", text="(unreadable)")
+                continue
+            tk_thumb = ImageTk.PhotoImage(future.result())
+            self.thumbnails.append(tk_thumb)
+            rb.config(image=tk_thumb)
+
+    def poll(self):
+        """Load thumbnails for rows in view and refresh extraction progress (runs on the Tk thread)."""
+        self.load_visible_thumbnails()
+        self.show_thumbnails()
+        for sid, label in self.status_labels.items():
+            label.config(text=self.pipeline.status(sid))
+        # Check back sooner while thumbnails are still arriving
+        self._poll_job = self.root.after(POLL_MS // 4 if self.thumb_jobs else POLL_MS, self.poll)
 
     def on_confirm(self):
         self.final_selections = {} # scene_id -> list of selected paths
@@ -357,6 +760,17 @@ class ImageSelectionApp:
             else:
                  self.final_selections[sid] = []
             
+        self.close_window()
+
+    def on_close(self):
+        # Closing without confirming cancels the selection
+        self.close_window()
+
+    def close_window(self):
+        self.root.after_cancel(self._poll_job)
+        if self._pending:
+            self.root.after_cancel(self._build_job)
+        self._thumb_pool.shutdown(wait=False, cancel_futures=True)
         self.root.destroy()
 
 
@@ -364,21 +778,33 @@ class ImageSelectionApp:
 # UI: BATCH VERIFICATION APP (EFFECTS)
 # ==================================================================================
 
+NO_FINISH = "none"
+
 class BatchVerificationApp:
-    def __init__(self, root, scene_data_list):
+    def __init__(self, root, scene_data_list, pipeline):
+        tk, ImageTk = get_tk()
+        from tkinter import Canvas, Frame, Scrollbar
+
         self.root = root
         self.root.title("Select Effects for Single Images")
         self.root.geometry("1400x900")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         self.scene_data_list = scene_data_list
+        self.pipeline = pipeline # Renders each clip as soon as its effect is picked
         self.result_map = {} # scene_id -> choice_str
+        self.finish_map = {} # scene_id -> video_effects name (or None)
+        self.generating = False
+        self.preview_request = None # (scene_id, Future) to play once rendered
+        self.playing = None # [scene_id, frames, next index]
+        self._play_job = None
         
         # Header
         tk.Label(root, text="Select Video Effect", font=("Arial", 16, "bold")).pack(pady=10)
         
-        btn_gen = tk.Button(root, text="GENERATE CLIPS", font=("Arial", 14, "bold"), bg="#2196F3", fg="white",
-                            command=self.on_generate)
-        btn_gen.pack(pady=10)
+        self.btn_gen = tk.Button(root, text="GENERATE CLIPS", font=("Arial", 14, "bold"), bg="#2196F3", fg="white",
+                                 command=self.on_generate)
+        self.btn_gen.pack(pady=10)
         
         # Scrollable Area
         container = Frame(root)
@@ -399,6 +825,13 @@ class BatchVerificationApp:
         
         # Populate
         self.choices = {} # scene_id -> StringVar
+        self.finishes = {} # scene_id -> StringVar
+        self.previews = {} # scene_id -> (original Label, cutout Label), until the cutout is shown
+        self.status_labels = {} # scene_id -> Label
+        self.players = {} # scene_id -> Label showing that scene's effect preview
+        self.player_images = {} # scene_id -> PhotoImage currently shown (keeps it alive)
+        self.controls = [] # Widgets locked once generation starts
+        self.thumbs = [] # Refs
         
         EFFECT_OPTIONS = [
             ("0", "Skip (Static)"),
@@ -418,47 +851,33 @@ class BatchVerificationApp:
         
         for data in scene_data_list:
             sid = data['id']
-            # PREVIEW GENERATION
-            # show Original vs Foreground to check cutout quality
-            orig_pil = data['original_pil']
-            fg_pil = data['fg_pil']
-            
-            thumb_h = 180
-            
-            # 1. Original Thumb
-            ratio_o = orig_pil.width / orig_pil.height
-            thumb_w_o = int(thumb_h * ratio_o)
-            orig_thumb = orig_pil.resize((thumb_w_o, thumb_h))
-            tk_orig = ImageTk.PhotoImage(orig_thumb)
-            
-            # 2. Cutout Thumb (FG)
-            # Create a checkerboard or dark bg for FG to see alpha
-            fg_thumb = fg_pil.resize((thumb_w_o, thumb_h))
-            # Composite on dark grey to see edges better
-            bg_check = Image.new("RGB", fg_thumb.size, (50, 50, 50))
-            bg_check.paste(fg_thumb, (0,0), fg_thumb)
-            tk_fg = ImageTk.PhotoImage(bg_check)
-            
-            # Keep refs
-            if not hasattr(self, 'thumbs'): self.thumbs = []
-            self.thumbs.extend([tk_orig, tk_fg])
             
             row = Frame(scroll_frame, bd=1, relief="solid", padx=10, pady=10)
             row.pack(fill="x", padx=10, pady=5)
             
             # Images Container
+            # show Original vs Foreground to check cutout quality (filled in once extracted)
             imgs_frame = Frame(row)
             imgs_frame.pack(side="left")
             
             # Show Original
             lbl_orig = tk.Label(imgs_frame, text="Original", font=("Arial", 8))
             lbl_orig.pack(anchor="w")
-            tk.Label(imgs_frame, image=tk_orig).pack(anchor="w")
+            img_orig = tk.Label(imgs_frame, text="(extracting...)", width=40, fg="#999")
+            img_orig.pack(anchor="w")
             
             # Show Cutout
             lbl_cut = tk.Label(imgs_frame, text="Cutout", font=("Arial", 8))
             lbl_cut.pack(anchor="w", pady=(5,0))
-            tk.Label(imgs_frame, image=tk_fg).pack(anchor="w")
+            img_fg = tk.Label(imgs_frame, text="(extracting...)", width=40, fg="#999")
+            img_fg.pack(anchor="w")
+            self.previews[sid] = (img_orig, img_fg)
+            
+            # Effect preview (low-res, plays in place; click to replay)
+            player = tk.Label(row, text="Pick an effect to preview", width=40, fg="#999")
+            player.pack(side="left", padx=10)
+            player.bind("<Button-1>", lambda e, sid=sid: self.request_preview(sid))
+            self.players[sid] = player
             
             # Controls
             ctrl_frame = Frame(row)
@@ -466,6 +885,8 @@ class BatchVerificationApp:
             
             tk.Label(ctrl_frame, text=f"Scene {sid}", font=("Arial", 14, "bold")).pack(anchor="w")
             tk.Label(ctrl_frame, text=data['audio_text'][:60]+"...", fg="#666").pack(anchor="w")
+            self.status_labels[sid] = tk.Label(ctrl_frame, text="", font=("Arial", 10), fg="#4CAF50")
+            self.status_labels[sid].pack(anchor="w")
             
             # Radio Buttons
             choice_var = tk.StringVar(value="0") # Default Skip
@@ -480,15 +901,131 @@ class BatchVerificationApp:
             for val, label in EFFECT_OPTIONS:
                 rb = tk.Radiobutton(opts_frame, text=f"[{val}] {label}", variable=choice_var, value=val)
                 rb.grid(row=r, column=c, sticky="w", padx=5)
+                self.controls.append(rb)
                 c += 1
                 if c > 4: # Wrap
                     c = 0
                     r += 1
 
+            # Optional finishing effect from scripts/video_effects.py
+            finish_var = tk.StringVar(value=NO_FINISH)
+            self.finishes[sid] = finish_var
+
+            finish_frame = Frame(ctrl_frame)
+            finish_frame.pack(anchor="w", pady=5)
+            tk.Label(finish_frame, text="Finish:").pack(side="left")
+            finish_menu = tk.OptionMenu(finish_frame, finish_var, NO_FINISH, *EFFECT_NAMES)
+            finish_menu.pack(side="left", padx=5)
+            self.controls.append(finish_menu)
+
+            # Picking an effect (or finish) previews it and starts that scene's render in the background
+            for var in (choice_var, finish_var):
+                var.trace_add("write", lambda *_, sid=sid: self.on_pick(sid))
+
+        self.poll()
+
+    def picked(self, sid):
+        finish = self.finishes[sid].get()
+        return self.choices[sid].get(), None if finish == NO_FINISH else finish
+
+    def on_pick(self, sid):
+        self.pipeline.choose_effect(sid, *self.picked(sid))
+        self.request_preview(sid)
+
+    def request_preview(self, sid):
+        self.preview_request = (sid, self.pipeline.preview(sid, *self.picked(sid)))
+        if self.playing is None or self.playing[0] != sid:
+            self.players[sid].config(text="rendering preview...")
+
+    def play_preview(self, sid, future):
+        if future.cancelled() or future.exception() is not None:
+            self.players[sid].config(text="preview failed")
+            return
+        frames = future.result()
+        if frames is None:
+            self.player_images.pop(sid, None)
+            self.players[sid].config(image="", text="Static (no effect)", width=40)
+            if self.playing and self.playing[0] == sid:
+                self.playing = None
+            return
+        self.playing = [sid, frames, 0]
+        if self._play_job is None:
+            self.play_tick()
+
+    def play_tick(self):
+        """Show the next preview frame, looping at PREVIEW_FPS."""
+        self._play_job = None
+        if self.playing is None:
+            return
+        _, ImageTk = get_tk()
+        sid, frames, i = self.playing
+        self.player_images[sid] = ImageTk.PhotoImage(Image.fromarray(frames[i]))
+        self.players[sid].config(image=self.player_images[sid], text="", width=0)
+        self.playing[2] = (i + 1) % len(frames)
+        self._play_job = self.root.after(int(1000 / PREVIEW_FPS), self.play_tick)
+
+    def show_preview(self, sid, layers):
+        _, ImageTk = get_tk()
+        fg_pil, _, orig_pil = layers
+        img_orig, img_fg = self.previews.pop(sid)
+        thumb_h = 180
+        
+        # 1. Original Thumb
+        ratio_o = orig_pil.width / orig_pil.height
+        thumb_w_o = int(thumb_h * ratio_o)
+        orig_thumb = orig_pil.resize((thumb_w_o, thumb_h))
+        tk_orig = ImageTk.PhotoImage(orig_thumb)
+        
+        # 2. Cutout Thumb (FG)
+        # Create a checkerboard or dark bg for FG to see alpha
+        fg_thumb = fg_pil.resize((thumb_w_o, thumb_h))
+        # Composite on dark grey to see edges better
+        bg_check = Image.new("RGB", fg_thumb.size, (50, 50, 50))
+        bg_check.paste(fg_thumb, (0,0), fg_thumb)
+        tk_fg = ImageTk.PhotoImage(bg_check)
+        
+        # Keep refs
+        self.thumbs.extend([tk_orig, tk_fg])
+        img_orig.config(image=tk_orig, text="", width=0)
+        img_fg.config(image=tk_fg, text="", width=0)
+
+    def poll(self):
+        """Fill in finished cutouts and refresh per-scene progress (runs on the Tk thread)."""
+        for sid in list(self.previews):
+            layers = self.pipeline.layers(sid)
+            if layers is not None:
+                self.show_preview(sid, layers)
+        for sid, label in self.status_labels.items():
+            label.config(text=self.pipeline.status(sid))
+        if self.preview_request and self.preview_request[1].done():
+            sid, future = self.preview_request
+            self.preview_request = None
+            self.play_preview(sid, future)
+
+        if self.generating and self.pipeline.idle():
+            self.close_window()
+            return
+        self._poll_job = self.root.after(POLL_MS, self.poll)
+
     def on_generate(self):
-        # Collect results
-        for sid, var in self.choices.items():
-            self.result_map[sid] = var.get()
+        # Collect results; scenes left on their defaults start rendering now
+        for sid in self.choices:
+            self.result_map[sid], self.finish_map[sid] = self.picked(sid)
+            self.pipeline.choose_effect(sid, *self.picked(sid))
+        # Keep the window up with progress until every clip is written
+        self.generating = True
+        self.btn_gen.config(text="RENDERING CLIPS...", state="disabled")
+        for widget in self.controls:
+            widget.config(state="disabled")
+
+    def on_close(self):
+        # Closing the window cancels whatever has not started rendering
+        self.close_window()
+
+    def close_window(self):
+        for job in (self._poll_job, self._play_job):
+            if job is not None:
+                self.root.after_cancel(job)
         self.root.destroy()
 
 
@@ -496,16 +1033,8 @@ class BatchVerificationApp:
 # MAIN PROCESSOR
 # ==================================================================================
 
-def run_batch_processor(scenes_to_process):
-    """
-    1. Scan for multiple images.
-    2. Show Selection App.
-    3. If User selects > 1: Generate Collage Clip (Static).
-    4. If User selects 1: Generate Cutout (Extract) -> Show BatchVerificationApp (Effects).
-    """
-    
-    # 1. SCAN IMAGES
-    print("\n[BATCH] Scanning for image candidates...")
+def find_candidates(scenes_to_process):
+    """All candidate images per scene: [{id, candidates: [path1, path2...], text}]."""
     scene_candidates = [] # List of {id, candidates: []}
     
     # Map back from scenes_to_process which has 'image_path' (usually just one)
@@ -560,15 +1089,39 @@ def run_batch_processor(scenes_to_process):
             text_preview = scene.get('audio_text', '')
             scene_candidates.append({"id": sid, "candidates": candidates, "text": text_preview})
 
-    # 2. SELECT IMAGES
+    return scene_candidates
+
+
+def run_batch_processor(scenes_to_process):
+    """
+    1. Scan for multiple images.
+    2. Show Selection App.
+    3. If User selects > 1: Generate Collage Clip (Static).
+    4. If User selects 1: Generate Cutout (Extract) -> Show BatchVerificationApp (Effects).
+    Extraction starts as soon as an image is picked and a clip renders as soon as
+    its effect is picked (ReviewPipeline), so the windows only show progress.
+    """
+    
+    # 1. SCAN IMAGES (best-scored first, if the scores stage ran; cached scores are looked up
+    #    by file stat only, so no image is read or scored before the window opens)
+    print("\n[BATCH] Scanning for image candidates...")
+    scene_candidates = rank_candidates(find_candidates(scenes_to_process), compute=False)
+
+    tk, _ = get_tk()
+
+    # Extraction and rendering run on worker pools while the windows are open
+    pipeline = ReviewPipeline(scenes_to_process)
+
+    # 2. SELECT IMAGES (each scene's pick starts extracting immediately)
     print(f"[BATCH] Found candidates for {len(scene_candidates)} scenes. Launching Selection App...")
     
     root = tk.Tk()
-    sel_app = ImageSelectionApp(root, scene_candidates)
+    sel_app = ImageSelectionApp(root, scene_candidates, pipeline)
     root.mainloop()
     
     if not hasattr(sel_app, 'final_selections'):
         print("[BATCH] Selection cancelled.")
+        pipeline.close(cancel=True)
         return
 
     selected_map = sel_app.final_selections # {id: [path1, path2...]}
@@ -584,53 +1137,28 @@ def run_batch_processor(scenes_to_process):
         if not selected_paths:
             print(f"Skipping Scene {sid} (No images).")
             continue
-            
-        scene_audio = scene['audio_path']
-        scene_out = scene['output_path']
-        scene_text = scene.get('audio_text', '')
-        scene_delay = scene.get('audio_delay', 0.5)
-        
-        # ALWAYS SINGLE processing now
-        print(f"Scene {sid}: Image selected. preparing for Extraction...")
-        
-        # Use the selected path!
-        chosen_img_path = selected_paths[0]
-        
-        # Extract
-        fg, bg, orig = extract_layers(chosen_img_path)
         
+        # ALWAYS SINGLE processing now; extraction is already queued or done
+        pipeline.select_image(sid, selected_paths[0])
         scenes_for_effect_ui.append({
             "id": sid,
-            "fg_pil": fg,
-            "bg_pil": bg,
-            "original_pil": orig,
-            "image_path": chosen_img_path,
-            "audio_path": scene_audio,
-            "output_path": scene_out,
-            "audio_text": scene_text,
-            "audio_delay": scene_delay
+            "image_path": selected_paths[0],
+            "audio_text": scene.get('audio_text', '')
         })
 
-    # 4. EFFECT UI (For Single Images)
+    # 4. EFFECT UI (For Single Images; each pick starts rendering immediately)
+    generate = False
     if scenes_for_effect_ui:
         print(f"\n[BATCH] Launching Effect Verification for {len(scenes_for_effect_ui)} scenes...")
         root = tk.Tk()
-        app = BatchVerificationApp(root, scenes_for_effect_ui)
+        app = BatchVerificationApp(root, scenes_for_effect_ui, pipeline)
         root.mainloop()
         
-        if hasattr(app, 'result_map'):
-             choices = app.result_map
-             print("\n[BATCH] Rendering Effect Clips...")
-             for data in scenes_for_effect_ui:
-                 sid = data['id']
-                 choice = choices.get(sid, "0")
-                 
-                 success = generate_single_clip_from_data(
-                    data['fg_pil'], data['bg_pil'], choice, 
-                    data['audio_path'], data['output_path'], data['audio_text'],
-                    audio_delay=data['audio_delay']
-                 )
-                 if success: print(f"  -> Scene {sid} Effect Clip Generated.")
+        generate = app.generating
+        if not generate:
+            print("[BATCH] Effect selection cancelled. Finishing clips already rendering...")
+    
+    # Without "GENERATE CLIPS" only renders that already started are kept
+    pipeline.close(cancel=not generate)
 
     print("\n[BATCH] All processing complete.")
-
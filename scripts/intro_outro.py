@@ -1,4 +1,7 @@
 import os
+import json
+import hashlib
+import cv2
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 from moviepy.editor import (
@@ -6,8 +9,25 @@ from moviepy.editor import (
     AudioFileClip, ColorClip, vfx
 )
 
+from scripts.frame_server import Sprite, render_to_ffmpeg
+from scripts.ken_burns import KenBurns, ken_burns_clip
+from scripts.ffmpeg_io import FFmpegFrameReader, FFmpegFrameWriter
+from scripts.masks import circle_mask, freeze_mask, set_circle_mask
+
 W, H = 1920, 1080
 
+PIP_VIDEO = "static/vid/cat.mp4"
+CAT_SIZE = 450
+RING_DIA = 470
+RING_THICKNESS = 9
+PRE_DELAY = 0.7
+FADE_OUT = 1.0
+
+# Cat + circle mask + neon ring are the same for every title: they are
+# rendered once per fps into a lossless RGBA loop and reused from here.
+TEMPLATE_DIR = os.path.join("outputs", "cache", "templates")
+TEMPLATE_VERSION = 1
+
 # --------------------------
 # TEXT RENDER FUNCTION
 # --------------------------
@@ -34,13 +54,62 @@ def create_text_image_pil(text, font_size, color, max_width=1200, font_path=None
     return img
 
 
+def make_neon_ring(ring_dia=RING_DIA, ring_thickness=RING_THICKNESS):
+    """Cyan ring with a two-level glow, as an RGBA PIL image."""
+    ring_img = Image.new("RGBA", (ring_dia, ring_dia), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(ring_img)
+    draw.ellipse(
+        (0, 0, ring_dia, ring_dia),
+        outline=(0, 255, 255, 255),
+        width=ring_thickness
+    )
+
+    blur1 = ring_img.filter(ImageFilter.GaussianBlur(6))
+    blur2 = ring_img.filter(ImageFilter.GaussianBlur(14))
+
+    final_ring = Image.alpha_composite(blur2, blur1)
+    final_ring = Image.alpha_composite(final_ring, ring_img)
+    return final_ring
+
+
+def make_title_image(title_text, font_size=60, stroke_width=3, stroke_color=(0, 0, 0)):
+    """White title with black stroke on a transparent RGBA PIL image."""
+    font = get_font(font_size)
+
+    bbox = font.getbbox(title_text)
+    tw = bbox[2] - bbox[0]
+    th = bbox[3] - bbox[1]
+
+    title_img = Image.new("RGBA", (tw + 40, th + 40), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(title_img)
+
+    draw.text(
+        (20, 20),
+        title_text,
+        font=font,
+        fill=(255, 255, 255),
+        stroke_width=stroke_width,
+        stroke_fill=stroke_color
+    )
+    return title_img
+
+
+def make_blurred_background(image_path):
+    """Thumbnail resized to the frame and Gaussian-blurred, or None if missing."""
+    if not os.path.exists(image_path):
+        return None
+    bg_img = Image.open(image_path).convert("RGB")
+    bg_img = bg_img.resize((W, H), Image.LANCZOS)
+    return bg_img.filter(ImageFilter.GaussianBlur(radius=15))
+
+
 # ------------------------------------------------------
 # INTRO GENERATOR (Blur BG + Ring + Title Below Cat)
 # ------------------------------------------------------
 def generate_intro_clip(image_path: str, audio_path: str, title_text: str, duration: float = None):
     print(f"Generating INTRO clip with image: {image_path}, audio: {audio_path}")
 
-    pip_video = "static/vid/cat.mp4"
+    pip_video = PIP_VIDEO
     audio = None
     if os.path.exists(audio_path):
         audio = AudioFileClip(audio_path)
@@ -51,15 +120,14 @@ def generate_intro_clip(image_path: str, audio_path: str, title_text: str, durat
     # --------------------------------------------------
     # BLURRED BACKGROUND
     # --------------------------------------------------
-    if os.path.exists(image_path):
-        bg_img = Image.open(image_path).convert("RGB")
-        bg_img = bg_img.resize((W, H), Image.LANCZOS)
-        bg_img = bg_img.filter(ImageFilter.GaussianBlur(radius=15))
-        base = ImageClip(np.array(bg_img)).set_duration(duration)
+    bg_img = make_blurred_background(image_path)
+    if bg_img is not None:
+        # 2% zoom as a crop window over a once-upscaled master (top-left anchored)
+        base = ken_burns_clip(np.array(bg_img), duration, 1.00, 1.02, anchor="topleft")
     else:
+        # Zooming a solid color changes nothing
         base = ColorClip((W, H), color=(20, 20, 20)).set_duration(duration)
 
-    base = base.resize(lambda t: 1.00 + 0.02 * (t / duration))
     layers = [base]
 
     # --------------------------------------------------
@@ -81,67 +149,27 @@ def generate_intro_clip(image_path: str, audio_path: str, title_text: str, durat
             width=side, height=side
         ).resize(height=450)
 
-        def circle_mask(clip):
-            Wc, Hc = clip.size
-            Y, X = np.ogrid[:Hc, :Wc]
-            dist = np.sqrt((X - Wc / 2) ** 2 + (Y - Hc / 2) ** 2)
-            return (dist <= Wc / 2).astype(float)
-
-        cat = cat.add_mask()
-        cat.mask.get_frame = lambda t: circle_mask(cat)
+        # Same circle every frame: computed once, served from cache
+        cat = set_circle_mask(cat)
 
         cat_y = H // 2 - 120
         cat = cat.set_position(("center", cat_y))
         layers.append(cat)
 
         # neon ring
-        ring_dia = 470
-        ring_thickness = 9
-
-        ring_img = Image.new("RGBA", (ring_dia, ring_dia), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(ring_img)
-        draw.ellipse(
-            (0, 0, ring_dia, ring_dia),
-            outline=(0, 255, 255, 255),
-            width=ring_thickness
-        )
-
-        blur1 = ring_img.filter(ImageFilter.GaussianBlur(6))
-        blur2 = ring_img.filter(ImageFilter.GaussianBlur(14))
-
-        final_ring = Image.alpha_composite(blur2, blur1)
-        final_ring = Image.alpha_composite(final_ring, ring_img)
+        ring_dia = RING_DIA
+        final_ring = make_neon_ring()
 
-        ring_clip = ImageClip(np.array(final_ring)).set_duration(duration)
+        ring_clip = freeze_mask(ImageClip(np.array(final_ring)).set_duration(duration))
         ring_clip = ring_clip.set_position(("center", cat_y - (ring_dia - 450) // 2))
         layers.append(ring_clip)
 
     # --------------------------------------------------
     # TITLE BELOW CAT
     # --------------------------------------------------
-    font_size = 60
-    font = get_font(font_size)
-
-    stroke_width = 3
-    stroke_color = (0, 0, 0)
-
-    bbox = font.getbbox(title_text)
-    tw = bbox[2] - bbox[0]
-    th = bbox[3] - bbox[1]
+    title_img = make_title_image(title_text)
 
-    title_img = Image.new("RGBA", (tw + 40, th + 40), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(title_img)
-
-    draw.text(
-        (20, 20),
-        title_text,
-        font=font,
-        fill=(255, 255, 255),
-        stroke_width=stroke_width,
-        stroke_fill=stroke_color
-    )
-
-    title_clip = ImageClip(np.array(title_img), transparent=True) \
+    title_clip = freeze_mask(ImageClip(np.array(title_img), transparent=True)) \
         .set_duration(duration) \
         .set_position(("center", 160))
 
@@ -155,10 +183,9 @@ def generate_intro_clip(image_path: str, audio_path: str, title_text: str, durat
     # --------------------------------------------------
     # ADD PRE-ROLL DELAY + FADE OUT
     # --------------------------------------------------
-    PRE_DELAY = 0.7
     final = CompositeVideoClip([final.set_start(PRE_DELAY)], size=(W, H))
     final = final.set_duration(final.duration + PRE_DELAY)
-    final = final.fx(vfx.fadeout, 1.0)
+    final = final.fx(vfx.fadeout, FADE_OUT)
 
     return final
 
@@ -169,7 +196,7 @@ def generate_intro_clip(image_path: str, audio_path: str, title_text: str, durat
 def generate_outro_clip(audio_path: str, duration: float = None):
     print(f"Generating OUTRO clip with audio: {audio_path}")
 
-    pip_video = "static/vid/cat.mp4"
+    pip_video = PIP_VIDEO
 
     if not os.path.exists(audio_path):
         raise FileNotFoundError(f"Audio not found: {audio_path}")
@@ -177,9 +204,8 @@ def generate_outro_clip(audio_path: str, duration: float = None):
     audio = AudioFileClip(audio_path)
     duration = audio.duration
 
-    # black background
+    # black background (zooming it is a no-op)
     base = ColorClip((W, H), color=(0, 0, 0)).set_duration(duration)
-    base = base.resize(lambda t: 1.00 + 0.015 * (t / duration))
 
     layers = [base]
 
@@ -199,37 +225,17 @@ def generate_outro_clip(audio_path: str, duration: float = None):
             width=side, height=side
         ).resize(height=450)
 
-        def circle_mask(size):
-            Wc, Hc = size
-            Y, X = np.ogrid[:Hc, :Wc]
-            dist = np.sqrt((X - Wc / 2) ** 2 + (Y - Hc / 2) ** 2)
-            return (dist <= Wc / 2).astype(float)
-
-        cat = cat.add_mask()
-        cat.mask.get_frame = lambda t: circle_mask(cat.size)
+        # Same circle every frame: computed once, served from cache
+        cat = set_circle_mask(cat)
         cat = cat.set_position(lambda t: ('center', 250))
 
         layers.append(cat)
 
         # RING
-        ring_dia = 470
-        ring_thickness = 9
-
-        ring_img = Image.new("RGBA", (ring_dia, ring_dia), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(ring_img)
-        draw.ellipse(
-            (0, 0, ring_dia, ring_dia),
-            outline=(0, 255, 255, 255),
-            width=ring_thickness
-        )
-
-        glow1 = ring_img.filter(ImageFilter.GaussianBlur(6))
-        glow2 = ring_img.filter(ImageFilter.GaussianBlur(14))
+        ring_dia = RING_DIA
+        final_ring = make_neon_ring()
 
-        final_ring = Image.alpha_composite(glow2, glow1)
-        final_ring = Image.alpha_composite(final_ring, ring_img)
-
-        ring_clip = ImageClip(np.array(final_ring)).set_duration(duration)
+        ring_clip = freeze_mask(ImageClip(np.array(final_ring)).set_duration(duration))
         ring_clip = ring_clip.set_position(
             lambda t: ('center', 250 - (ring_dia - 450) // 2)
         )
@@ -241,9 +247,218 @@ def generate_outro_clip(audio_path: str, duration: float = None):
     # --------------------------------------------------
     # ADD PRE-ROLL DELAY + FADE OUT
     # --------------------------------------------------
-    PRE_DELAY = 0.7
     final = CompositeVideoClip([final.set_start(PRE_DELAY)], size=(W, H))
     final = final.set_duration(final.duration + PRE_DELAY)
-    final = final.fx(vfx.fadeout, 1.0)
+    final = final.fx(vfx.fadeout, FADE_OUT)
 
     return final
+
+
+# ------------------------------------------------------
+# FRAME-SERVER RENDERERS
+# ------------------------------------------------------
+class CatLayer:
+    """
+    The looping cat video, center-cropped to a square and resized to `size`,
+    with a hard circular alpha computed once.
+    """
+
+    def __init__(self, path=PIP_VIDEO, size=CAT_SIZE):
+        self.reader = VideoFileClip(path, audio=False)
+        self.size = size
+        self.duration = self.reader.duration
+
+        w, h = self.reader.size
+        side = min(w, h)
+        self.x1 = int(w / 2 - side / 2)
+        self.y1 = int(h / 2 - side / 2)
+        self.side = side
+
+        self.alpha = (circle_mask(size, size) * 255).astype(np.uint8)
+        self.rgb = np.empty((size, size, 3), dtype=np.uint8)
+
+    def frame(self, t):
+        """RGB frame at time `t` (looped), written into a reused buffer."""
+        frame = self.reader.get_frame(t % self.duration)
+        square = frame[self.y1:self.y1 + self.side, self.x1:self.x1 + self.side]
+        cv2.resize(square, (self.size, self.size), dst=self.rgb, interpolation=cv2.INTER_AREA)
+        return self.rgb
+
+    def close(self):
+        self.reader.close()
+
+
+def _template_key(fps):
+    """Cache key: everything that changes the constant cat + ring layers."""
+    stat = os.stat(PIP_VIDEO)
+    params = {
+        "version": TEMPLATE_VERSION,
+        "video": os.path.abspath(PIP_VIDEO),
+        "size": stat.st_size,
+        "mtime": int(stat.st_mtime),
+        "cat": CAT_SIZE,
+        "ring": [RING_DIA, RING_THICKNESS],
+        "fps": fps,
+    }
+    return hashlib.sha1(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def render_cat_ring_template(output_path, fps=30):
+    """
+    Render one loop of the masked cat with the neon ring on top into an RGBA
+    (PNG-in-MOV) intermediate. The ring's box is the template frame; the cat
+    sits centered inside it exactly as in the intro/outro layouts.
+    """
+    cat = CatLayer()
+    ring = np.array(make_neon_ring()).astype(np.float32) / 255.0
+    ring_rgb, ring_a = ring[:, :, :3], ring[:, :, 3:4]
+    off = (RING_DIA - CAT_SIZE) // 2
+
+    cat_alpha = np.zeros((RING_DIA, RING_DIA, 1), dtype=np.float32)
+    cat_alpha[off:off + CAT_SIZE, off:off + CAT_SIZE, 0] = cat.alpha / 255.0
+    cat_rgb = np.zeros((RING_DIA, RING_DIA, 3), dtype=np.float32)
+
+    # "ring over cat": alpha and un-premultiplied colour of the combined layer
+    out_a = ring_a + cat_alpha * (1 - ring_a)
+    safe_a = np.where(out_a > 0, out_a, 1)
+    rgba = np.empty((RING_DIA, RING_DIA, 4), dtype=np.uint8)
+    rgba[:, :, 3] = np.round(out_a[:, :, 0] * 255)
+
+    n_frames = max(1, int(round(cat.duration * fps)))
+    print(f"Rendering cat/ring template ({n_frames} frames @ {fps}fps) -> {output_path}")
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    # Per-process name: concurrent runs building the same template must not share a file
+    tmp_path = f"{output_path}.{os.getpid()}.part.mov"
+    try:
+        with FFmpegFrameWriter(tmp_path, (RING_DIA, RING_DIA), fps, pix_fmt="rgba", codec="png") as writer:
+            for i in range(n_frames):
+                np.multiply(cat.frame(i / fps), 1 / 255.0, out=cat_rgb[off:off + CAT_SIZE, off:off + CAT_SIZE])
+                color = (ring_rgb * ring_a + cat_rgb * cat_alpha * (1 - ring_a)) / safe_a
+                np.copyto(rgba[:, :, :3], np.round(color * 255), casting="unsafe")
+                writer.write_frame(rgba)
+    finally:
+        cat.close()
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def get_cat_ring_template(fps=30):
+    """Path of the cat + ring template for `fps`, rendering it on first use (None if no cat video)."""
+    if not os.path.exists(PIP_VIDEO):
+        return None
+    path = os.path.join(TEMPLATE_DIR, f"cat_ring_{fps}fps_{_template_key(fps)}.mov")
+    if not os.path.exists(path):
+        render_cat_ring_template(path, fps)
+    return path
+
+
+class TemplateLayer:
+    """Plays the cached cat + ring template in a loop, one frame per output frame."""
+
+    def __init__(self, path):
+        self.reader = FFmpegFrameReader(path, (RING_DIA, RING_DIA), pix_fmt="rgba", loop=True)
+
+    def next_frame(self):
+        frame = self.reader.read_frame()
+        if frame is None:
+            raise IOError("Cat/ring template ended unexpectedly")
+        return frame
+
+    def close(self):
+        self.reader.close()
+
+
+def _write_with_delayed_audio(draw, duration, audio_path, output_path, fps):
+    """
+    Render PRE_DELAY of black, the content, then PRE_DELAY of black with a
+    FADE_OUT at the very end, and mux the audio delayed by PRE_DELAY
+    (same timeline as the MoviePy builders produce).
+    """
+    total = duration + 2 * PRE_DELAY
+
+    def draw_timeline(comp, t):
+        t_in = t - PRE_DELAY
+        if 0 <= t_in < duration:
+            draw(comp, t_in)
+        else:
+            comp.clear()
+        fading = (total - t) / FADE_OUT
+        if fading < 1:
+            comp.fade_to((0, 0, 0), 1 - max(fading, 0))
+
+    render_to_ffmpeg(
+        draw_timeline, total, fps, (W, H), output_path,
+        inputs=[["-i", audio_path]], maps=["1:a"],
+        output_params=["-af", f"adelay={int(PRE_DELAY * 1000)}:all=1,apad", "-t", f"{total:.6f}"]
+    )
+    return output_path
+
+
+def render_intro_frames(image_path: str, audio_path: str, title_text: str, output_path: str, fps: int = 30):
+    """Frame-server version of generate_intro_clip, written straight to `output_path`."""
+    print(f"Rendering INTRO with frame server: {image_path}, audio: {audio_path}")
+
+    if not os.path.exists(audio_path):
+        raise FileNotFoundError(f"Audio not found: {audio_path}")
+    audio = AudioFileClip(audio_path)
+    duration = audio.duration
+    audio.close()
+
+    bg_img = make_blurred_background(image_path)
+    if bg_img is not None:
+        bg = np.array(bg_img)
+    else:
+        bg = np.full((H, W, 3), 20, dtype=np.uint8)
+    base = KenBurns(bg, (W, H), 1.00, 1.02, duration, anchor="topleft")
+
+    template_path = get_cat_ring_template(fps)
+    template = TemplateLayer(template_path) if template_path else None
+    cat_y = H // 2 - 120
+    ring_x = int(W / 2 - RING_DIA / 2)
+    ring_y = cat_y - (RING_DIA - CAT_SIZE) // 2
+
+    title = Sprite(np.array(make_title_image(title_text)))
+    title_x = int(W / 2 - title.full_w / 2)
+
+    # Only the background zoom and the title are per-title work
+    def draw(comp, t):
+        comp.blit(base.frame(t))
+        if template is not None:
+            layer = template.next_frame()
+            comp.blend_masked(layer[:, :, :3], layer[:, :, 3], ring_x, ring_y)
+        comp.blend(title, title_x, 160)
+
+    try:
+        return _write_with_delayed_audio(draw, duration, audio_path, output_path, fps)
+    finally:
+        if template is not None:
+            template.close()
+
+
+def render_outro_frames(audio_path: str, output_path: str, fps: int = 30):
+    """Frame-server version of generate_outro_clip, written straight to `output_path`."""
+    print(f"Rendering OUTRO with frame server, audio: {audio_path}")
+
+    if not os.path.exists(audio_path):
+        raise FileNotFoundError(f"Audio not found: {audio_path}")
+    audio = AudioFileClip(audio_path)
+    duration = audio.duration
+    audio.close()
+
+    template_path = get_cat_ring_template(fps)
+    template = TemplateLayer(template_path) if template_path else None
+    ring_x = int(W / 2 - RING_DIA / 2)
+    ring_y = 250 - (RING_DIA - CAT_SIZE) // 2
+
+    def draw(comp, t):
+        # Black background: zooming it is a no-op
+        comp.clear()
+        if template is not None:
+            layer = template.next_frame()
+            comp.blend_masked(layer[:, :, :3], layer[:, :, 3], ring_x, ring_y)
+
+    try:
+        return _write_with_delayed_audio(draw, duration, audio_path, output_path, fps)
+    finally:
+        if template is not None:
+            template.close()
@@ -8,21 +8,44 @@ os.environ["NUMEXPR_NUM_THREADS"] = "2"
 import time
 from PIL import Image, ImageDraw, ImageFont
 
-import torch
-from diffusers import KandinskyPriorPipeline, KandinskyPipeline
-
-# Set PyTorch thread count
-torch.set_num_threads(2)
-torch.set_num_interop_threads(2)
-
-prior = KandinskyPriorPipeline.from_pretrained(
-        "kandinsky-community/kandinsky-2-1-prior",
-        torch_dtype=torch.float32
-)
-pipe = KandinskyPipeline.from_pretrained(
-        "kandinsky-community/kandinsky-2-1",
-        torch_dtype=torch.float32
-)
+_prior = None
+_pipe = None
+
+
+def get_prior():
+    """
+    Load the Kandinsky prior on first use (torch/diffusers are imported here).
+    Its CLIP text/image encoders are also used to score candidate images.
+    """
+    global _prior
+    if _prior is None:
+        import torch
+        from diffusers import KandinskyPriorPipeline
+
+        # Set PyTorch thread count (interop threads can only be set once)
+        torch.set_num_threads(2)
+        torch.set_num_interop_threads(2)
+
+        _prior = KandinskyPriorPipeline.from_pretrained(
+                "kandinsky-community/kandinsky-2-1-prior",
+                torch_dtype=torch.float32
+        )
+    return _prior
+
+
+def get_pipelines():
+    """Load the Kandinsky prior + decoder on first use."""
+    global _pipe
+    prior = get_prior()
+    if _pipe is None:
+        import torch
+        from diffusers import KandinskyPipeline
+
+        _pipe = KandinskyPipeline.from_pretrained(
+                "kandinsky-community/kandinsky-2-1",
+                torch_dtype=torch.float32
+        )
+    return prior, _pipe
 
 def generate_image_from_prompt(prompt: str, output_path: str):
     if not prompt or not prompt.strip():
@@ -39,6 +62,7 @@ def generate_image_from_prompt(prompt: str, output_path: str):
     # ============================================================
     
 
+    prior, pipe = get_pipelines()
     prior.to("cpu")
     pipe.to("cpu")
 
@@ -0,0 +1,87 @@
+"""
+Ken Burns zooms as a moving crop window.
+
+The source is resampled once, up front, at the largest zoom of the move.
+Every frame is then a sub-pixel crop window of that master, shrunk to the
+output size by a single cv2.warpAffine into a reused buffer, instead of
+resampling the whole frame to a new (bigger) array and cropping it.
+(A plain cv2.resize of the window would have to snap it to whole pixels,
+which makes slow zooms judder.)
+"""
+import cv2
+import numpy as np
+
+
+class KenBurns:
+    """
+    Linear zoom from `zoom_from` to `zoom_to` over `duration` seconds.
+
+    `src` (HxWx3 or HxWx4 uint8) is scaled by the zoom factor and placed on a
+    `size` canvas like MoviePy's `clip.resize(lambda t: zoom)`:
+    anchor="center" keeps it centered, anchor="topleft" pins its corner at (0, 0).
+    """
+
+    def __init__(self, src, size, zoom_from=1.0, zoom_to=1.05, duration=1.0, anchor="center"):
+        h, w = src.shape[:2]
+        W, H = size
+        self.size = (W, H)
+        self.src_size = (w, h)
+        self.zoom_from = zoom_from
+        self.zoom_to = zoom_to
+        self.duration = duration
+        self.anchor = anchor
+
+        self.zoom_max = max(zoom_from, zoom_to, 1e-6)
+        master_size = (int(round(w * self.zoom_max)), int(round(h * self.zoom_max)))
+        interp = cv2.INTER_CUBIC if self.zoom_max > 1 else cv2.INTER_AREA
+        master = cv2.resize(np.ascontiguousarray(src), master_size, interpolation=interp)
+
+        # OpenCV's 4-channel warp is vectorised and ~2.5x faster than its
+        # 3-channel one, so RGB sources are warped as RGBX and converted back.
+        self.channels = src.shape[2]
+        if self.channels == 3:
+            master = cv2.cvtColor(master, cv2.COLOR_RGB2RGBA)
+            self.rgb = np.empty((H, W, 3), dtype=np.uint8)
+        self.master = master
+        self.buf = np.zeros((H, W, 4), dtype=np.uint8)
+
+    def zoom_at(self, t):
+        p = min(max(t / self.duration, 0.0), 1.0) if self.duration > 0 else 1.0
+        return self.zoom_from + (self.zoom_to - self.zoom_from) * p
+
+    def window(self, t):
+        """Crop window (x, y, w, h) in master pixels that fills the canvas at time t."""
+        zoom = self.zoom_at(t)
+        W, H = self.size
+        w, h = self.src_size
+        k = self.zoom_max / zoom
+        if self.anchor == "center":
+            x = (self.zoom_max * w / 2) - (W / 2) * k
+            y = (self.zoom_max * h / 2) - (H / 2) * k
+        else:
+            x, y = 0.0, 0.0
+        return x, y, W * k, H * k
+
+    def frame(self, t):
+        """Frame at time t, written into (and returned as) a reused buffer."""
+        x, y, ww, _ = self.window(t)
+        s = self.size[0] / ww
+        m = np.float32([[s, 0, -x * s], [0, s, -y * s]])
+        cv2.warpAffine(
+            self.master, m, self.size, dst=self.buf,
+            flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT, borderValue=0
+        )
+        if self.channels == 3:
+            return cv2.cvtColor(self.buf, cv2.COLOR_RGBA2RGB, dst=self.rgb)
+        return self.buf
+
+
+def ken_burns_clip(src, duration, zoom_from=1.0, zoom_to=1.05, anchor="center", size=None):
+    """MoviePy VideoClip of a KenBurns move (drop-in for `ImageClip(src).resize(lambda t: ...)`)."""
+    from moviepy.editor import VideoClip
+
+    src = np.asarray(src)
+    size = size or (src.shape[1], src.shape[0])
+    kb = KenBurns(src[:, :, :3], size, zoom_from, zoom_to, duration, anchor)
+    return VideoClip(kb.frame, duration=duration)
+
@@ -0,0 +1,91 @@
+"""
+Mask helpers for MoviePy clips.
+
+Masks that never change (circle crops, PiP borders, vignette distance fields)
+are computed once per size and served as the same read-only float32 array on
+every frame, instead of being rebuilt in float64 inside get_frame.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+
+def _frozen(arr):
+    arr.setflags(write=False)
+    return arr
+
+
+@lru_cache(maxsize=32)
+def radial_distance(w, h):
+    """Distance of every pixel from the center of a w x h frame (float32, cached)."""
+    y, x = np.ogrid[:h, :w]
+    return _frozen(np.sqrt((x - w / 2) ** 2 + (y - h / 2) ** 2).astype(np.float32))
+
+
+@lru_cache(maxsize=32)
+def circle_mask(w, h, feather=0):
+    """
+    Circle inscribed in a w x h frame as a float32 mask in [0, 1] (cached).
+    With `feather` > 0 the edge ramps linearly over 2 * feather pixels.
+    """
+    dist = radial_distance(w, h)
+    r = min(w, h) / 2
+
+    mask = (dist <= r).astype(np.float32)
+    if feather > 0:
+        edge = (dist > r - feather) & (dist < r + feather)
+        mask[edge] = (1 - (dist[edge] - (r - feather)) / (2 * feather)).clip(0, 1)
+    return _frozen(mask)
+
+
+def static_mask_clip(mask, duration):
+    """A mask clip that returns the same array for every t."""
+    from moviepy.editor import VideoClip
+
+    mask = np.asarray(mask, dtype=np.float32)
+    clip = VideoClip(lambda t: mask, ismask=True, duration=duration)
+    clip._static_mask = True
+    return clip
+
+
+def set_circle_mask(clip, feather=0):
+    """Give `clip` a constant circular mask matching its current size."""
+    w, h = clip.size
+    return clip.set_mask(static_mask_clip(circle_mask(w, h, feather), clip.duration))
+
+
+def freeze_if_constant(mask_clip):
+    """
+    Return a static float32 version of `mask_clip` if it is known to be
+    time-invariant, else the clip unchanged. Only ImageClip masks (constant by
+    construction) are frozen; other clips must be built with static_mask_clip().
+    """
+    from moviepy.editor import ImageClip
+
+    if getattr(mask_clip, "_static_mask", False) or not isinstance(mask_clip, ImageClip):
+        return mask_clip
+
+    return static_mask_clip(_frozen(np.array(mask_clip.img, dtype=np.float32)), mask_clip.duration)
+
+
+def freeze_mask(clip):
+    """`clip` with its mask replaced by a cached float32 frame when the mask never changes."""
+    if clip.mask is None:
+        return clip
+    return clip.set_mask(freeze_if_constant(clip.mask))
+
+
+def last_frame_memo(make_frame):
+    """
+    Wrap make_frame(t) so repeated calls for the same t reuse the last result.
+    Lets an RGB clip and its mask clip share one render per frame.
+    """
+    last = {"t": None, "frame": None}
+
+    def memo(t):
+        if last["t"] != t:
+            last["frame"] = make_frame(t)
+            last["t"] = t
+        return last["frame"]
+
+    return memo
@@ -1,3 +1,6 @@
+import json
+
+
 def build_educational_script_prompt(title: str) -> str:
     return f"""
 You are an expert educational storyteller and psychology researcher.
@@ -63,3 +66,34 @@ SCENE RULES:
 
 OUTPUT ONLY THE VALID JSON OBJECT. NO MARKDOWN. NO EXTRA TEXT.
 """
+
+
+def build_scene_repair_prompt(script_data: dict, broken: list) -> str:
+    """Re-prompt for the scenes at indices `broken` only; the rest of the script is kept."""
+    scenes = script_data["scenes"]
+    ids = [scenes[i].get("id", i + 1) if isinstance(scenes[i], dict) else i + 1 for i in broken]
+    broken_json = json.dumps([scenes[i] for i in broken], indent=2, ensure_ascii=False)
+    return f"""
+You are an expert AI Screenwriter and Director.
+Some scenes of a video script came back malformed. Fix ONLY these scenes.
+
+SCENES TO FIX (ids): {", ".join(str(i) for i in ids)}
+
+BROKEN SCENES:
+{broken_json}
+
+RULES:
+-   Keep each scene's "id" and its narration "text" unchanged (write the text if it is missing).
+-   "image_prompts": EXACTLY 3 distinct prompts, each starting with "cartoonish image of...".
+    Simple objects, clear composition, no text in images, no faces.
+-   "audio_delay": pause after the scene in seconds (0.5 to 2.0). "emotion": one word.
+
+STRICT JSON OUTPUT FORMAT:
+{{
+  "scenes": [
+    {{"id": 3, "text": "...", "image_prompts": ["...", "...", "..."], "audio_delay": 0.5, "emotion": "calm"}}
+  ]
+}}
+
+OUTPUT ONLY THE VALID JSON OBJECT. NO MARKDOWN. NO EXTRA TEXT.
+"""
@@ -1,142 +1,273 @@
 from PIL import Image, ImageDraw, ImageFont
 import textwrap
 import random
+import json
 import os
+from functools import lru_cache
+
+
+CAT_PATH = "static/img/cat-exc.png"
+BOX_PATH = "static/img/comment_box.png"
+FONT_PATH = "arial.ttf"
+
+# Font size search range (70% of the original 35pt)
+MAX_FONT_SIZE = int(35 * 0.70)  # ≈ 24
+MIN_FONT_SIZE = 13
+
+BOX_PADDING = 28   # reduced with size scaling
+MAX_LINES = 5
+
+# Black -> 0, anything brighter than 10 -> 255, per band (C lookup, no Python per pixel)
+VISIBLE_LUT = [255 if p > 10 else 0 for p in range(256)] * 3
 
 
 def crop_to_visible(img):
     """Auto-crop the black background around the speech bubble."""
     # Convert to RGB + get bounding box of non-black areas
-    bbox = img.convert("RGB").point(lambda p: 255 if p > 10 else 0).getbbox()
+    bbox = img.convert("RGB").point(VISIBLE_LUT).getbbox()
     if bbox:
         return img.crop(bbox)
     return img
 
 
-def create_clickbait_thumbnail(bg_path, cat_path, box_path, title, output_path):
-    """
-    FINAL VERSION:
-    - Comment box centered at top (10px gap), ±20px wiggle
-    - Box auto-cropped to remove black background (tail preserved)
-    - Text centered inside box
-    - Cat bottom aligned (10px gap)
-    """
-
-    # Load images
-    try:
-        background = Image.open(bg_path).convert("RGBA")
-        cat = Image.open(cat_path).convert("RGBA")
-        box_raw = Image.open(box_path).convert("RGBA")
-    except FileNotFoundError as e:
-        print("Error:", e)
-        return
-
-    # --- AUTO-CROP SPEECH BUBBLE (keep tail, remove black background) ---
-    box = crop_to_visible(box_raw)
+# ---------------------------
+# CACHED ASSETS (once per process)
+# ---------------------------
 
-    # --- Resize cat ---
-    target_cat_height = int(background.height * 0.90)
-    aspect = cat.width / cat.height
-    new_width = int(target_cat_height * aspect)
-    cat = cat.resize((new_width, target_cat_height), Image.Resampling.LANCZOS)
+@lru_cache(maxsize=None)
+def load_asset(path):
+    """Decoded RGBA asset. Shared: never draw on it."""
+    img = Image.open(path).convert("RGBA")
+    img.load()
+    return img
 
-    # Small rotation
-    angle = random.randint(-20, 20)
-    cat = cat.rotate(angle, expand=True, resample=Image.Resampling.BICUBIC)
 
-    # Random X position
-    pos_x = random.randint(-250, 250)
+@lru_cache(maxsize=None)
+def load_bubble(path):
+    """Speech bubble with the black surround cropped away (tail preserved)."""
+    return crop_to_visible(load_asset(path))
 
-    # Bottom align cat
-    pos_y = 10
 
-    # Paste cat
-    final_img = background.copy()
-    final_img.paste(cat, (pos_x, pos_y), cat)
+@lru_cache(maxsize=32)
+def resized_asset(path, size, bubble=False):
+    """LANCZOS-resized asset, cached by target size."""
+    src = load_bubble(path) if bubble else load_asset(path)
+    return src.resize(size, Image.Resampling.LANCZOS)
 
-    # ---------------------------
-    # COMMENT BOX 70% SIZE
-    # ---------------------------
 
-    max_box_width = int(background.width * 0.95)
-    base_width = int(background.width * 0.45)
+@lru_cache(maxsize=64)
+def load_font(path, size):
+    try:
+        return ImageFont.truetype(path, size)
+    except Exception:
+        return ImageFont.load_default()
 
-    # Previous = base_width * 3
-    # New = 70% of that
-    box_width = int(min(max_box_width, int(base_width * 3)) * 0.60)
 
-    box_aspect = box.width / box.height
-    box_height = int(box_width / box_aspect)
+_MEASURE = ImageDraw.Draw(Image.new("RGB", (1, 1)))
 
-    box_resized = box.resize((box_width, box_height), Image.Resampling.LANCZOS)
 
-    padding = 28   # reduced with size scaling
-    text_area_w = box_width - 2 * padding
-    text_area_h = box_height - 2 * padding
+def text_size(text, font):
+    return _MEASURE.multiline_textbbox((0, 0), text, font=font)[2:]
 
-    draw = ImageDraw.Draw(final_img)
 
-    # 70% font scaling
-    try:
-        font_path = "arial.ttf"
-        font_size = int(35 * 0.70)  # ≈ 24
-        font = ImageFont.truetype(font_path, font_size)
-    except:
-        font = ImageFont.load_default()
-
-    # Fit text to smaller bubble
-    wrapped = None
-    while font_size > 12:
-        try:
-            font = ImageFont.truetype(font_path, font_size)
-        except:
-            font = ImageFont.load_default()
-
-        wrapped = textwrap.wrap(title, width=30)
-        w, h = draw.multiline_textbbox((0, 0), "\n".join(wrapped), font=font)[2:]
-
-        if w <= text_area_w and h <= text_area_h:
-            break
-
-        font_size -= 1
-
-    if len(wrapped) > 5:
-        wrapped = wrapped[:5]
+def fit_title(title, area_w, area_h, font_path=FONT_PATH):
+    """
+    Largest font size in [MIN_FONT_SIZE, MAX_FONT_SIZE] whose wrapped title fits
+    the area, found by binary search. Returns (font, text).
+    """
+    wrapped = textwrap.wrap(title, width=30)
+    text = "\n".join(wrapped)
+
+    lo, hi = MIN_FONT_SIZE, MAX_FONT_SIZE
+    best = MIN_FONT_SIZE
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        w, h = text_size(text, load_font(font_path, mid))
+        if w <= area_w and h <= area_h:
+            best = mid
+            lo = mid + 1
+        else:
+            hi = mid - 1
+
+    if len(wrapped) > MAX_LINES:
+        wrapped = wrapped[:MAX_LINES]
         wrapped[-1] += "..."
 
-    final_text = "\n".join(wrapped)
+    return load_font(font_path, best), "\n".join(wrapped)
 
 
-    # ---------------------------
-    # POSITION BOX TOP-CENTER
-    # ---------------------------
+# ---------------------------
+# LAYOUT
+# ---------------------------
 
-    horizontal_wiggle = random.randint(-20, 20)
+class ThumbnailLayers:
+    """
+    Everything about a thumbnail that doesn't depend on the random layout:
+    resized cat, resized bubble and the fitted title for one background size.
+    """
 
-    box_x = (background.width - box_width) // 2 + horizontal_wiggle
-    box_y = 10  # 10px from top
+    def __init__(self, bg_size, title, cat_path=CAT_PATH, box_path=BOX_PATH, font_path=FONT_PATH):
+        bg_w, bg_h = bg_size
+        self.bg_size = bg_size
+
+        # --- Resize cat ---
+        cat = load_asset(cat_path)
+        target_cat_height = int(bg_h * 0.90)
+        aspect = cat.width / cat.height
+        self.cat = resized_asset(cat_path, (int(target_cat_height * aspect), target_cat_height))
+
+        # ---------------------------
+        # COMMENT BOX 70% SIZE
+        # ---------------------------
+        max_box_width = int(bg_w * 0.95)
+        base_width = int(bg_w * 0.45)
+
+        # Previous = base_width * 3
+        # New = 70% of that
+        box = load_bubble(box_path)
+        self.box_width = int(min(max_box_width, int(base_width * 3)) * 0.60)
+        self.box_height = int(self.box_width / (box.width / box.height))
+        self.box = resized_asset(box_path, (self.box_width, self.box_height), bubble=True)
+
+        # Fit text to smaller bubble
+        text_area_w = self.box_width - 2 * BOX_PADDING
+        text_area_h = self.box_height - 2 * BOX_PADDING
+        self.font, self.text = fit_title(title, text_area_w, text_area_h, font_path)
+        self.text_w, self.text_h = text_size(self.text, self.font)
+
+        # ---------------------------
+        # CENTER TEXT INSIDE BUBBLE
+        # ---------------------------
+        # The title never moves relative to the bubble, so it is drawn onto
+        # the bubble once and the pair is pasted as one layer.
+        self.bubble = self.box.copy()
+        text_x = (self.box_width - self.text_w) // 2
+        text_y = (self.box_height - self.text_h) // 2 - 16  # CENTERED
+        ImageDraw.Draw(self.bubble).multiline_text(
+            (text_x, text_y),
+            self.text,
+            font=self.font,
+            fill="black",
+            align="center"
+        )
+
+        self._cats = {}
+
+    def rotated_cat(self, angle):
+        """Cat rotated by `angle` degrees (cached per angle across variants)."""
+        cat = self._cats.get(angle)
+        if cat is None:
+            cat = self._cats[angle] = self.cat.rotate(angle, expand=True, resample=Image.Resampling.BICUBIC)
+        return cat
+
+    def with_cat(self, background, angle, pos_x):
+        """Copy of `background` with the cat (rotated by `angle`) pasted at x=`pos_x`."""
+        cat = self.rotated_cat(angle)
+
+        # Bottom align cat
+        pos_y = 10
+
+        img = background.copy()
+        img.paste(cat, (pos_x, pos_y), cat)
+        return img
+
+    def paste_bubble(self, img, wiggle):
+        """Paste the titled bubble, top-centered and shifted by `wiggle`, onto `img` in place."""
+        bg_w = self.bg_size[0]
+
+        # ---------------------------
+        # POSITION BOX TOP-CENTER
+        # ---------------------------
+        box_x = (bg_w - self.box_width) // 2 + wiggle
+        box_y = 10  # 10px from top
+
+        box_x = max(0, min(bg_w - self.box_width, box_x))
+
+        img.paste(self.bubble, (box_x, box_y), self.bubble)
+        return img
+
+    def compose(self, background, angle, pos_x, wiggle):
+        """Full thumbnail for one layout, on a copy of `background`."""
+        return self.paste_bubble(self.with_cat(background, angle, pos_x), wiggle)
+
+
+def random_layout(rng=random):
+    """Random cat rotation, cat x position and bubble wiggle."""
+    return {
+        "angle": rng.randint(-20, 20),
+        "pos_x": rng.randint(-250, 250),
+        "wiggle": rng.randint(-20, 20),
+    }
 
-    box_x = max(0, min(background.width - box_width, box_x))
 
-    final_img.paste(box_resized, (box_x, box_y), box_resized)
+def create_clickbait_thumbnail(bg_path, cat_path, box_path, title, output_path):
+    """
+    FINAL VERSION:
+    - Comment box centered at top (10px gap), ±20px wiggle
+    - Box auto-cropped to remove black background (tail preserved)
+    - Text centered inside box
+    - Cat bottom aligned (10px gap)
 
-    # ---------------------------
-    # CENTER TEXT INSIDE BUBBLE
-    # ---------------------------
-    text_w, text_h = draw.multiline_textbbox((0, 0), final_text, font=font)[2:]
+    Static assets are decoded, cropped and resized once per process and reused.
+    """
 
-    text_x = box_x + (box_width - text_w) // 2
-    text_y = box_y + (box_height - text_h) // 2 - 16  # CENTERED
+    # Load images
+    try:
+        background = Image.open(bg_path).convert("RGBA")
+        layers = ThumbnailLayers(background.size, title, cat_path, box_path)
+    except FileNotFoundError as e:
+        print("Error:", e)
+        return
 
-    draw.multiline_text(
-        (text_x, text_y),
-        final_text,
-        font=font,
-        fill="black",
-        align="center"
-    )
+    final_img = layers.compose(background, **random_layout())
 
     # Save final thumbnail
     final_img = final_img.convert("RGB")
     final_img.save(output_path, quality=95)
     print("Thumbnail saved:", output_path)
+    return output_path
+
+
+def render_thumbnail_variants(bg_path, title, seeds, output_dir, basename,
+                              cat_path=CAT_PATH, box_path=BOX_PATH):
+    """
+    Render one thumbnail per seed for A/B testing, from a single set of decoded
+    and resized layers, and write `<basename>_variants.json` describing them.
+
+    Each seed drives its own random.Random, so a variant can be reproduced
+    exactly from the manifest. Variants that land on the same cat angle reuse
+    the rotated cat.
+    """
+    try:
+        background = Image.open(bg_path).convert("RGBA")
+        layers = ThumbnailLayers(background.size, title, cat_path, box_path)
+    except FileNotFoundError as e:
+        print("Error:", e)
+        return None
+
+    os.makedirs(output_dir, exist_ok=True)
+    variants = []
+
+    for i, seed in enumerate(seeds, start=1):
+        params = random_layout(random.Random(seed))
+        img = layers.compose(background, **params)
+
+        path = os.path.join(output_dir, f"{basename}_v{i}.png")
+        img.convert("RGB").save(path, quality=95)
+        variants.append({"variant": i, "seed": seed, **params, "path": path})
+
+    manifest = {
+        "title": title,
+        "background": bg_path,
+        "cat": cat_path,
+        "box": box_path,
+        "font_size": getattr(layers.font, "size", None),
+        "text": layers.text,
+        "variants": variants,
+    }
+    manifest_path = os.path.join(output_dir, f"{basename}_variants.json")
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=4)
+
+    print(f"Saved {len(variants)} thumbnail variants + manifest: {manifest_path}")
+    return manifest
@@ -0,0 +1,132 @@
+"""
+Streaming concatenation of video files, for assembling long titles.
+
+concatenate_videoclips needs every clip open at once: one VideoFileClip per
+file, each an ffmpeg reader process with its own frame buffers, alive until
+the encode ends, so memory and file descriptors grow with the scene count.
+Timeline only probes the files up front (ffmpeg_parse_infos, which exits
+straight away) and, while frames are pulled, opens one FFmpegFrameReader at
+a time and closes it as soon as its segment is consumed.
+
+A Timeline looks like the clip write_with_pip_ffmpeg expects (size,
+duration, iter_frames). Like concatenate_videoclips(method="compose"),
+clips smaller than the largest one are centered on black.
+"""
+import wave
+import subprocess
+
+import numpy as np
+
+from scripts.ffmpeg_io import FFmpegFrameReader, get_ffmpeg_exe
+from scripts.frame_server import frame_count
+
+AUDIO_FPS = 44100
+AUDIO_CHUNK = 64 * 1024  # bytes of PCM read per pipe read
+
+
+class Segment:
+    """One file of the timeline: its probed size, duration and audio flag."""
+
+    def __init__(self, path):
+        from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+        infos = ffmpeg_parse_infos(path)
+        self.path = path
+        self.size = tuple(infos["video_size"])
+        self.duration = infos["duration"]
+        self.has_audio = infos["audio_found"]
+
+
+class Timeline:
+    """Files played back to back, read one at a time."""
+
+    def __init__(self, paths, fps=24):
+        self.fps = fps
+        self.segments = [Segment(p) for p in paths]
+        self.size = (max(s.size[0] for s in self.segments), max(s.size[1] for s in self.segments))
+        self.w, self.h = self.size
+        self.starts = np.cumsum([0.0] + [s.duration for s in self.segments]).tolist()
+        self.duration = self.starts[-1]
+        self.has_audio = any(s.has_audio for s in self.segments)
+        self.open_readers = 0
+        self.max_open_readers = 0
+
+    def _segment_frames(self, reader, segment, n_frames, canvas):
+        last = None
+        for _ in range(n_frames):
+            frame = reader.read_frame()
+            if frame is None:
+                # Short by a frame or two after resampling: hold the last one
+                frame = last if last is not None else np.zeros((segment.size[1], segment.size[0], 3), np.uint8)
+            last = frame
+            if canvas is None:
+                yield frame
+            else:
+                w, h = segment.size
+                x, y = (self.w - w) // 2, (self.h - h) // 2
+                canvas[y:y + h, x:x + w] = frame
+                yield canvas
+
+    def iter_frames(self, fps=None, dtype="uint8"):
+        """
+        Yield every frame of the timeline at `fps` (the timeline's own by default).
+        Arrays are reused: consume each frame before pulling the next one.
+        """
+        fps = fps or self.fps
+        for i, segment in enumerate(self.segments):
+            n_frames = frame_count(self.starts[i + 1], fps) - frame_count(self.starts[i], fps)
+            if n_frames <= 0:
+                continue
+            canvas = np.zeros((self.h, self.w, 3), np.uint8) if segment.size != self.size else None
+            reader = FFmpegFrameReader(segment.path, segment.size, pix_fmt="rgb24", fps=fps)
+            self.open_readers += 1
+            self.max_open_readers = max(self.max_open_readers, self.open_readers)
+            try:
+                yield from self._segment_frames(reader, segment, n_frames, canvas)
+            finally:
+                reader.close()
+                self.open_readers -= 1
+
+    def write_audio(self, path, fps=AUDIO_FPS):
+        """
+        Concatenate the segments' audio into a 16-bit stereo WAV at `path`,
+        one decoder at a time; segments without audio become silence.
+        """
+        written = 0
+        with wave.open(path, "wb") as out:
+            out.setnchannels(2)
+            out.setsampwidth(2)
+            out.setframerate(fps)
+            for i, segment in enumerate(self.segments):
+                # Sample positions come from the running start times, so rounding never drifts
+                target = round(self.starts[i + 1] * fps)
+                if segment.has_audio:
+                    written += self._decode_audio(segment, out, fps, target - written)
+                if target > written:
+                    out.writeframes(bytes(4 * (target - written)))
+                    written = target
+        return path
+
+    def _decode_audio(self, segment, out, fps, max_samples):
+        """Append at most `max_samples` of the segment's audio to `out`; return how many were written."""
+        cmd = [get_ffmpeg_exe(), "-loglevel", "error", "-i", segment.path, "-vn",
+               "-f", "s16le", "-ac", "2", "-ar", str(fps), "-"]
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        max_samples = max(max_samples, 0)
+        remaining = 4 * max_samples
+        try:
+            while remaining > 0:
+                chunk = proc.stdout.read(min(AUDIO_CHUNK, remaining))
+                if not chunk:
+                    break
+                out.writeframes(chunk)
+                remaining -= len(chunk)
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+            proc.stdout.close()
+            proc.wait()
+        return max_samples - remaining // 4
+
+    def close(self):
+        """Nothing stays open between iter_frames calls; kept for the clip interface."""
@@ -1,179 +1,350 @@
-import numpy as np
-import cv2
+"""
+Frame effect library.
+
+Every effect is a class registered under a name. Per-clip work (easing
+constants, blurred masks, lookup tables) happens once in __init__;
+apply(frame, t, out) then does the per-frame work in uint8 and writes into
+the caller's `out` buffer (same size as `frame`, never the same array).
+A caller that reuses `out` must consume each result before the next apply().
+
+    effect = make_effect("zoom_in_center", (1920, 1080), duration)
+    effect.apply(frame, t, out)
+
+The old `name(frame, t, duration)` functions are kept as thin wrappers.
+"""
 import math
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+EFFECTS = {}
+
+LEVELS = np.arange(256, dtype=np.float32)
+
+# Pixel amounts below are tuned for 1920-wide frames and scaled for other sizes
+REFERENCE_WIDTH = 1920
+
+
+def register(name):
+    def wrap(cls):
+        cls.name = name
+        EFFECTS[name] = cls
+        return cls
+    return wrap
+
+
+def make_effect(name, size, duration):
+    """Instantiate effect `name` for frames of `size` (w, h) over `duration` seconds."""
+    if name not in EFFECTS:
+        raise ValueError(f"Unknown effect '{name}'. Available: {', '.join(EFFECTS)}")
+    return EFFECTS[name](size, duration)
+
+
+def apply_clip_effect(clip, name):
+    """
+    Apply effect `name` to every frame of a MoviePy clip (mask untouched).
+    MoviePy callers may hold on to a frame (memoized frames, composites), so
+    each frame gets its own array; reusable buffers are for frame-server callers.
+    """
+    effect = make_effect(name, clip.size, clip.duration)
+
+    def apply(get_frame, t):
+        return effect.apply(get_frame(t), t, np.empty((clip.h, clip.w, 3), dtype=np.uint8))
+
+    return clip.fl(apply)
+
 
 # Smooth easing
 def ease_in_out(t, duration):
     x = t / duration
     return x * x * (3 - 2 * x)
 
+
+def _lut(values):
+    return np.clip(values, 0, 255).astype(np.uint8)
+
+
+class FrameEffect:
+    name = None
+
+    def __init__(self, size, duration):
+        self.w, self.h = size
+        self.duration = duration
+        self.px = self.w / REFERENCE_WIDTH
+
+    def apply(self, frame, t, out):
+        raise NotImplementedError
+
+
+class CropEffect(FrameEffect):
+    """Effects that show a moving window of the frame, scaled back to full size."""
+
+    def window(self, t):
+        """Return (x1, y1, crop_w, crop_h) for time t."""
+        raise NotImplementedError
+
+    def apply(self, frame, t, out):
+        x1, y1, cw, ch = self.window(t)
+        cv2.resize(frame[y1:y1 + ch, x1:x1 + cw], (self.w, self.h), dst=out, interpolation=cv2.INTER_LINEAR)
+        return out
+
+
+class ChannelLUTEffect(FrameEffect):
+    """Per-channel lookup tables, cached by the (integer) amount they depend on."""
+
+    def __init__(self, size, duration):
+        super().__init__(size, duration)
+        self._luts = {}
+
+    def amount(self, t):
+        raise NotImplementedError
+
+    def build_lut(self, amount):
+        raise NotImplementedError
+
+    def apply(self, frame, t, out):
+        amount = self.amount(t)
+        lut = self._luts.get(amount)
+        if lut is None:
+            lut = self._luts[amount] = self.build_lut(amount)
+        cv2.LUT(frame, lut, dst=out)
+        return out
+
+
 ##############################################
 # 1. PAN LEFT → RIGHT
 ##############################################
-def pan_left_right(frame, t, duration):
-    h, w = frame.shape[:2]
-    p = ease_in_out(t, duration)
-    shift = int(p * (w * 0.10))
-    return frame[:, shift:w]
+@register("pan_left_right")
+class PanLeftRight(CropEffect):
+    def window(self, t):
+        shift = int(ease_in_out(t, self.duration) * (self.w * 0.10))
+        return shift, 0, self.w - shift, self.h
 
 
 ##############################################
 # 2. PAN RIGHT → LEFT
 ##############################################
-def pan_right_left(frame, t, duration):
-    h, w = frame.shape[:2]
-    p = ease_in_out(t, duration)
-    shift = int(p * (w * 0.10))
-    return frame[:, 0:w-shift]
+@register("pan_right_left")
+class PanRightLeft(CropEffect):
+    def window(self, t):
+        shift = int(ease_in_out(t, self.duration) * (self.w * 0.10))
+        return 0, 0, self.w - shift, self.h
 
 
 ##############################################
 # 3. PAN UP → DOWN
 ##############################################
-def pan_up_down(frame, t, duration):
-    h, w = frame.shape[:2]
-    p = ease_in_out(t, duration)
-    shift = int(p * (h * 0.10))
-    return frame[shift:h, :]
+@register("pan_up_down")
+class PanUpDown(CropEffect):
+    def window(self, t):
+        shift = int(ease_in_out(t, self.duration) * (self.h * 0.10))
+        return 0, shift, self.w, self.h - shift
 
 
 ##############################################
 # 4. PAN DOWN → UP
 ##############################################
-def pan_down_up(frame, t, duration):
-    h, w = frame.shape[:2]
-    p = ease_in_out(t, duration)
-    shift = int(p * (h * 0.10))
-    return frame[0:h-shift, :]
-
-
-##############################################
-# 5. ZOOM IN (Centered)
-##############################################
-def zoom_in_center(frame, t, duration):
-    h, w = frame.shape[:2]
-    p = ease_in_out(t, duration)
-
-    zoom = 1 + p * 0.07  # 7% zoom stable
-    crop_w = int(w / zoom)
-    crop_h = int(h / zoom)
-
-    x1 = (w - crop_w) // 2
-    y1 = (h - crop_h) // 2
-
-    return frame[y1:y1+crop_h, x1:x1+crop_w]
+@register("pan_down_up")
+class PanDownUp(CropEffect):
+    def window(self, t):
+        shift = int(ease_in_out(t, self.duration) * (self.h * 0.10))
+        return 0, 0, self.w, self.h - shift
 
 
 ##############################################
-# 6. ZOOM IN TOP
+# 5-7. ZOOM IN (Centered / Top / Bottom)
 ##############################################
-def zoom_in_top(frame, t, duration):
-    h, w = frame.shape[:2]
-    p = ease_in_out(t, duration)
+class ZoomIn(CropEffect):
+    align = "center"
 
-    zoom = 1 + p * 0.07
-    crop_w = int(w / zoom)
-    crop_h = int(h / zoom)
+    def window(self, t):
+        zoom = 1 + ease_in_out(t, self.duration) * 0.07  # 7% zoom stable
+        crop_w = int(self.w / zoom)
+        crop_h = int(self.h / zoom)
+        x1 = (self.w - crop_w) // 2
+        if self.align == "top":
+            y1 = 0
+        elif self.align == "bottom":
+            y1 = self.h - crop_h
+        else:
+            y1 = (self.h - crop_h) // 2
+        return x1, y1, crop_w, crop_h
 
-    x1 = (w - crop_w) // 2
-    y1 = 0
 
-    return frame[y1:y1+crop_h, x1:x1+crop_w]
+@register("zoom_in_center")
+class ZoomInCenter(ZoomIn):
+    align = "center"
 
 
-##############################################
-# 7. ZOOM IN BOTTOM
-##############################################
-def zoom_in_bottom(frame, t, duration):
-    h, w = frame.shape[:2]
-    p = ease_in_out(t, duration)
-
-    zoom = 1 + p * 0.07
-    crop_w = int(w / zoom)
-    crop_h = int(h / zoom)
+@register("zoom_in_top")
+class ZoomInTop(ZoomIn):
+    align = "top"
 
-    x1 = (w - crop_w) // 2
-    y1 = h - crop_h
 
-    return frame[y1:h, x1:x1+crop_w]
+@register("zoom_in_bottom")
+class ZoomInBottom(ZoomIn):
+    align = "bottom"
 
 
 ##############################################
 # 8. Slight Rotation
 ##############################################
-def slight_rotation(frame, t, duration):
-    angle = ease_in_out(t, duration) * 2  # max 2 degrees
-    h, w = frame.shape[:2]
-
-    m = cv2.getRotationMatrix2D((w//2, h//2), angle, 1)
-    return cv2.warpAffine(frame, m, (w, h), borderMode=cv2.BORDER_REPLICATE)
+@register("slight_rotation")
+class SlightRotation(FrameEffect):
+    def __init__(self, size, duration):
+        super().__init__(size, duration)
+        self.center = (self.w // 2, self.h // 2)
+        # OpenCV warps 4-channel images much faster than 3-channel ones
+        self.src4 = np.empty((self.h, self.w, 4), dtype=np.uint8)
+        self.dst4 = np.empty((self.h, self.w, 4), dtype=np.uint8)
+
+    def apply(self, frame, t, out):
+        angle = ease_in_out(t, self.duration) * 2  # max 2 degrees
+        m = cv2.getRotationMatrix2D(self.center, angle, 1)
+        cv2.cvtColor(frame, cv2.COLOR_RGB2RGBA, dst=self.src4)
+        cv2.warpAffine(self.src4, m, (self.w, self.h), dst=self.dst4, borderMode=cv2.BORDER_REPLICATE)
+        cv2.cvtColor(self.dst4, cv2.COLOR_RGBA2RGB, dst=out)
+        return out
 
 
 ##############################################
 # 9. Tilt (horizontal)
 ##############################################
-def subtle_tilt(frame, t, duration):
-    h, w = frame.shape[:2]
-    shift = int(math.sin((t/duration) * math.pi) * 5)
-    m = np.float32([[1, 0, shift], [0, 1, 0]])
-    return cv2.warpAffine(frame, m, (w, h), borderMode=cv2.BORDER_REPLICATE)
+@register("subtle_tilt")
+class SubtleTilt(FrameEffect):
+    def apply(self, frame, t, out):
+        # Whole-pixel shift with edge replication: two slice copies, no warp
+        shift = int(math.sin((t / self.duration) * math.pi) * 5)
+        if shift > 0:
+            out[:, shift:] = frame[:, :self.w - shift]
+            out[:, :shift] = frame[:, :1]
+        elif shift < 0:
+            out[:, :shift] = frame[:, -shift:]
+            out[:, shift:] = frame[:, -1:]
+        else:
+            out[:] = frame
+        return out
 
 
 ##############################################
 # 10. Parallax Shift
 ##############################################
-def parallax_shift(frame, t, duration):
-    h, w = frame.shape[:2]
-    shift = int(ease_in_out(t, duration) * 12)
-    return frame[:, shift:w]
+@register("parallax_shift")
+class ParallaxShift(CropEffect):
+    def window(self, t):
+        shift = int(ease_in_out(t, self.duration) * 12 * self.px)
+        return shift, 0, self.w - shift, self.h
 
 
 ##############################################
 # 11. Brightness Pulse
 ##############################################
-def brightness_pulse(frame, t, duration):
-    amt = 15 * math.sin(2 * math.pi * (t / duration))
-    return np.clip(frame + amt, 0, 255).astype(np.uint8)
+@register("brightness_pulse")
+class BrightnessPulse(FrameEffect):
+    def __init__(self, size, duration):
+        super().__init__(size, duration)
+        self.lut = np.empty(256, dtype=np.uint8)
+
+    def apply(self, frame, t, out):
+        amt = 15 * math.sin(2 * math.pi * (t / self.duration))
+        np.copyto(self.lut, np.clip(LEVELS + amt, 0, 255), casting="unsafe")
+        cv2.LUT(frame, self.lut, dst=out)
+        return out
 
 
 ##############################################
 # 12. Contrast Wave
 ##############################################
-def contrast_wave(frame, t, duration):
-    factor = 1 + 0.08 * math.sin(2 * math.pi * (t / duration))
-    return np.clip((frame - 128) * factor + 128, 0, 255).astype(np.uint8)
+@register("contrast_wave")
+class ContrastWave(FrameEffect):
+    def __init__(self, size, duration):
+        super().__init__(size, duration)
+        self.lut = np.empty(256, dtype=np.uint8)
+
+    def apply(self, frame, t, out):
+        factor = 1 + 0.08 * math.sin(2 * math.pi * (t / self.duration))
+        np.copyto(self.lut, np.clip((LEVELS - 128) * factor + 128, 0, 255), casting="unsafe")
+        cv2.LUT(frame, self.lut, dst=out)
+        return out
 
 
 ##############################################
 # 13. Warm Light Glow
 ##############################################
-def warm_light_glow(frame, t, duration):
-    amt = int(20 * ease_in_out(t, duration))
-    glow = frame.copy().astype(float)
-    glow[:, :, 2] += amt
-    glow[:, :, 1] += amt // 2
-    return np.clip(glow, 0, 255).astype(np.uint8)
+@register("warm_light_glow")
+class WarmLightGlow(ChannelLUTEffect):
+    def amount(self, t):
+        return int(20 * ease_in_out(t, self.duration))
+
+    def build_lut(self, amt):
+        # RGB frames: lift red fully and green by half
+        return np.dstack([_lut(LEVELS + amt), _lut(LEVELS + amt // 2), _lut(LEVELS)])
 
 
 ##############################################
 # 14. Vignette Fade
 ##############################################
-def vignette_fade(frame, t, duration):
-    h, w = frame.shape[:2]
-    p = ease_in_out(t, duration)
-
-    mask = np.zeros((h, w), np.float32)
-    cv2.circle(mask, (w//2, h//2), min(h, w)//2, 1 - p*0.5, -1)
-    mask = cv2.GaussianBlur(mask, (201, 201), 0)
-
-    return (frame * mask[..., None]).astype(np.uint8)
+@register("vignette_fade")
+class VignetteFade(FrameEffect):
+    def __init__(self, size, duration):
+        super().__init__(size, duration)
+        # The circle's fill value only scales the blurred mask, so blur a
+        # unit circle once and scale it per frame.
+        mask = np.zeros((self.h, self.w), np.float32)
+        cv2.circle(mask, (self.w // 2, self.h // 2), min(self.h, self.w) // 2, 1, -1)
+        k = int(201 * self.px) | 1  # odd kernel
+        mask = cv2.GaussianBlur(mask, (k, k), 0)
+        self.mask = cv2.merge([mask, mask, mask])
+
+    def apply(self, frame, t, out):
+        p = ease_in_out(t, self.duration)
+        cv2.multiply(frame, self.mask, dst=out, scale=1 - p * 0.5, dtype=cv2.CV_8U)
+        return out
 
 
 ##############################################
 # 15. Subtle Color Shift
 ##############################################
-def subtle_color_shift(frame, t, duration):
-    shift = int(10 * math.sin(2 * math.pi * (t / duration)))
-    frame = frame.astype(np.int32)
-    frame[:, :, 2] = np.clip(frame[:, :, 2] + shift, 0, 255)
-    return frame.astype(np.uint8)
+@register("subtle_color_shift")
+class SubtleColorShift(ChannelLUTEffect):
+    def amount(self, t):
+        return int(10 * math.sin(2 * math.pi * (t / self.duration)))
+
+    def build_lut(self, shift):
+        return np.dstack([_lut(LEVELS), _lut(LEVELS), _lut(LEVELS + shift)])
+
+
+EFFECT_NAMES = list(EFFECTS)
+
+
+# ----------------------------------------------
+# Legacy function API: name(frame, t, duration)
+# ----------------------------------------------
+_cached_effect = lru_cache(maxsize=16)(make_effect)
+
+
+def _legacy(name):
+    def effect_fn(frame, t, duration):
+        h, w = frame.shape[:2]
+        effect = _cached_effect(name, (w, h), duration)
+        return effect.apply(frame, t, np.empty_like(frame))
+    effect_fn.__name__ = name
+    return effect_fn
+
+
+pan_left_right = _legacy("pan_left_right")
+pan_right_left = _legacy("pan_right_left")
+pan_up_down = _legacy("pan_up_down")
+pan_down_up = _legacy("pan_down_up")
+zoom_in_center = _legacy("zoom_in_center")
+zoom_in_top = _legacy("zoom_in_top")
+zoom_in_bottom = _legacy("zoom_in_bottom")
+slight_rotation = _legacy("slight_rotation")
+subtle_tilt = _legacy("subtle_tilt")
+parallax_shift = _legacy("parallax_shift")
+brightness_pulse = _legacy("brightness_pulse")
+contrast_wave = _legacy("contrast_wave")
+warm_light_glow = _legacy("warm_light_glow")
+vignette_fade = _legacy("vignette_fade")
+subtle_color_shift = _legacy("subtle_color_shift")
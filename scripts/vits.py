@@ -1,6 +1,5 @@
 import os
 import time
-from TTS.api import TTS
 from pydub import AudioSegment
 
 # ---------- CONFIG ----------
@@ -44,8 +43,17 @@ EMOTION_PRESETS = {
 
 # ----------------------------
 
-print(f"🎙️ Loading model: {MODEL_NAME}")
-tts = TTS(model_name=MODEL_NAME, progress_bar=False, gpu=False)
+_tts = None
+
+
+def get_tts():
+    """Load the VITS model on first use (importing this module stays cheap)."""
+    global _tts
+    if _tts is None:
+        from TTS.api import TTS
+        print(f"🎙️ Loading model: {MODEL_NAME}")
+        _tts = TTS(model_name=MODEL_NAME, progress_bar=False, gpu=False)
+    return _tts
 
 
 def generate_tts_audio(text: str, output_path: str, emotion: str = "calm") -> str:
@@ -58,6 +66,8 @@ def generate_tts_audio(text: str, output_path: str, emotion: str = "calm") -> st
     # Choose emotion preset or fallback to calm
     preset = EMOTION_PRESETS.get(emotion, EMOTION_PRESETS["calm"])
 
+    tts = get_tts()
+
     try:
         tts.tts_to_file(
         text=text,
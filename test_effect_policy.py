@@ -0,0 +1,71 @@
+import os
+import sys
+import json
+
+from PIL import Image, ImageDraw, ImageFilter
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import scripts.interactive_clip as ic
+from scripts.effect_policy import FULL_FRAME_EFFECT, choose_effect, cutout_features, run_auto_processor
+
+
+def cutout(box, size=(640, 360)):
+    fg = Image.new("RGBA", size)
+    ImageDraw.Draw(fg).rectangle(box, fill=(255, 0, 0, 255))
+    return fg
+
+
+def test_rules_follow_cutout_features():
+    assert cutout_features(cutout((280, 130, 359, 229))) == {"fg_ratio": 0.0347, "fg_offset": 0.0}
+    assert cutout_features(cutout((0, 0, 159, 359)))["fg_offset"] == -0.375
+
+    assert choose_effect({"fg_ratio": 0.0, "fg_offset": 0.0}) == ("0", FULL_FRAME_EFFECT, "no clean cutout")
+    assert choose_effect({"fg_ratio": 0.08, "fg_offset": 0.3})[2] == "small subject"
+    assert choose_effect({"fg_ratio": 0.25, "fg_offset": -0.3})[:2] == ("2", None)
+    assert choose_effect({"fg_ratio": 0.6, "fg_offset": 0.0})[2] == "large subject"
+    # Neighboring "plain" scenes get different effects
+    plain = {"fg_ratio": 0.25, "fg_offset": 0.0}
+    assert choose_effect(plain, 0)[0] != choose_effect(plain, 1)[0]
+
+
+def test_auto_processor_picks_top_ranked_image_and_renders(monkeypatch, tmp_path):
+    tmp = str(tmp_path)
+    scenes = []
+    for sid in (1, 2, 3):
+        folder = os.path.join(tmp, "images", f"scene_{sid}")
+        os.makedirs(folder)
+        img = Image.new("RGB", (640, 360), "white")
+        ImageDraw.Draw(img).text((20, 20), "sharp edges " * 8, fill="black")
+        img.filter(ImageFilter.GaussianBlur(4)).save(os.path.join(folder, "img_1.png"))
+        img.save(os.path.join(folder, "img_2.png"))
+        scenes.append({"id": sid, "image_path": os.path.join(folder, "img_1.png"), "audio_path": "a.wav",
+                       "output_path": os.path.join(tmp, f"scene_{sid}.mp4"), "audio_text": "", "audio_delay": 0.5})
+
+    # Scene 1: no subject found, 2: small subject, 3: medium centered subject
+    boxes = {1: None, 2: (270, 130, 389, 229), 3: (220, 60, 419, 299)}
+    rendered = []
+
+    def extract(path):
+        sid = int(os.path.basename(os.path.dirname(path)).split("_")[1])
+        fg = cutout(boxes[sid]) if boxes[sid] else Image.new("RGBA", (640, 360))
+        return fg, Image.open(path), Image.open(path)
+
+    def render(fg, bg, choice, audio_path, output_path, audio_text="", audio_delay=0.5, finish=None):
+        rendered.append((os.path.basename(output_path), choice))
+        open(output_path, "w").close()
+        return True
+
+    monkeypatch.setattr(ic, "extract_layers", extract)
+    monkeypatch.setattr(ic, "generate_single_clip_from_data", render)
+
+    policy_path = os.path.join(tmp, "policy.json")
+    decisions = run_auto_processor(scenes, policy_path=policy_path,
+                                   score_dir=os.path.join(tmp, "scores"))
+
+    assert all(d["image_path"].endswith("img_2.png") for d in decisions.values())
+    assert (decisions[1]["choice"], decisions[1]["finish"]) == ("0", FULL_FRAME_EFFECT)
+    assert decisions[2]["choice"] == "1" and decisions[3]["reason"] == "variety"
+    assert sorted(rendered) == [("scene_2.mp4", "1"), ("scene_3.mp4", decisions[3]["choice"])]
+    assert decisions[2]["rendered"] and "rendered" not in decisions[1]
+    assert [d["id"] for d in json.load(open(policy_path))] == [1, 2, 3]
@@ -0,0 +1,92 @@
+import os
+import sys
+import shutil
+import subprocess
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from moviepy.editor import VideoFileClip
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+import scripts.timeline as timeline
+from scripts.ffmpeg_io import FFmpegFrameReader, get_ffmpeg_exe
+from scripts.instrument import _rss_mb
+from run_pipeline.generate_final_video import generate_final_video
+
+N_SCENES = 500
+SCENE_SECONDS = 0.25
+SIZE = (320, 180)
+MAX_RSS_GROWTH_MB = 25  # between the 50th and the last scene; readers opened up front grow by ~MBs each
+
+
+def make_clip(path, source, seconds, size=SIZE, audio=False):
+    cmd = [get_ffmpeg_exe(), "-y", "-loglevel", "error",
+           "-f", "lavfi", "-i", f"{source}=s={size[0]}x{size[1]}:r=24:d={seconds}"]
+    if audio:
+        cmd += ["-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}", "-c:a", "aac"]
+    cmd += ["-c:v", "libx264", "-pix_fmt", "yuv420p", "-shortest", path]
+    subprocess.run(cmd, check=True)
+
+
+def make_title(base_dir, n_scenes, intro_size=SIZE):
+    """outputs-style tree under `base_dir`: n copies of one scene clip and an intro carrying its own audio."""
+    base_dir = str(base_dir)
+    clips_dir = os.path.join(base_dir, "clips", "1")
+    os.makedirs(clips_dir)
+    make_clip(os.path.join(clips_dir, "intro.mp4"), "smptebars", 1.0, size=intro_size, audio=True)
+    source = os.path.join(base_dir, "scene.mp4")
+    make_clip(source, "testsrc", SCENE_SECONDS)
+    for i in range(1, n_scenes + 1):
+        shutil.copy(source, os.path.join(clips_dir, f"scene_{i}.mp4"))
+    return base_dir
+
+
+def test_streamed_assembly_of_500_scenes_keeps_memory_flat(monkeypatch, tmp_path):
+    base_dir = make_title(tmp_path, N_SCENES)
+    opened = []
+
+    class CountingReader(FFmpegFrameReader):
+        live = 0
+
+        def __init__(self, *args, **kwargs):
+            assert CountingReader.live == 0, "a previous clip reader is still open"
+            CountingReader.live += 1
+            opened.append(_rss_mb())
+            super().__init__(*args, **kwargs)
+
+        def close(self):
+            super().close()
+            CountingReader.live -= 1
+
+    monkeypatch.setattr(timeline, "FFmpegFrameReader", CountingReader)
+
+    output = generate_final_video(os.path.join(base_dir, "script_1.json"), base_dir=base_dir)
+
+    assert len(opened) == N_SCENES + 1 and CountingReader.live == 0
+    assert opened[-1] - opened[50] < MAX_RSS_GROWTH_MB
+
+    infos = ffmpeg_parse_infos(output)
+    assert abs(infos["duration"] - (1.0 + N_SCENES * SCENE_SECONDS)) < 0.2
+    assert infos["audio_found"]
+
+
+def test_streamed_matches_compose(tmp_path):
+    base_dir = make_title(tmp_path, 3, intro_size=(160, 90))
+    script = os.path.join(base_dir, "script_1.json")
+    composed = generate_final_video(script, base_dir=base_dir, assembly="compose")
+    composed = shutil.move(composed, os.path.join(base_dir, "composed.mp4"))
+    streamed = generate_final_video(script, base_dir=base_dir, assembly="stream")
+
+    a, b = VideoFileClip(composed, audio=False), VideoFileClip(streamed, audio=False)
+    try:
+        assert a.size == b.size == list(SIZE)
+        assert abs(a.duration - b.duration) < 0.1
+        # Intro (smaller, centered on black) and each scene
+        for t in (0.5, 1.1, 1.4, 1.6):
+            diff = np.abs(a.get_frame(t).astype(np.float32) - b.get_frame(t).astype(np.float32)).mean()
+            assert diff < 6.0, f"t={t}: mean diff {diff:.2f}"
+    finally:
+        a.close()
+        b.close()
@@ -0,0 +1,80 @@
+import os
+import sys
+import threading
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from moviepy.editor import ColorClip, CompositeVideoClip, ImageClip
+from scripts.frame_profiler import profile_render
+from scripts.frame_server import Compositor, Sprite, render_to_ffmpeg
+
+
+def test_moviepy_layers_are_sampled_and_unpatched(tmp_path):
+    bg = ColorClip((320, 180), (10, 20, 30)).set_duration(1)
+    caption = ImageClip(np.zeros((40, 200, 4), np.uint8), transparent=True).set_duration(1).set_position((60, 120))
+    comp = CompositeVideoClip([bg, caption], size=(320, 180))
+    out_dir = str(tmp_path)
+
+    with profile_render("clip", comp, sample_every=4, profile_dir=out_dir) as prof:
+        comp.write_videofile(os.path.join(out_dir, "clip.mp4"), fps=24, audio=False, logger=None)
+
+    assert prof.frames_seen == 24 and prof.frames_sampled == 6
+    stacks = {line.rsplit(" ", 1)[0] for line in open(os.path.join(out_dir, "clip.folded"))}
+    assert {"clip;layer0:ColorClip;make_frame", "clip;layer1:ImageClip;mask", "clip;ffmpeg_write"} <= stacks
+    # Instance overrides are gone once the block exits
+    assert "get_frame" not in vars(comp) and "blit_on" not in vars(caption)
+
+
+def test_frame_server_compositor_calls_are_profiled(tmp_path):
+    sprite = Sprite(np.full((20, 20, 4), 255, np.uint8))
+    out_dir = str(tmp_path)
+    blend = Compositor.blend
+
+    def draw(comp, t):
+        comp.clear()
+        comp.blend(sprite, 10, 10)
+        comp.blend(sprite, 50, 10)
+
+    with profile_render("fs", sample_every=1, profile_dir=out_dir) as prof:
+        render_to_ffmpeg(prof.wrap_draw(draw), 0.5, 24, (128, 72), os.path.join(out_dir, "fs.mp4"))
+
+    stacks = {line.rsplit(" ", 1)[0] for line in open(os.path.join(out_dir, "fs.folded"))}
+    assert {"fs;clear#1", "fs;blend#1", "fs;blend#2", "fs;ffmpeg_write"} <= stacks
+    assert Compositor.blend is blend
+
+
+def test_other_threads_and_overlapping_profiles_are_isolated(tmp_path):
+    sprite = Sprite(np.full((20, 20, 4), 255, np.uint8))
+    blend = Compositor.blend
+    entered, release = threading.Event(), threading.Event()
+
+    def other_render():
+        # Profiled on its own thread; exits while the main profile is still open
+        with profile_render("other", sample_every=1, profile_dir=str(tmp_path)) as other:
+            entered.set()
+            release.wait()
+            comp = Compositor((64, 36))
+            other.wrap_draw(lambda c, t: c.blend(sprite, 0, 0))(comp, 0)
+
+    def draw(comp, t):
+        comp.blend(sprite, 10, 10)
+        preview = threading.Thread(target=lambda: Compositor((64, 36)).blend(sprite, 0, 0))
+        preview.start()
+        preview.join()
+
+    with profile_render("fs", sample_every=1, profile_dir=str(tmp_path)) as prof:
+        worker = threading.Thread(target=other_render)
+        worker.start()
+        entered.wait()
+        prof.wrap_draw(draw)(Compositor((64, 36)), 0)
+        release.set()
+        worker.join()
+
+    fs = {line.rsplit(" ", 1)[0] for line in open(tmp_path / "fs.folded")}
+    other = {line.rsplit(" ", 1)[0] for line in open(tmp_path / "other.folded")}
+    # The preview thread's blend and the other profile's calls stay out of "fs"
+    assert "fs;blend#1" in fs and not any("#2" in s or "other" in s for s in fs)
+    assert "other;blend#1" in other and not any("#2" in s for s in other)
+    assert Compositor.blend is blend
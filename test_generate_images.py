@@ -0,0 +1,60 @@
+import os
+import sys
+import json
+
+from PIL import Image
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import run_pipeline.generate_images as gi
+
+
+def run_title(monkeypatch, tmp_path, clip_by_prompt, mode=gi.CANDIDATE_MODE, score_image=None):
+    tmp_path.mkdir(exist_ok=True)
+    monkeypatch.chdir(tmp_path)
+    script = {"title": "t", "scenes": [
+        {"id": 1, "text": "a fox", "image_prompts": ["good fox", "fox 2", "fox 3"]},
+        {"id": 2, "text": "a boat", "image_prompts": ["weak boat", "good boat", "boat 3"]},
+    ]}
+    with open("script_7.json", "w", encoding="utf-8") as f:
+        json.dump(script, f)
+
+    made = []
+    prompts = {}
+
+    def fake_generate(prompt, output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        Image.new("RGB", (64, 36)).save(output_path)
+        prompts[output_path] = prompt
+        made.append(prompt)
+        return output_path
+
+    monkeypatch.setattr(gi, "generate_image_from_prompt", fake_generate)
+    monkeypatch.setattr(gi, "score_image", score_image or (
+        lambda path, text: dict(sharpness=5.0, **clip_by_prompt(prompts[path]))))
+    monkeypatch.setattr(gi, "_score_error", None)
+    monkeypatch.setattr(gi.time, "sleep", lambda s: None)
+    gi.generate_images("script_7.json", mode=mode)
+    return made
+
+
+def test_sequential_stops_at_good_enough_candidate(monkeypatch, tmp_path):
+    made = run_title(monkeypatch, tmp_path, lambda p: {"clip": 0.3 if p.startswith("good") else 0.2})
+    assert made == ["good fox", "weak boat", "good boat"]
+
+
+def test_no_clip_score_generates_everything(monkeypatch, tmp_path):
+    made = run_title(monkeypatch, tmp_path, lambda p: {})
+    assert len(made) == 6
+    assert len(run_title(monkeypatch, tmp_path / "all", lambda p: {"clip": 0.9}, mode="all")) == 6
+
+
+def test_scoring_failure_generates_everything(monkeypatch, tmp_path):
+    calls = []
+
+    def broken(path, text):
+        calls.append(path)
+        raise ModuleNotFoundError("No module named 'cv2'")
+
+    assert len(run_title(monkeypatch, tmp_path, None, score_image=broken)) == 6
+    assert len(calls) == 1  # not retried for every image
@@ -0,0 +1,84 @@
+import os
+import sys
+
+from PIL import Image, ImageDraw, ImageFilter
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import scripts.image_scores as scores
+from scripts.image_scores import combine, rank_candidates
+
+
+def make_candidates(tmp):
+    img = Image.new("RGB", (640, 360), (230, 60, 40))
+    draw = ImageDraw.Draw(img)
+    for x in range(0, 640, 40):
+        draw.rectangle((x, 100, x + 19, 260), fill=(20, 40, 200))
+    paths = {
+        "blurred": img.filter(ImageFilter.GaussianBlur(6)),
+        "gray": img.convert("L").convert("RGB"),
+        "sharp": img,
+    }
+    for name, im in paths.items():
+        im.save(os.path.join(tmp, f"{name}.png"))
+    return [os.path.join(tmp, f"{name}.png") for name in paths]
+
+
+def test_quality_ranking_is_cached(monkeypatch, tmp_path):
+    tmp = str(tmp_path)
+    score_dir = os.path.join(tmp, "scores")
+    scene = {"id": 1, "candidates": make_candidates(tmp), "text": ""}
+
+    rank_candidates([scene], score_dir=score_dir)
+    assert [os.path.basename(p) for p in scene["candidates"]] == ["sharp.png", "gray.png", "blurred.png"]
+    assert scene["scores"][scene["candidates"][0]] > 0.99
+
+    # Cached: nothing is decoded again, and compute=False (the UI) sees the same ranking
+    monkeypatch.setattr(scores, "quality_metrics", lambda path: 1 / 0)
+    again = {"id": 1, "candidates": sorted(scene["candidates"]), "text": ""}
+    rank_candidates([again], compute=False, score_dir=score_dir)
+    assert again["candidates"] == scene["candidates"]
+
+    # Rewriting an image (new mtime) invalidates its cached metrics
+    st = os.stat(scene["candidates"][0])
+    os.utime(scene["candidates"][0], ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    rewritten = {"id": 1, "candidates": list(scene["candidates"]), "text": ""}
+    rank_candidates([rewritten], compute=False, score_dir=score_dir)
+    assert "scores" not in rewritten
+
+    # Unscored images keep their order when nothing may be computed
+    (tmp_path / "fresh").mkdir()
+    fresh = {"id": 2, "candidates": make_candidates(str(tmp_path / "fresh")), "text": ""}
+    os.remove(fresh["candidates"][2])
+    Image.new("RGB", (64, 36)).save(fresh["candidates"][2])
+    order = list(fresh["candidates"])
+    rank_candidates([fresh], compute=False, score_dir=score_dir)
+    assert fresh["candidates"] == order and "scores" not in fresh
+
+
+def test_clip_relevance_dominates_and_is_keyed_by_text(monkeypatch, tmp_path):
+    tmp = str(tmp_path)
+    score_dir = os.path.join(tmp, "scores")
+    blurred, gray, sharp = make_candidates(tmp)
+    calls = []
+
+    def fake_clip(pairs):
+        calls.append(len(pairs))
+        return [0.35 if path == blurred else 0.2 for path, _ in pairs]
+
+    monkeypatch.setattr(scores, "clip_similarities", fake_clip)
+    scene = {"id": 1, "candidates": [sharp, gray, blurred], "text": "a red and blue fence"}
+    rank_candidates([scene], score_dir=score_dir)
+    assert scene["candidates"][0] == blurred  # relevant beats crisp
+    assert calls == [3]
+
+    rank_candidates([dict(scene)], score_dir=score_dir)
+    assert calls == [3]  # cached per text
+    rank_candidates([dict(scene, text="something else")], score_dir=score_dir)
+    assert calls == [3, 3]
+
+
+def test_combine_normalizes_within_scene():
+    combined = combine({"a": {"sharpness": 2.0, "clip": 0.3}, "b": {"sharpness": 4.0}, "c": {"sharpness": 3.0}})
+    assert combined == {"a": 0.0, "b": 1.0, "c": 0.5}  # clip is ignored: not every candidate has it
+    assert combine({"a": {"saturation": 0.4}, "b": {"saturation": 0.4}}) == {"a": 0.5, "b": 0.5}
@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+
+# Import-time budget: `python run.py --stage final` should start in about a second.
+IMPORT_BUDGET_S = 1.5
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Modules that must only load when a stage actually uses them.
+# (cv2 is not listed: moviepy.editor itself imports it for resizing.)
+HEAVY_MODULES = ["torch", "TTS", "diffusers", "transformers", "bark", "rembg", "tkinter", "google.genai"]
+
+# Importing these should stay cheap: models/toolkits load on first use
+PIPELINE_MODULES = [
+    "run",
+    "run_pipeline.generate_final_video",
+    "run_pipeline.generate_audios",
+    "run_pipeline.generate_images",
+    "run_pipeline.generate_script",
+    "scripts.interactive_clip",
+]
+
+PROBE = """
+import sys, time, importlib
+t0 = time.perf_counter()
+importlib.import_module({module!r})
+elapsed = time.perf_counter() - t0
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(elapsed)
+print(",".join(heavy))
+"""
+
+
+def probe_import(module):
+    """Import `module` in a fresh interpreter; return (seconds, heavy modules loaded)."""
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout.strip().splitlines()
+    elapsed = float(out[0])
+    heavy = [m for m in out[1].split(",") if m] if len(out) > 1 else []
+    return elapsed, heavy
+
+
+def test_pipeline_imports_are_lazy():
+    for module in PIPELINE_MODULES:
+        elapsed, heavy = probe_import(module)
+        print(f"{module}: {elapsed:.2f}s, heavy modules: {heavy or 'none'}")
+        assert not heavy, f"{module} eagerly imports {heavy}"
+
+
+def test_final_stage_import_budget():
+    elapsed_run, _ = probe_import("run")
+    elapsed_final, _ = probe_import("run_pipeline.generate_final_video")
+    total = elapsed_run + elapsed_final
+    print(f"run + generate_final_video import: {total:.2f}s (budget {IMPORT_BUDGET_S}s)")
+    assert total <= IMPORT_BUDGET_S, f"Startup for --stage final took {total:.2f}s"
+
+
+if __name__ == "__main__":
+    test_pipeline_imports_are_lazy()
+    test_final_stage_import_budget()
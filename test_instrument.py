@@ -0,0 +1,95 @@
+import os
+import sys
+import csv
+import json
+import time
+import threading
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from scripts import instrument
+from scripts.instrument import span, annotate, chrome_trace, start_run, write_report
+
+
+def test_spans_are_free_until_a_run_starts():
+    instrument._recorder = None
+    with span("tts", scene=1) as s:
+        s.add_output("missing.wav")
+        annotate(frames=3)
+    assert not instrument.enabled()
+
+
+def test_report_rows_nesting_and_trace(tmp_path):
+    out_dir = str(tmp_path)
+    wav = os.path.join(out_dir, "scene_2.wav")
+    with open(wav, "wb") as f:
+        f.write(b"x" * 1000)
+
+    start_run()
+    try:
+        with span("title", title="7"):
+            with span("audio"):
+                with span("tts", scene=2) as s:
+                    sum(i * i for i in range(100000))
+                    s.add_output(wav)
+                    annotate(render_s=0.5)
+        paths = write_report(report_dir=out_dir, trace=True, name="run")
+    finally:
+        instrument._recorder = None
+
+    with open(paths[0], encoding="utf-8") as f:
+        report = json.load(f)
+    rows = {row["name"]: row for row in report["spans"]}
+
+    # Children inherit the title; scene stays on the scene span
+    assert [r["name"] for r in report["spans"]] == ["title", "audio", "tts"]
+    assert rows["tts"]["title"] == "7" and rows["tts"]["scene"] == 2 and rows["tts"]["depth"] == 2
+    assert rows["tts"]["output_bytes"] == 1000 and rows["tts"]["render_s"] == 0.5
+    assert rows["title"]["wall_s"] >= rows["tts"]["wall_s"] > 0
+    assert report["summary"]["tts"]["count"] == 1
+
+    with open(paths[1], encoding="utf-8", newline="") as f:
+        assert [r["name"] for r in csv.DictReader(f)] == ["title", "audio", "tts"]
+
+    with open(paths[2], encoding="utf-8") as f:
+        events = json.load(f)["traceEvents"]
+    complete = [e for e in events if e["ph"] == "X"]
+    assert {e["name"] for e in complete} == {"title", "audio", "tts #2"}
+    assert all(isinstance(e["tid"], int) for e in events)
+
+
+def test_peak_rss_and_cpu_are_per_span():
+    def idle_worker():
+        with span("worker"):
+            time.sleep(0.2)
+
+    start_run()
+    try:
+        with span("heavy"):
+            block = np.ones(80 * 2 ** 20, dtype=np.uint8)  # 80 MB, touched
+            time.sleep(0.1)
+            del block
+        with span("light"):
+            worker = threading.Thread(target=idle_worker)
+            worker.start()
+            t_end = time.perf_counter() + 0.2
+            while time.perf_counter() < t_end:
+                pass  # main thread busy while the worker idles
+            worker.join()
+        rows = {row["name"]: row for row in instrument._recorder.rows()}
+    finally:
+        instrument._recorder = None
+
+    # A later span does not inherit an earlier span's peak
+    assert rows["heavy"]["peak_rss_mb"] - rows["light"]["peak_rss_mb"] > 50
+    assert rows["heavy"]["process_peak_rss_mb"] >= rows["heavy"]["peak_rss_mb"] - 1
+
+    # Worker spans count their own thread's CPU, not the busy main thread's
+    assert rows["worker"]["cpu_scope"] == "thread" and rows["worker"]["cpu_s"] < 0.05
+    assert rows["light"]["cpu_scope"] == "process" and rows["light"]["cpu_s"] > 0.1
+
+    # The worker span overlaps "light", so it gets its own trace track
+    tids = {e["name"]: e["tid"] for e in chrome_trace(list(rows.values()))["traceEvents"] if e["ph"] == "X"}
+    assert tids["heavy"] == tids["light"] != tids["worker"]
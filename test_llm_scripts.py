@@ -0,0 +1,156 @@
+import os
+import sys
+import json
+import time
+import asyncio
+
+import pytest
+
+# Ensure we can import from local scripts
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import run_pipeline.generate_script as gs
+from llm.clients import OfflineStubClient, CachedClient
+from llm.cache import ResponseCache, CacheMiss
+from llm.rate_limit import TokenBucket
+from llm.stream_parser import SceneStreamParser
+
+TITLES = [{"id": i, "title": f"Topic number {i}"} for i in range(1, 7)]
+
+
+def run_batch(client, out_dir, **kwargs):
+    """Run the async batch into the `out_dir` outputs dir; return (results, outputs dir)."""
+    out_dir = str(out_dir)
+    old_dir = gs.OUTPUT_DIR
+    gs.OUTPUT_DIR = out_dir
+    try:
+        results = asyncio.run(gs.generate_all_scripts_async(TITLES, client=client, **kwargs))
+    finally:
+        gs.OUTPUT_DIR = old_dir
+    return results, out_dir
+
+
+def test_concurrent_titles_are_bounded_and_saved(tmp_path):
+    client = OfflineStubClient(n_scenes=6, latency=0.05)
+    results, out_dir = run_batch(client, tmp_path, max_concurrency=3, requests_per_minute=60000, burst=100)
+
+    assert set(results) == {item["id"] for item in TITLES}
+    for title_id, path in results.items():
+        assert path == os.path.join(out_dir, "scripts", f"script_{title_id}.json")
+        with open(path, encoding="utf-8") as f:
+            assert len(json.load(f)["scenes"]) == 6
+
+    # Two calls per title; titles actually overlapped, but never more than allowed
+    assert client.calls == 2 * len(TITLES)
+    assert 1 < client.max_in_flight <= 3
+
+
+def test_api_errors_are_retried(monkeypatch, tmp_path):
+    monkeypatch.setattr(gs, "backoff_delay", lambda attempt: 0.0)
+    client = OfflineStubClient(fail_first=3)
+    results, _ = run_batch(client, tmp_path, max_concurrency=2, requests_per_minute=60000, burst=100)
+
+    assert all(results.values())
+    assert client.calls == 2 * len(TITLES) + 3
+
+
+def test_only_broken_scenes_are_reprompted(tmp_path):
+    client = OfflineStubClient(n_scenes=8, broken_ids={2, 5})
+    results, _ = run_batch(client, tmp_path, max_concurrency=1, requests_per_minute=60000, burst=100)
+
+    # Text + full scene JSON + one repair call, per title
+    assert client.calls == 3 * len(TITLES)
+    for path in results.values():
+        with open(path, encoding="utf-8") as f:
+            scenes = json.load(f)["scenes"]
+        assert [scene["id"] for scene in scenes] == list(range(1, 9))
+        assert all(len(scene["image_prompts"]) == 3 for scene in scenes)
+
+
+def test_token_bucket_paces_requests():
+    async def take(n):
+        bucket = TokenBucket(rate=50, capacity=1)
+        t0 = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(n)))
+        return time.monotonic() - t0
+
+    # First token is free, the other 5 arrive at 50/s
+    assert asyncio.run(take(6)) >= 0.09
+
+
+def test_cache_record_then_replay_offline(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    recorder = OfflineStubClient()
+    first, _ = run_batch(CachedClient(recorder, ResponseCache(cache_dir, mode="record")), tmp_path / "first",
+                         requests_per_minute=60000, burst=100)
+
+    # Replay never reaches the model; the scripts come out identical
+    silent = OfflineStubClient(fail_first=10 ** 6)
+    replay_cache = ResponseCache(cache_dir, mode="replay")
+    second, _ = run_batch(CachedClient(silent, replay_cache), tmp_path / "second", requests_per_minute=60000, burst=100)
+
+    assert silent.calls == 0
+    assert replay_cache.hits == recorder.calls
+    for title_id in first:
+        with open(first[title_id], encoding="utf-8") as a, open(second[title_id], encoding="utf-8") as b:
+            assert json.load(a) == json.load(b)
+
+
+def test_cache_replay_miss_and_ttl(tmp_path):
+    cache_dir = str(tmp_path)
+    stub = OfflineStubClient()
+
+    async def ask(cache, prompt):
+        return await CachedClient(stub, cache).generate(prompt)
+
+    with pytest.raises(CacheMiss):
+        asyncio.run(ask(ResponseCache(cache_dir, mode="replay"), 'topic: "never recorded"'))
+
+    asyncio.run(ask(ResponseCache(cache_dir, mode="record"), 'topic: "ttl"'))
+    asyncio.run(ask(ResponseCache(cache_dir, mode="record"), 'topic: "ttl"'))
+    assert stub.calls == 1
+    asyncio.run(ask(ResponseCache(cache_dir, mode="record", ttl=0), 'topic: "ttl"'))
+    assert stub.calls == 2
+
+
+def test_stream_parser_yields_scenes_as_they_close():
+    scenes = [
+        {"id": 1, "text": 'Braces { and } and "quotes" \\ inside', "image_prompts": ["a", "b", "c"], "meta": {"x": [1, {"y": 2}]}},
+        {"id": 2, "text": "Second", "image_prompts": ["d", "e", "f"]},
+        {"id": 3, "text": "Third", "image_prompts": ["g", "h", "i"]},
+    ]
+    body = json.dumps({"title": "T {not a scene}", "extra": [{"id": 99}], "scenes": scenes}, indent=2)
+    text = "```json\n" + body + "\n```"
+
+    parser = SceneStreamParser()
+    got = []
+    for i in range(0, len(text), 7):
+        got.extend(parser.feed(text[i:i + 7]))
+        if len(got) == 1:
+            # Scene 1 is out before the reply has finished
+            assert i + 7 < text.index('"id": 3')
+    assert got == scenes
+
+
+def test_on_scene_streams_scenes_from_generate_script_gemini(monkeypatch, tmp_path):
+    stub = OfflineStubClient(n_scenes=6, broken_ids={4})
+
+    def fake_generate(prompt, response_schema=None, attempt=0):
+        return asyncio.run(stub.generate(prompt))
+
+    def fake_stream(prompt, response_schema=None, attempt=0):
+        text = asyncio.run(stub.generate(prompt))
+        for i in range(0, len(text), 40):
+            yield text[i:i + 40]
+
+    monkeypatch.setattr(gs, "generate_script", fake_generate)
+    monkeypatch.setattr(gs, "generate_script_stream", fake_stream)
+    monkeypatch.setattr(gs, "OUTPUT_DIR", str(tmp_path))
+
+    seen = []
+    path = gs.generate_Script_Gemini("Streaming", 7, on_scene=lambda scene: seen.append(scene["id"]))
+
+    # Valid scenes arrive in stream order; the repaired scene 4 comes last
+    assert seen == [1, 2, 3, 5, 6, 4]
+    with open(path, encoding="utf-8") as f:
+        assert [scene["id"] for scene in json.load(f)["scenes"]] == list(range(1, 7))
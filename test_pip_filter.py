@@ -0,0 +1,73 @@
+import os
+import sys
+import numpy as np
+
+# Ensure we can import from local scripts
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from moviepy.editor import VideoClip, VideoFileClip
+from run_pipeline.generate_final_video import (
+    overlay_pip_moviepy, write_with_pip_ffmpeg,
+    PIP_SIZE, PIP_BORDER, PIP_MARGIN
+)
+
+# Mean absolute difference (0-255) allowed inside the PiP region.
+# Both paths go through libx264, so identical graphs still differ by a few levels.
+MAX_MEAN_DIFF = 6.0
+
+
+def make_gradient_base(w=640, h=360, duration=2.0):
+    """Synthetic moving gradient, so misplaced overlays show up in the diff."""
+    yy, xx = np.mgrid[:h, :w]
+
+    def make_frame(t):
+        frame = np.empty((h, w, 3), dtype=np.uint8)
+        frame[:, :, 0] = (xx * 255 // w + int(40 * t)) % 256
+        frame[:, :, 1] = yy * 255 // h
+        frame[:, :, 2] = 128
+        return frame
+
+    return VideoClip(make_frame, duration=duration)
+
+
+def read_frame(path, t):
+    clip = VideoFileClip(path, audio=False)
+    frame = clip.get_frame(t).astype(np.float32)
+    clip.close()
+    return frame
+
+
+def test_pip_filter_matches_moviepy(tmp_path):
+    base = make_gradient_base()
+    out_dir = str(tmp_path)
+    moviepy_path = os.path.join(out_dir, "pip_moviepy.mp4")
+    ffmpeg_path = os.path.join(out_dir, "pip_ffmpeg.mp4")
+
+    composite, pip = overlay_pip_moviepy(base)
+    composite.write_videofile(moviepy_path, fps=24, codec="libx264", audio=False, logger=None)
+    pip.close()
+
+    write_with_pip_ffmpeg(base, ffmpeg_path, 0.0, base.h, base.duration, fps=24)
+
+    # Region covering the border ring and the PiP itself
+    x0 = PIP_MARGIN - PIP_BORDER
+    y0 = base.h - PIP_MARGIN - PIP_SIZE - PIP_BORDER
+    side = PIP_SIZE + 2 * PIP_BORDER
+
+    for t in (0.25, 1.0, 1.75):
+        a = read_frame(moviepy_path, t)
+        b = read_frame(ffmpeg_path, t)
+        assert a.shape == b.shape
+
+        region_diff = np.abs(a[y0:y0 + side, x0:x0 + side] - b[y0:y0 + side, x0:x0 + side]).mean()
+        frame_diff = np.abs(a - b).mean()
+        print(f"t={t}: PiP region diff {region_diff:.2f}, full frame diff {frame_diff:.2f}")
+
+        assert region_diff <= MAX_MEAN_DIFF, f"PiP region differs too much at t={t}: {region_diff:.2f}"
+        assert frame_diff <= MAX_MEAN_DIFF, f"Frame differs too much at t={t}: {frame_diff:.2f}"
+
+    print(f"Done! Outputs in {out_dir}")
+
+
+if __name__ == "__main__":
+    test_pip_filter_matches_moviepy()
@@ -0,0 +1,128 @@
+import os
+import sys
+import time
+import threading
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import scripts.interactive_clip as ic
+from scripts.interactive_clip import ReviewPipeline, build_effect_frames_drawer, load_thumbnail, render_effect_preview
+from scripts.frame_server import Compositor
+
+
+@pytest.fixture
+def fake_work(monkeypatch):
+    """Slow stand-ins for extraction/rendering that record what ran, and when."""
+    log = []
+    lock = threading.Lock()
+
+    def extract(path):
+        time.sleep(0.1)
+        with lock:
+            log.append(("extracted", path))
+        return "fg", "bg", "orig"
+
+    def render(fg, bg, choice, audio_path, output_path, audio_text="", audio_delay=0.5, finish=None):
+        with lock:
+            log.append(("render", output_path, choice, finish))
+        time.sleep(0.1)
+        if choice == "0":
+            return False
+        with open(output_path, "w") as f:
+            f.write(choice)
+        return True
+
+    monkeypatch.setattr(ic, "extract_layers", extract)
+    monkeypatch.setattr(ic, "generate_single_clip_from_data", render)
+    return log
+
+
+def make_scenes(n, out_dir):
+    return [{"id": i, "audio_path": "a.wav", "output_path": os.path.join(out_dir, f"scene_{i}.mp4"),
+             "audio_text": "", "audio_delay": 0.5} for i in range(1, n + 1)]
+
+
+def test_picks_start_work_without_blocking(fake_work, tmp_path):
+    scenes = make_scenes(3, tmp_path)
+    pipeline = ReviewPipeline(scenes, render_workers=2)
+
+    t0 = time.perf_counter()
+    for scene in scenes:
+        pipeline.select_image(scene["id"], f"img_{scene['id']}.png")
+    pipeline.choose_effect(1, "2")
+    assert time.perf_counter() - t0 < 0.05  # the UI thread never waits
+    assert pipeline.status(1) == "🎬 rendering effect 2..."
+
+    pipeline.close()
+    # Scene 1's render waited for its own cutout only, not for every extraction
+    assert fake_work.index(("render", scenes[0]["output_path"], "2", None)) < fake_work.index(("extracted", "img_3.png"))
+    assert pipeline.results == {1: True}
+    assert pipeline.status(1) == "✅ clip ready" and pipeline.status(2) == "✂️ cutout ready"
+
+
+def test_changing_the_effect_rerenders_once_and_drops_stale_clips(fake_work, tmp_path):
+    scenes = make_scenes(1, tmp_path)
+    out = scenes[0]["output_path"]
+    pipeline = ReviewPipeline(scenes)
+    pipeline.select_image(1, "img.png")
+
+    pipeline.choose_effect(1, "3")
+    pipeline.choose_effect(1, "5")          # superseded before it ever runs
+    pipeline.choose_effect(1, "7", "grain")
+    pipeline.wait()
+    assert [e[2:] for e in fake_work if e[0] == "render"] == [("3", None), ("7", "grain")]
+    assert open(out).read() == "7"
+
+    # Re-picking what was rendered is a no-op; going back to Skip removes the clip
+    pipeline.choose_effect(1, "7", "grain")
+    pipeline.choose_effect(1, "0")
+    pipeline.close()
+    assert len([e for e in fake_work if e[0] == "render"]) == 3
+    assert not os.path.exists(out) and pipeline.status(1) == "⏭️ static clip"
+
+
+def test_preview_matches_downscaled_full_render():
+    yy, xx = np.mgrid[:1080, :1920]
+    bg = Image.fromarray(np.dstack([xx * 255 // 1920, yy * 255 // 1080, np.full_like(xx, 90)]).astype(np.uint8))
+    fg = Image.new("RGBA", (1920, 1080))
+    ImageDraw.Draw(fg).ellipse((700, 250, 1200, 950), fill=(240, 40, 40, 255))
+    text = "Pixel offsets and captions are scaled with the frame"
+
+    # Parallax, Floating, Move L/R move by fixed pixel amounts; parallax_shift and vignette_fade too
+    for choice, finish in (("2", None), ("3", "parallax_shift"), ("11", "vignette_fade")):
+        frames = render_effect_preview(fg, bg, choice, 2.0, text, finish=finish)
+        assert len(frames) == 16 and frames[0].shape == (270, 480, 3)
+
+        draw = build_effect_frames_drawer(fg, bg, choice, 2.0, (1920, 1080), text, finish)
+        comp = Compositor((1920, 1080))
+        for i in range(len(frames)):
+            draw(comp, i / 8)
+            small = np.array(Image.fromarray(comp.canvas).resize((480, 270), Image.Resampling.BOX))
+            # About one grey level on average (largest measured: ~1.0, vignette_fade)
+            assert np.abs(small.astype(int) - frames[i]).mean() < 1.25, (choice, finish, i)
+
+    assert render_effect_preview(fg, bg, "0", 2.0) is None
+
+
+def test_thumbnails_are_cached_by_content_and_height(monkeypatch, tmp_path):
+    tmp = str(tmp_path)
+    cache_dir = os.path.join(tmp, "thumbs")
+    a, b = os.path.join(tmp, "a.png"), os.path.join(tmp, "b.png")
+    Image.new("RGB", (1536, 864), (200, 30, 30)).save(a)
+    Image.new("RGB", (1536, 864), (200, 30, 30)).save(b)  # same content, other name
+
+    thumb = load_thumbnail(a, 180, cache_dir)
+    assert thumb.size == (320, 180)
+
+    decodes = []
+    real_open = Image.open
+    monkeypatch.setattr(Image, "open", lambda fp, *a, **k: decodes.append(fp) or real_open(fp, *a, **k))
+    assert load_thumbnail(b, 180, cache_dir).size == (320, 180)
+    assert decodes and all(str(fp).endswith("_180.jpg") for fp in decodes)  # served from the cache
+
+    assert load_thumbnail(a, 90, cache_dir).size == (160, 90)
+    assert len(os.listdir(os.path.join(cache_dir, os.listdir(cache_dir)[0]))) == 2
@@ -0,0 +1,158 @@
+import os
+import sys
+import json
+import random
+import textwrap
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import scripts.thumbnail as thumbnail
+import run_pipeline.generate_thumbnails as gt
+from scripts.thumbnail import (CAT_PATH, BOX_PATH, ThumbnailLayers, create_clickbait_thumbnail,
+                               fit_title, load_asset, load_bubble, render_thumbnail_variants)
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SHORT = "Cat finds the remote"
+LONG = ("Cat discovers that the remote control was hidden inside the couch all along, "
+        "and the whole family cannot believe what happened next at the vet on Tuesday")
+
+
+def reference_fit(title, area_w, area_h, font_path):
+    """The original shrink loop: one size down at a time from 24 until the title fits."""
+    draw = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+    font_size = int(35 * 0.70)
+    font = thumbnail.load_font(font_path, font_size)
+    while font_size > 12:
+        font = thumbnail.load_font(font_path, font_size)
+        wrapped = textwrap.wrap(title, width=30)
+        w, h = draw.multiline_textbbox((0, 0), "\n".join(wrapped), font=font)[2:]
+        if w <= area_w and h <= area_h:
+            break
+        font_size -= 1
+    if len(wrapped) > 5:
+        wrapped = wrapped[:5]
+        wrapped[-1] += "..."
+    return font.size, "\n".join(wrapped)
+
+
+def reference_thumbnail(bg_path, cat_path, box_path, title, output_path):
+    """The original create_clickbait_thumbnail, before the asset caches and layers."""
+    background = Image.open(bg_path).convert("RGBA")
+    cat = Image.open(cat_path).convert("RGBA")
+    box = thumbnail.crop_to_visible(Image.open(box_path).convert("RGBA"))
+
+    target_cat_height = int(background.height * 0.90)
+    cat = cat.resize((int(target_cat_height * cat.width / cat.height), target_cat_height), Image.Resampling.LANCZOS)
+    cat = cat.rotate(random.randint(-20, 20), expand=True, resample=Image.Resampling.BICUBIC)
+    final_img = background.copy()
+    final_img.paste(cat, (random.randint(-250, 250), 10), cat)
+
+    box_width = int(min(int(background.width * 0.95), int(background.width * 0.45) * 3) * 0.60)
+    box_height = int(box_width / (box.width / box.height))
+    box_resized = box.resize((box_width, box_height), Image.Resampling.LANCZOS)
+
+    draw = ImageDraw.Draw(final_img)
+    font_size, final_text = reference_fit(title, box_width - 56, box_height - 56, "arial.ttf")
+    font = thumbnail.load_font("arial.ttf", font_size)
+
+    box_x = (background.width - box_width) // 2 + random.randint(-20, 20)
+    box_x = max(0, min(background.width - box_width, box_x))
+    final_img.paste(box_resized, (box_x, 10), box_resized)
+
+    text_w, text_h = draw.multiline_textbbox((0, 0), final_text, font=font)[2:]
+    draw.multiline_text((box_x + (box_width - text_w) // 2, 10 + (box_height - text_h) // 2 - 16),
+                        final_text, font=font, fill="black", align="center")
+    final_img.convert("RGB").save(output_path, quality=95)
+
+
+def make_background(path, size=(1280, 720)):
+    yy, xx = np.mgrid[:size[1], :size[0]]
+    pixels = np.dstack([xx * 255 // size[0], yy * 255 // size[1], (xx + yy) % 256]).astype(np.uint8)
+    Image.fromarray(pixels).save(path)
+    return str(path)
+
+
+def asset_bytes(root=ROOT):
+    """The per-process cached cat and bubble, as loaded from `root`."""
+    return [img.tobytes() for img in (load_asset(os.path.join(root, CAT_PATH)), load_bubble(os.path.join(root, BOX_PATH)))]
+
+
+def test_fit_title_matches_shrink_loop(monkeypatch):
+    # No TrueType fonts here: Pillow's scalable default font makes the size matter
+    monkeypatch.setattr(thumbnail, "load_font", lambda path, size: ImageFont.load_default(size))
+    for title in (SHORT, LONG, LONG + " " + LONG):
+        for area in ((500, 200), (300, 120), (200, 60), (60, 20)):
+            font, text = fit_title(title, *area)
+            assert (font.size, text) == reference_fit(title, *area, "arial.ttf"), (title, area)
+
+
+def test_thumbnail_is_pixel_identical_to_original(tmp_path):
+    bg = make_background(tmp_path / "bg.png")
+    cat, box = os.path.join(ROOT, CAT_PATH), os.path.join(ROOT, BOX_PATH)
+    for seed, title in ((1, SHORT), (7, LONG)):
+        random.seed(seed)
+        reference_thumbnail(bg, cat, box, title, tmp_path / "old.png")
+        random.seed(seed)
+        create_clickbait_thumbnail(bg, cat, box, title, tmp_path / "new.png")
+        assert Image.open(tmp_path / "old.png").tobytes() == Image.open(tmp_path / "new.png").tobytes(), seed
+
+
+def test_compose_leaves_cached_assets_untouched(tmp_path):
+    background = Image.open(make_background(tmp_path / "bg.png")).convert("RGBA")
+    cat, box = os.path.join(ROOT, CAT_PATH), os.path.join(ROOT, BOX_PATH)
+    layers = ThumbnailLayers(background.size, SHORT, cat, box)
+    before = asset_bytes() + [layers.cat.tobytes(), layers.bubble.tobytes(), background.tobytes()]
+
+    first = layers.compose(background, 5, 100, 10)
+    layers.compose(background, -12, -200, -20)
+    again = ThumbnailLayers(background.size, LONG, cat, box).compose(background, 5, 100, 10)
+
+    assert asset_bytes() + [layers.cat.tobytes(), layers.bubble.tobytes(), background.tobytes()] == before
+    assert first.tobytes() != again.tobytes()  # different titles, same shared cat and bubble
+
+
+def test_generate_all_thumbnails_renders_every_title(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    os.symlink(os.path.join(ROOT, "static"), "static")
+    os.makedirs("outputs/thumbnails")
+    titles = [{"id": i, "title": t} for i, t in enumerate((SHORT, LONG, SHORT + "!"), start=1)]
+    for item in titles:
+        make_background(f"outputs/thumbnails/thumb_{item['id']}.png", size=(640, 360))
+    with open("titles.json", "w", encoding="utf-8") as f:
+        json.dump(titles, f)
+    cached = asset_bytes("")  # the relative paths generate_thumbnails uses
+
+    results = gt.generate_all_thumbnails("titles.json", max_workers=2)
+
+    assert results == {i: f"outputs/thumbnails/thumbnail_{i}.png" for i in (1, 2, 3)}
+    assert all(Image.open(path).size == (640, 360) for path in results.values())
+    # Titles rendered in this process reuse the same cached assets without drawing on them
+    for item in titles:
+        gt.generate_thumbnails(item["id"], item["title"])
+    assert asset_bytes("") == cached
+
+
+def test_variant_reproduces_from_manifest_seed(tmp_path):
+    bg = make_background(tmp_path / "bg.png")
+    cat, box = os.path.join(ROOT, CAT_PATH), os.path.join(ROOT, BOX_PATH)
+    seeds = [3, 11, 3, 42]
+    manifest = render_thumbnail_variants(bg, LONG, seeds, str(tmp_path / "ab"), "thumb", cat, box)
+
+    with open(tmp_path / "ab" / "thumb_variants.json", encoding="utf-8") as f:
+        assert json.load(f) == manifest
+    assert [v["variant"] for v in manifest["variants"]] == [1, 2, 3, 4]
+    assert [v["seed"] for v in manifest["variants"]] == seeds
+    assert all(os.path.exists(v["path"]) for v in manifest["variants"])
+
+    variant = manifest["variants"][1]
+    again = render_thumbnail_variants(bg, LONG, [variant["seed"]], str(tmp_path / "again"), "thumb", cat, box)
+    with open(variant["path"], "rb") as a, open(again["variants"][0]["path"], "rb") as b:
+        assert a.read() == b.read()
+    assert {k: again["variants"][0][k] for k in ("angle", "pos_x", "wiggle")} == \
+        {k: variant[k] for k in ("angle", "pos_x", "wiggle")}
+    # Same seed, same layout and bytes within one batch too
+    with open(manifest["variants"][0]["path"], "rb") as a, open(manifest["variants"][2]["path"], "rb") as b:
+        assert a.read() == b.read()